@@ -1,13 +1,14 @@
 # distutils: define_macros=NPY_NO_DEPRECATED_API=NPY_1_7_API_VERSION
 
+import heapq
 import time
-import warnings
 
 import cython
 import numpy as np
 
 cimport numpy as np
-from libc.math cimport exp
+from cython.parallel cimport prange
+from libc.math cimport exp, sqrt
 
 DTYPE = np.int64
 floatTYPE = np.float64
@@ -16,158 +17,112 @@ floatTYPE = np.float64
 ctypedef np.int_t DTYPE_t
 ctypedef np.float64_t floatTYPE_t
 
+
 @cython.boundscheck(False)
+@cython.wraparound(False)
 @cython.cdivision(True)
-
-def _compute_clustering(floatTYPE_t Z,
-                        bint halo,
-                        np.ndarray[DTYPE_t, ndim = 1] kstar,
-                        np.ndarray[DTYPE_t, ndim = 2] dist_indices,
-                        DTYPE_t maxk,
-                        bint verb,
-                        np.ndarray[floatTYPE_t, ndim = 1] Rho_err,
-                        np.ndarray[floatTYPE_t, ndim = 1] Rho_c,
-                        np.ndarray[floatTYPE_t, ndim = 1] g,
-                        DTYPE_t Nele):
-
-    cdef DTYPE_t i, j, t, Nclus, check
-
-    cdef DTYPE_t index, maxposidx
-
-    cdef floatTYPE_t a1, a2, e1, e2, maxpos, lag, sec
-
-    cdef DTYPE_t tmp, jmod, imod
-
-    cdef DTYPE_t c, cp, k
-
-    cdef DTYPE_t po, p2, pp, p1
-
-
-
-    cdef np.ndarray[DTYPE_t, ndim = 1]  _centers_ = np.repeat(-1, Nele)
-    cdef DTYPE_t len_centers = 0
+def _compute_clustering_topology(DTYPE_t[:] kstar,
+                                 DTYPE_t[:, :] dist_indices,
+                                 bint verb,
+                                 floatTYPE_t[:] Rho_err,
+                                 floatTYPE_t[:] Rho_c,
+                                 floatTYPE_t[:] g,
+                                 DTYPE_t[:] rev_nind_list,
+                                 DTYPE_t[:] rev_nind_iptr,
+                                 int n_jobs):
+    # Z-independent part of ADP: putative centers, preliminary assignation and saddle points between
+    # the couples of putative clusters.
+    # Only the couples of clusters sharing a border are stored, as a list of edges (c1, c2) with c1 < c2,
+    # sorted as in a row-major scan of the (Nclus x Nclus) saddle point matrix.
+
+    cdef Py_ssize_t Nele = dist_indices.shape[0]
+    cdef Py_ssize_t maxk = dist_indices.shape[1]
+    cdef Py_ssize_t i, j, k, nn
+    cdef DTYPE_t ele, nb, c, p2, po, pp, best, best_nb
+    cdef floatTYPE_t sec, lag
+
+    is_center_arr = np.zeros(Nele, dtype=DTYPE)
+    removed_by_arr = -np.ones(Nele, dtype=DTYPE)
+    cdef DTYPE_t[::1] is_center = is_center_arr
+    cdef DTYPE_t[::1] removed_by = removed_by_arr
 
     if verb: print("init succeded")
     sec = time.time()
 
 # This for looks for the centers. A point is a center if its g is bigger than the one of all its neighbors
-    for i in range(Nele):
-        t = 0
-        for j in range(1, kstar[i] + 1):
-            if (g[i] < g[dist_indices[i, j]]):
-                t = 1
+    for i in prange(Nele, nogil=True, num_threads=n_jobs, schedule='static'):
+        is_center[i] = 1
+        for k in range(1, kstar[i] + 1):
+            if g[i] < g[dist_indices[i, k]]:
+                is_center[i] = 0
                 break
-        if (t == 0):
-            _centers_[len_centers] = i
-            len_centers += 1
-
-    cdef np.ndarray[DTYPE_t, ndim = 2]  to_remove = -np.ones((len_centers, len_centers), dtype=int)
-    cdef DTYPE_t len_to_remove = 0
-    cdef floatTYPE_t max_rho = -999.
-
-    if verb:
-      lag = time.time() - sec
-      print(f"Raw identification of the putative centers: {lag: .3f} sec")
-      sec = time.time()
 
 # This  part  checks that there are no centers within the neighborhood of points with higher density.
-    for k in range(len_centers):
-        t=0
-        max_rho = -999.
-        for i in range(Nele):
-            for j in range(1, kstar[i]+1):
-                if (dist_indices[i, j] == _centers_[k]):
-                    if (g[i] > g[_centers_[k]]):
-                        to_remove[len_to_remove, 0] = _centers_[k]
-                        t=1
-
-                        if max_rho <0:
-                            len_to_remove += 1
-
-                        if g[i]>max_rho:
-                            max_rho=g[i]
-                            to_remove[len_to_remove, 1] = i
+# Only the points having the center among their kstar neighbours are visited, through the reverse neighbour index.
+    for i in prange(Nele, nogil=True, num_threads=n_jobs, schedule='static'):
+        if is_center[i] == 1:
+            best = -1
+            for j in range(rev_nind_iptr[i], rev_nind_iptr[i + 1]):
+                nb = rev_nind_list[j]
+                if g[nb] > g[i] and (best == -1 or g[nb] > g[best]):
+                    best = nb
+            if best != -1:
+                removed_by[i] = best
+                is_center[i] = 0
+
+    centers = np.flatnonzero(is_center_arr)
+    Nclus = centers.shape[0]
 
     if verb:
       lag = time.time() - sec
-      print(f"Further checking on centers: {lag: .3f} sec ")
-      sec = time.time()
-
-    cdef np.ndarray[DTYPE_t, ndim = 1]  centers = np.empty(len_centers - len_to_remove, dtype=int)
-    cdef DTYPE_t cindx = 0
-
-    for i in range(len_centers):
-        flag = 0
-        for j in range(len_to_remove):
-            if _centers_[i] == to_remove[j, 0]:
-                flag = 1
-                break
-        if (flag == 0):
-            centers[cindx] = _centers_[i]
-            cindx += 1
-
-    if verb:
-      lag = time.time() - sec
-      print(f"Pruning of the centers wrongly identified in part one: {lag: .3f} sec")
+      print(f"Identification of the putative centers: {lag: .3f} sec")
       sec = time.time()
 
     #the selected centers can't belong to the neighborhood of points with higher density
-    cdef np.ndarray[DTYPE_t, ndim = 1]  cluster_init_ = -np.ones(Nele, dtype = int)
-    Nclus = len_centers - len_to_remove
-
-    for i in range(len_centers - len_to_remove):
-        cluster_init_[centers[i]] = i
-
-
-    sortg = np.argsort(-g)  # Rank of the elements in the g vector sorted in descendent order
-
-    # Perform preliminar assignation to clusters
-    maxk = dist_indices.shape[1]
-
-    for j in range(Nele):
-        ele = sortg[j]
-        nn = 0
-        while (cluster_init_[ele] == -1) and nn < maxk-1:
-            nn = nn + 1
-            cluster_init_[ele] = cluster_init_[dist_indices[ele, nn]]
-
-        if cluster_init_[ele]==-1:
-            ele_neighbors = dist_indices[ele]
-            all_removed_centers = to_remove[:, 0]
-
-            _, _, ind_removed_centers_ele = np.intersect1d(
-                ele_neighbors, all_removed_centers, return_indices=True
-            )
-
-            # for i in range(all_removed_centers):
-            #     for j in range(ele_neighbors):
-            #         if ele_neighbors[j]==all_removed_centers[i]:
-
-            # indices (in 'removed_centers') of the centers of higher density
-            # in the neighborhood of 'removed centers'
-            # (higher_density_centers --> centers of higher density that have a
-            # 'removed center' in their neighborhood)
-            higher_density_centers = to_remove[:, 1]
-            higher_density_centers_ele = higher_density_centers[
-                ind_removed_centers_ele
-            ]
-
-            # index (in 'cluster_init') of the 'maximum density center' of such neighboring centers
-            max_center = higher_density_centers_ele[
-                np.argmax(g[higher_density_centers_ele])
-            ]
-
-            # new_highest_neighbor = index_highest_nb_density[index_highest_nb_density]
-            cluster_init_[ele] = cluster_init_[max_center]
-
-    clstruct = []  # useful list of points in the clusters
-    for i in range(Nclus):
-        x1 = []
+    cluster_init_arr = -np.ones(Nele, dtype=DTYPE)
+    cluster_init_arr[centers] = np.arange(Nclus)
+
+    sortg_arr = np.argsort(-np.asarray(g))  # Rank of the elements in the g vector sorted in descendent order
+    rank_arr = np.empty(Nele, dtype=DTYPE)
+    rank_arr[sortg_arr] = np.arange(Nele)
+    parent_arr = -np.ones(Nele, dtype=DTYPE)
+
+    cdef DTYPE_t[::1] cluster_init = cluster_init_arr
+    cdef DTYPE_t[::1] sortg = sortg_arr
+    cdef DTYPE_t[::1] rank = rank_arr
+    cdef DTYPE_t[::1] parent = parent_arr
+
+    # Preliminary assignation: each point takes the cluster of its nearest neighbour that is assigned before it
+    # when the points are visited by decreasing g, i.e. a neighbour with a higher g or a center.
+    # The search of these neighbours is independent for each point, the assignation follows the order of g.
+    for i in prange(Nele, nogil=True, num_threads=n_jobs, schedule='static'):
+        if is_center[i] == 0:
+            for nn in range(1, maxk):
+                nb = dist_indices[i, nn]
+                if is_center[nb] == 1 or rank[nb] < rank[i]:
+                    parent[i] = nb
+                    break
+            if parent[i] == -1:
+                # no such neighbour: the point takes the cluster of the densest among the points that removed
+                # the putative centers in its neighbourhood
+                best = -1
+                best_nb = -1
+                for nn in range(maxk):
+                    nb = dist_indices[i, nn]
+                    if removed_by[nb] != -1:
+                        pp = removed_by[nb]
+                        if best == -1 or g[pp] > g[best] or (g[pp] == g[best] and nb < best_nb):
+                            best = pp
+                            best_nb = nb
+                if best == -1:
+                    best = dist_indices[i, 1]
+                parent[i] = best
+
+    with nogil:
         for j in range(Nele):
-            if (cluster_init_[j] == i):
-                x1.append(j)
-        clstruct.append(x1)
-
+            ele = sortg[j]
+            if cluster_init[ele] == -1:
+                cluster_init[ele] = cluster_init[parent[ele]]
 
     if verb:
       lag = time.time() - sec
@@ -175,35 +130,6 @@ def _compute_clustering(floatTYPE_t Z,
       print("Number of clusters before multimodality test=", Nclus)
       sec = time.time()
 
-
-    #this implementation can be vry costly if Nclus is > 10^4
-    if Nclus > 10000:
-        warnings.warn(
-        """There are > 10k initial putative clusters:
-        the matrices of the saddle points may cause out of memory error (6x Nclus x Nclus --> > 4.8 GB required).
-        If this is the case, call compute_clustering_ADP_pure_python(v2 = True). Ignore the warning otherwise."""
-        )
-
-    cdef np.ndarray[floatTYPE_t, ndim = 2]  Rho_bord = np.zeros((Nclus, Nclus))
-    cdef np.ndarray[floatTYPE_t, ndim = 2]  Rho_bord_err = np.zeros((Nclus, Nclus))
-    cdef np.ndarray[DTYPE_t, ndim = 2]  Point_bord = np.zeros((Nclus, Nclus), dtype=int)
-
-    cdef np.ndarray[floatTYPE_t, ndim = 1]  pos = np.zeros(Nclus * Nclus)
-    cdef np.ndarray[DTYPE_t, ndim = 1]  ipos = np.zeros(Nclus * Nclus, dtype=int)
-    cdef np.ndarray[DTYPE_t, ndim = 1]  jpos = np.zeros(Nclus * Nclus, dtype=int)
-
-    cdef np.ndarray[DTYPE_t, ndim = 1]  cluster_init = np.array(cluster_init_)
-
-
-
-    # Find border points between putative clusters
-
-    sec = time.time()
-
-    for i in range(Nclus):
-        for j in range(Nclus):
-            Point_bord[i, j] = -1
-
     #
     # i and j are points belonging to the clusters c(i) and c(j)
     #
@@ -212,189 +138,385 @@ def _compute_clustering(floatTYPE_t Z,
     #                   b) There are no other points belonging to c(i) nearer from point j
     #                   c) It has the maximum density among the points that fulfill a) & b)
     #
-
-    for c in range(Nclus):
-        for p1 in clstruct[c]:
-            if p1 in centers:
-                pp=-1
-            else:
-                for k in range(1, kstar[p1] + 1):
-                    p2 = dist_indices[p1, k]
-                    pp = -1
-                    if (cluster_init[p2] != c):
-                        pp = p2
-                        cp = cluster_init[pp]
-                        break
-            if (pp != -1):
+    bord_arr = -np.ones(Nele, dtype=DTYPE)
+    cdef DTYPE_t[::1] bord = bord_arr
+
+    for i in prange(Nele, nogil=True, num_threads=n_jobs, schedule='static'):
+        c = cluster_init[i]
+        if is_center[i] == 0 and c != -1 and g[i] > 0:
+            pp = -1
+            for k in range(1, kstar[i] + 1):
+                p2 = dist_indices[i, k]
+                if cluster_init[p2] != c:
+                    pp = p2
+                    break
+            if pp != -1:
                 for k in range(1, maxk):
                     po = dist_indices[pp, k]
-                    if (po == p1):
+                    if po == i:
                         break
-                    if (cluster_init[po] == c):
+                    if cluster_init[po] == c:
                         pp = -1
                         break
-            if (pp != -1):
-                if (g[p1] > Rho_bord[c, cp]):
-                    Rho_bord[c, cp] = g[p1]
-                    Rho_bord[cp, c] = g[p1]
-                    Point_bord[cp, c] = p1
-                    Point_bord[c, cp] = p1
-
-    # Symmetrize matrix
-    for i in range(Nclus - 1):
-        for j in range(i + 1, Nclus):
-            if (Point_bord[i, j] != -1):
-                Rho_bord[i, j] = Rho_c[Point_bord[i, j]]
-                Rho_bord[j, i] = Rho_c[Point_bord[j, i]]
-                Rho_bord_err[i, j] = Rho_err[Point_bord[i, j]]
-                Rho_bord_err[j, i] = Rho_err[Point_bord[j, i]]
-
-    for i in range(Nclus):
-        Rho_bord[i, i] = -1.
-        Rho_bord_err[i, i] = 0.
-
+            if pp != -1:
+                bord[i] = cluster_init[pp]
+
+    # c) the saddle point of each couple of clusters is its border point of highest g; ties are won by the
+    # point found first when visiting the clusters, and the points within each cluster, in increasing order
+    points = np.flatnonzero(bord_arr != -1)
+    cl1 = cluster_init_arr[points]
+    cl2 = bord_arr[points]
+    lo = np.minimum(cl1, cl2)
+    hi = np.maximum(cl1, cl2)
+    order = np.lexsort((points, cl1, -np.asarray(g)[points], hi, lo))
+    lo, hi, points = lo[order], hi[order], points[order]
+
+    first = np.ones(points.shape[0], dtype=bool)
+    first[1:] = (np.diff(lo) != 0) | (np.diff(hi) != 0)
+
+    edges = np.stack((lo[first], hi[first]), axis=1)
+    edge_point = points[first]
+    edge_rho = np.asarray(Rho_c)[edge_point]
+    edge_err = np.asarray(Rho_err)[edge_point]
 
     if verb:
       lag = time.time() - sec
       print(f"Identification of the saddle points: {lag: .3f} sec")
+      print("Number of couples of neighbouring clusters=", edges.shape[0])
       sec = time.time()
 
-    check = 1
-    sec = time.time()
-
-    cdef np.ndarray[DTYPE_t, ndim = 1]  centers_ = np.array(centers, dtype=int)
-    cdef np.ndarray[DTYPE_t, ndim = 1]  clsurv = np.ones(Nclus, dtype=int)
+    return centers, cluster_init_arr, edges, edge_point, edge_rho, edge_err
 
-    # sec = time.time()
-    # Here we start the merging process through multimodality test.
-    secp = 0
 
-    while (check == 1):
+cdef inline bint _is_not_significant(floatTYPE_t Z,
+                                     floatTYPE_t[:] Rho_c_centers,
+                                     floatTYPE_t[:] Rho_err_centers,
+                                     DTYPE_t i,
+                                     DTYPE_t j,
+                                     floatTYPE_t rho,
+                                     floatTYPE_t err):
+    cdef floatTYPE_t a1 = Rho_c_centers[i] - rho
+    cdef floatTYPE_t a2 = Rho_c_centers[j] - rho
+    cdef floatTYPE_t e1 = Z * (Rho_err_centers[i] + err)
+    cdef floatTYPE_t e2 = Z * (Rho_err_centers[j] + err)
+    return a1 < e1 or a2 < e2
 
-        check = 0
 
-        for i in range(Nclus * Nclus):
-            pos[i] = 0.0
-            ipos[i] = 0
-            jpos[i] = 0
-
-        index = 0
-        maxposidx = 0
-        maxpos = - 9999999999
-
-        for i in range(Nclus - 1):
-            for j in range(i + 1, Nclus):
-                a1 = (Rho_c[centers_[i]] - Rho_bord[i, j])
-                a2 = (Rho_c[centers_[j]] - Rho_bord[i, j])
-                e1 = Z * (Rho_err[centers_[i]] + Rho_bord_err[i, j])
-                e2 = Z * (Rho_err[centers_[j]] + Rho_bord_err[i, j])
-                if (a1 < e1 or a2 < e2):
-                    check = 1
-                    pos[index] = Rho_bord[i, j]
-                    ipos[index] = i
-                    jpos[index] = j
-                    if pos[index] > maxpos:
-                        maxpos = pos[index]
-                        maxposidx = index
-
-                    index = index + 1
-
-        if (check == 1):
-            barriers = maxposidx
-
-            imod = ipos[barriers]
-            jmod = jpos[barriers]
-            c1=(Rho_c[centers[imod]] - Rho_bord[imod][jmod])/(Rho_err[centers[imod]] + Rho_bord_err[imod][jmod])
-            c2=(Rho_c[centers[jmod]] - Rho_bord[imod][jmod])/(Rho_err[centers[jmod]] + Rho_bord_err[imod][jmod])
-            if c1<c2:
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _merge_clusters(floatTYPE_t Z,
+                    floatTYPE_t[:] Rho_c_centers,
+                    floatTYPE_t[:] Rho_err_centers,
+                    DTYPE_t[:, :] edges,
+                    DTYPE_t[:] edge_point,
+                    floatTYPE_t[:] edge_rho,
+                    floatTYPE_t[:] edge_err):
+    # Multimodality test of ADP on the graph of the neighbouring putative clusters.
+    # At each step the couple with the highest saddle point among the ones that are not statistically
+    # significant is merged, with ties broken as in a row-major scan of the saddle point matrix.
+    # A merge only changes the saddle points of the surviving cluster, so the candidate couples are kept in
+    # a heap, whose entries are invalidated by a stamp when the corresponding saddle point changes.
+
+    cdef Py_ssize_t Nclus = Rho_c_centers.shape[0]
+    cdef Py_ssize_t Nedges = edges.shape[0]
+    cdef Py_ssize_t e, e2
+    cdef DTYPE_t imod, jmod, tmp, nb
+    cdef floatTYPE_t c1, c2
+
+    lo_arr = np.array(edges[:, 0], dtype=DTYPE)
+    hi_arr = np.array(edges[:, 1], dtype=DTYPE)
+    point_arr = np.array(edge_point, dtype=DTYPE)
+    rho_arr = np.array(edge_rho, dtype=floatTYPE)
+    err_arr = np.array(edge_err, dtype=floatTYPE)
+    stamp_arr = np.zeros(Nedges, dtype=DTYPE)
+
+    cdef DTYPE_t[::1] lo = lo_arr
+    cdef DTYPE_t[::1] hi = hi_arr
+    cdef DTYPE_t[::1] point = point_arr
+    cdef floatTYPE_t[::1] rho = rho_arr
+    cdef floatTYPE_t[::1] err = err_arr
+    cdef DTYPE_t[::1] stamp = stamp_arr
+
+    clsurv = np.ones(Nclus, dtype=DTYPE)
+    merges = []
+
+    neighbours = [{} for _ in range(Nclus)]
+    heap = []
+    for e in range(Nedges):
+        neighbours[lo[e]][hi[e]] = e
+        neighbours[hi[e]][lo[e]] = e
+        if _is_not_significant(Z, Rho_c_centers, Rho_err_centers, lo[e], hi[e], rho[e], err[e]):
+            heap.append((-rho[e], lo[e], hi[e], e, 0))
+    heapq.heapify(heap)
+
+    while heap:
+        _, imod, jmod, e, tmp = heapq.heappop(heap)
+        if stamp[e] != tmp:
+            continue
+
+        c1 = (Rho_c_centers[imod] - rho[e]) / (Rho_err_centers[imod] + err[e])
+        c2 = (Rho_c_centers[jmod] - rho[e]) / (Rho_err_centers[jmod] + err[e])
+        if c1 < c2:
+            imod, jmod = jmod, imod
+
+        # cluster jmod is merged into imod
+        clsurv[jmod] = 0
+        merges.append((imod, jmod))
+
+        stamp[e] = -1
+        del neighbours[imod][jmod]
+        del neighbours[jmod][imod]
+
+        for nb, e2 in neighbours[jmod].items():
+            del neighbours[nb][jmod]
+            if nb in neighbours[imod]:
+                # common neighbour: keep the highest of the two saddle points
+                e = neighbours[imod][nb]
+                stamp[e2] = -1
+                if rho[e] >= rho[e2]:
+                    continue
+                rho[e], err[e], point[e] = rho[e2], err[e2], point[e2]
+            else:
+                # neighbours of jmod become neighbours of imod
+                e = e2
+                neighbours[imod][nb] = e
+                neighbours[nb][imod] = e
+                lo[e], hi[e] = min(imod, nb), max(imod, nb)
 
-                tmp = jmod
-                jmod = imod
-                imod = tmp
+            stamp[e] += 1
+            if _is_not_significant(Z, Rho_c_centers, Rho_err_centers, lo[e], hi[e], rho[e], err[e]):
+                heapq.heappush(heap, (-rho[e], lo[e], hi[e], e, stamp[e]))
 
-            clsurv[jmod] = 0
+        neighbours[jmod] = {}
 
-            Rho_bord[imod, jmod] = -1.
-            Rho_bord[jmod, imod] = -1.
-            Rho_bord_err[imod, jmod] = 0.
-            Rho_bord_err[jmod, imod] = 0.
+    # couples of surviving clusters
+    alive = stamp_arr != -1
+    edges_m = np.stack((lo_arr[alive], hi_arr[alive]), axis=1)
 
-            clstruct[imod].extend(clstruct[jmod])
+    merges = np.array(merges, dtype=DTYPE).reshape(-1, 2)
 
-            clstruct[jmod] = []
+    # surviving cluster into which each putative cluster is merged
+    owner = np.arange(Nclus)
+    for imod, jmod in merges[::-1]:
+        owner[jmod] = owner[imod]
 
-            for i in range(Nclus):
-                if (i != imod and i != jmod):
-                    if (Rho_bord[imod, i] < Rho_bord[jmod, i]):
+    return clsurv, owner, merges, edges_m, point_arr[alive], rho_arr[alive], err_arr[alive]
 
-                        Point_bord[imod, i] = Point_bord[jmod, i]
-                        Point_bord[i, imod] = Point_bord[imod, i]
 
-                        Rho_bord[imod, i] = Rho_bord[jmod, i]
-                        Rho_bord[i, imod] = Rho_bord[imod, i]
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _compute_clustering(floatTYPE_t Z,
+                        bint halo,
+                        DTYPE_t[:] kstar,
+                        DTYPE_t[:, :] dist_indices,
+                        bint verb,
+                        floatTYPE_t[:] Rho_err,
+                        floatTYPE_t[:] Rho_c,
+                        floatTYPE_t[:] g,
+                        DTYPE_t[:] rev_nind_list,
+                        DTYPE_t[:] rev_nind_iptr,
+                        int n_jobs):
+
+    cdef Py_ssize_t Nele = dist_indices.shape[0]
+    cdef Py_ssize_t i, j
+    cdef DTYPE_t imod, jmod, p
+    cdef floatTYPE_t sec, lag
+
+    centers, cluster_init, edges, edge_point, edge_rho, edge_err = _compute_clustering_topology(
+        kstar, dist_indices, verb, Rho_err, Rho_c, g, rev_nind_list, rev_nind_iptr, n_jobs
+    )
+    Nclus = centers.shape[0]
 
-                        Rho_bord_err[imod, i] = Rho_bord_err[jmod, i]
-                        Rho_bord_err[i, imod] = Rho_bord_err[imod, i]
+    sec = time.time()
 
-                    Rho_bord[jmod, i] = -1
-                    Rho_bord[i, jmod] = Rho_bord[jmod, i]
-                    Rho_bord_err[jmod, i] = 0
-                    Rho_bord_err[i, jmod] = Rho_bord_err[jmod, i]
+    Rho_c_arr = np.asarray(Rho_c)
+    Rho_err_arr = np.asarray(Rho_err)
 
+    clsurv, owner, merges, edges_m, edge_point_m, edge_rho_m, edge_err_m = _merge_clusters(
+        Z, Rho_c_arr[centers], Rho_err_arr[centers], edges, edge_point, edge_rho, edge_err
+    )
 
     if verb:
       lag = time.time() - sec
       print(f"Multimodality test finished: {lag: .3f} sec")
       sec = time.time()
 
-    Nclus_m = 0
+    surviving = np.flatnonzero(clsurv)
+    Nclus_m = surviving.shape[0]
+    nnum = -np.ones(Nclus, dtype=DTYPE)
+    nnum[surviving] = np.arange(Nclus_m)
+    centers_m = list(centers[surviving])
+
+    # points of each cluster, in the order in which they are gathered by the merges:
+    # linked lists of the points of the putative clusters are concatenated
+    order = np.argsort(cluster_init, kind="stable")
+    counts = np.bincount(cluster_init, minlength=Nclus)
+    head_arr = order[np.cumsum(counts) - counts]
+    tail_arr = order[np.cumsum(counts) - 1]
+    next_arr = -np.ones(Nele, dtype=DTYPE)
+    next_arr[order[:Nele - 1]] = order[1:]
+    next_arr[tail_arr] = -1
+
+    cdef DTYPE_t[::1] head = head_arr
+    cdef DTYPE_t[::1] tail = tail_arr
+    cdef DTYPE_t[::1] next_ = next_arr
+
+    for i in range(merges.shape[0]):
+        imod = merges[i, 0]
+        jmod = merges[i, 1]
+        next_[tail[imod]] = head[jmod]
+        tail[imod] = tail[jmod]
+
     clstruct_m = []
-    centers_m = []
-    nnum = []
-    for j in range(Nclus):
-        nnum.append(-1)
-        if (clsurv[j] == 1):
-            nnum[j] = Nclus_m
-            Nclus_m = Nclus_m + 1
-            clstruct_m.append(clstruct[j])
-            centers_m.append(centers[j])
-
-    Point_bord_m = np.zeros((Nclus_m, Nclus_m), dtype=int)
-    Rho_bord_err_m = np.zeros((Nclus_m, Nclus_m), dtype=float)
-    Rho_bord_m = np.zeros((Nclus_m, Nclus_m), dtype=float)
-
-    for j in range(Nclus):
-        if (clsurv[j] == 1):
-            jj = nnum[j]
-            for k in range(Nclus):
-                if (clsurv[k] == 1):
-                    kk = nnum[k]
-                    Rho_bord_m[jj][kk] = Rho_bord[j][k]
-                    Rho_bord_err_m[jj][kk] = Rho_bord_err[j][k]
-                    Point_bord_m[jj][kk]=Point_bord[j][k]
-
-    Last_cls = np.empty(Nele, dtype=int)
-    for j in range(Nclus_m):
-        for k in clstruct_m[j]:
-            Last_cls[k] = j
-    Last_cls_halo = np.copy(Last_cls)
-    nh = 0
-    for j in range(Nclus_m):
-        Rho_halo = max(Rho_bord_m[j])
-        for k in clstruct_m[j]:
-            if (Rho_c[k] < Rho_halo):
-                nh = nh + 1
-                Last_cls_halo[k] = -1
-    if (halo):
-        labels = Last_cls_halo
-    else:
-        labels = Last_cls
-
-    out_bord = np.copy(Rho_bord_m)
+    for j in surviving:
+        x1 = []
+        p = head[j]
+        while p != -1:
+            x1.append(p)
+            p = next_[p]
+        clstruct_m.append(x1)
+
+    Point_bord_m = -np.ones((Nclus_m, Nclus_m), dtype=DTYPE)
+    Rho_bord_err_m = np.zeros((Nclus_m, Nclus_m), dtype=floatTYPE)
+    Rho_bord_m = np.zeros((Nclus_m, Nclus_m), dtype=floatTYPE)
+
+    ii = nnum[edges_m[:, 0]]
+    jj = nnum[edges_m[:, 1]]
+    Rho_bord_m[ii, jj] = Rho_bord_m[jj, ii] = edge_rho_m
+    Rho_bord_err_m[ii, jj] = Rho_bord_err_m[jj, ii] = edge_err_m
+    Point_bord_m[ii, jj] = Point_bord_m[jj, ii] = edge_point_m
+    Rho_bord_m[np.diag_indices(Nclus_m)] = -1.
+
+    labels = nnum[owner[cluster_init]]
+    if halo:
+        Rho_halo = np.max(Rho_bord_m, axis=1)
+        labels[Rho_c_arr < Rho_halo[labels]] = -1
 
     if verb:
       lag = time.time() - sec
       print(f"Final operations: {lag} sec")
       sec = time.time()
 
-    return clstruct_m, Nclus_m, labels, centers_m, out_bord, Rho_bord_err_m, Point_bord_m
+    return clstruct_m, Nclus_m, labels, centers_m, Rho_bord_m, Rho_bord_err_m, Point_bord_m
+
+
+# ----------------------------------------------------------------------------------------------
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _return_nearest_higher_density_neighbour(DTYPE_t[:, :] dist_indices,
+                                             floatTYPE_t[:, :] distances,
+                                             floatTYPE_t[:] log_den,
+                                             int n_jobs):
+    # for each point, first neighbour (in order of distance) with a strictly higher density;
+    # ref is set to -1 when no such point is found among the stored neighbours
+    cdef Py_ssize_t N = dist_indices.shape[0]
+    cdef Py_ssize_t maxk = dist_indices.shape[1]
+    cdef Py_ssize_t i, k
+
+    ref_arr = -np.ones(N, dtype=DTYPE)
+    delta_arr = np.zeros(N, dtype=floatTYPE)
+    cdef DTYPE_t[::1] ref = ref_arr
+    cdef floatTYPE_t[::1] delta = delta_arr
+
+    for i in prange(N, nogil=True, num_threads=n_jobs, schedule='static'):
+        for k in range(1, maxk):
+            if log_den[dist_indices[i, k]] > log_den[i]:
+                ref[i] = dist_indices[i, k]
+                delta[i] = distances[i, k]
+                break
+
+    return ref_arr, delta_arr
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _return_nearest_higher_density_brute(floatTYPE_t[:, ::1] X,
+                                         DTYPE_t[:] queries,
+                                         DTYPE_t[:] order,
+                                         DTYPE_t[:] n_denser,
+                                         int n_jobs):
+    # exact nearest point of higher density for each query, scanning only the n_denser[q] points
+    # that precede it in the decreasing-density order
+    cdef Py_ssize_t nq = queries.shape[0]
+    cdef Py_ssize_t D = X.shape[1]
+    cdef Py_ssize_t qi, r, d
+    cdef DTYPE_t q, p, best_idx
+    cdef floatTYPE_t dist, diff, best
+
+    ref_arr = -np.ones(nq, dtype=DTYPE)
+    delta_arr = np.zeros(nq, dtype=floatTYPE)
+    cdef DTYPE_t[::1] ref = ref_arr
+    cdef floatTYPE_t[::1] delta = delta_arr
+
+    for qi in prange(nq, nogil=True, num_threads=n_jobs, schedule='dynamic'):
+        q = queries[qi]
+        best = -1.
+        best_idx = -1
+        for r in range(n_denser[qi]):
+            p = order[r]
+            dist = 0.
+            for d in range(D):
+                diff = X[p, d] - X[q, d]
+                dist = dist + diff * diff
+            if best_idx == -1 or dist < best:
+                best = dist
+                best_idx = p
+        ref[qi] = best_idx
+        if best_idx != -1:
+            delta[qi] = sqrt(best)
+
+    return ref_arr, delta_arr
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _return_roots(DTYPE_t[:] parent, int n_jobs):
+    # root of each point in the forest defined by parent (a root is its own parent), found by pointer jumping:
+    # at each round every point jumps to the parent of its parent, so the number of rounds grows as the
+    # logarithm of the depth of the trees
+    cdef Py_ssize_t N = parent.shape[0]
+    cdef Py_ssize_t i
+    cdef Py_ssize_t changed = 1
+
+    root_arr = np.array(parent, dtype=DTYPE)
+    next_arr = np.empty(N, dtype=DTYPE)
+    cdef DTYPE_t[::1] root = root_arr
+    cdef DTYPE_t[::1] next_root = next_arr
+
+    while changed > 0:
+        changed = 0
+        for i in prange(N, nogil=True, num_threads=n_jobs, schedule='static'):
+            next_root[i] = root[root[i]]
+            if next_root[i] != root[i]:
+                changed += 1
+        root, next_root = next_root, root
+        root_arr, next_arr = next_arr, root_arr
+
+    return root_arr
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _return_DP_border_points(DTYPE_t[:, :] dist_indices,
+                             floatTYPE_t[:, :] distances,
+                             floatTYPE_t[:] dc,
+                             DTYPE_t[:] cluster_assignment,
+                             int n_jobs):
+    # a point is a border point if a point of another cluster lies within its cutoff distance dc
+    cdef Py_ssize_t N = dist_indices.shape[0]
+    cdef Py_ssize_t maxk = dist_indices.shape[1]
+    cdef Py_ssize_t i, k
+
+    bord_arr = np.zeros(N, dtype=DTYPE)
+    cdef DTYPE_t[::1] bord = bord_arr
+
+    for i in prange(N, nogil=True, num_threads=n_jobs, schedule='static'):
+        for k in range(maxk):
+            if distances[i, k] <= dc[i] and cluster_assignment[dist_indices[i, k]] != cluster_assignment[i]:
+                bord[i] = 1
+                break
+
+    return bord_arr
@@ -7,7 +7,9 @@ cimport numpy as np
 
 from scipy.special import gammaln
 
-from libc.math cimport exp, log, pi, pow
+from cython.parallel cimport parallel, prange
+from libc.math cimport exp, fabs, log, pi, pow
+from libc.stdlib cimport free, malloc
 
 DTYPE = np.int64
 floatTYPE = np.float64
@@ -83,3 +85,167 @@ def _compute_kstar_interp(floatTYPE_t id_sel,
             kstar[i] = j - 2
 
     return kstar
+
+
+# ----------------------------------------------------------------------------------------------
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef inline floatTYPE_t _nrmaxl_point(floatTYPE_t F,
+                                      DTYPE_t kstar_i,
+                                      floatTYPE_t * vi,
+                                      floatTYPE_t fepsilon,
+                                      np.int8_t * is_singular) noexcept nogil:
+    # Newton-Raphson maximisation of the PAk likelihood of a single point (same scheme as
+    # cython_maximum_likelihood_opt_full._nrmaxl, with a fixed point step for singular Hessians)
+    cdef DTYPE_t j, niter = 0
+    cdef floatTYPE_t a = 0.
+    cdef floatTYPE_t stepmax = 0.1 * fabs(F)
+    cdef floatTYPE_t kf = <floatTYPE_t> kstar_i
+    cdef floatTYPE_t ka = (kf + 1.) * kf / 2.
+    cdef floatTYPE_t l, gf_tmp, grad_f, grad_a, h00, h01, h11, detHess, lr, delta_f, delta_a
+    cdef floatTYPE_t func = 100.
+
+    grad_f = kf
+    grad_a = ka
+    h00 = 0.
+    h01 = 0.
+    h11 = 0.
+    for j in range(kstar_i):
+        l = <floatTYPE_t> (j + 1)
+        gf_tmp = vi[j] * exp(F + a * l)
+        grad_f = grad_f - gf_tmp
+        grad_a = grad_a - l * gf_tmp
+        h00 = h00 - gf_tmp
+        h01 = h01 - l * gf_tmp
+        h11 = h11 - l * l * gf_tmp
+    detHess = h00 * h11 - h01 * h01
+
+    while func > 1e-3 and niter < 10000:
+        niter = niter + 1
+        if detHess < fepsilon:
+            is_singular[0] = 1
+            # parameter update fixed point iteration
+            F = (-a * ka - (grad_f - kf)) / kf
+            a = (-F * kf - (grad_f - kf)) / ka
+        else:
+            delta_f = (h11 * grad_f - h01 * grad_a) / detHess
+            delta_a = (h00 * grad_a - h01 * grad_f) / detHess
+            lr = 0.1
+            if fabs(lr * delta_f) > stepmax:
+                lr = fabs(stepmax / delta_f)
+            F = F - lr * delta_f
+            a = a - lr * delta_a
+
+        grad_f = kf
+        grad_a = ka
+        h00 = 0.
+        h01 = 0.
+        h11 = 0.
+        for j in range(kstar_i):
+            l = <floatTYPE_t> (j + 1)
+            gf_tmp = vi[j] * exp(F + a * l)
+            grad_f = grad_f - gf_tmp
+            grad_a = grad_a - l * gf_tmp
+            h00 = h00 - gf_tmp
+            h01 = h01 - l * gf_tmp
+            h11 = h11 - l * l * gf_tmp
+        detHess = h00 * h11 - h01 * h01
+
+        if fabs(a) <= fepsilon or fabs(F) <= fepsilon:
+            func = max(fabs(grad_f), fabs(grad_a))
+        else:
+            func = max(fabs(grad_f / F), fabs(grad_a / a))
+
+    return F
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _return_density_PAk(floatTYPE_t[:, :] distances,
+                        floatTYPE_t id_sel,
+                        DTYPE_t[:] kstar,
+                        bint interpolation,
+                        int n_jobs):
+    """Compute the (not normalised) PAk log-density of every point in a single parallel pass.
+
+    For each point the shell volumes between consecutive neighbours are computed on the fly, shells
+    at numerically identical distances are jittered, volumes larger than e^300 are clamped and the
+    likelihood is maximised with Newton-Raphson. The interpolation flag selects the starting root
+    log(k*-1) used when the neighbours come from a different (reference) dataset.
+
+    Args:
+        distances (np.ndarray(float)): shape (N, maxk + 1), sorted neighbour distances
+        id_sel (float): intrinsic dimension
+        kstar (np.ndarray(int)): shape (N,), number of shells used for each point
+        interpolation (bool): whether the distances are cross distances to a reference dataset
+        n_jobs (int): number of threads
+
+    Returns:
+        log_den (np.ndarray(float)): shape (N,), not normalised log-densities
+        n_identical (np.ndarray(int)): shape (N,), number of jittered shells of each point
+        n_overflow (np.ndarray(int)): shape (N,), number of clamped volumes of each point
+        is_singular (bool): whether a singular Hessian was found in the likelihood maximisation
+    """
+    cdef Py_ssize_t N = distances.shape[0]
+    cdef Py_ssize_t i, j
+    cdef DTYPE_t kmax = 0
+    cdef floatTYPE_t log_prefactor = id_sel / 2.0 * log(pi) - gammaln((id_sel + 2.0) / 2.0)
+    cdef floatTYPE_t prefactor = exp(log_prefactor)
+    cdef floatTYPE_t resolution = np.finfo(np.float64).resolution
+    cdef floatTYPE_t fepsilon = np.finfo(np.float64).eps
+    cdef floatTYPE_t r, r1, ratio, exponent, rr
+    cdef bint small_volume
+    cdef floatTYPE_t * vi
+
+    log_den_arr = np.empty(N, dtype=np.float64)
+    n_identical_arr = np.zeros(N, dtype=np.int64)
+    n_overflow_arr = np.zeros(N, dtype=np.int64)
+    singular_arr = np.zeros(N, dtype=np.int8)
+
+    cdef floatTYPE_t[::1] log_den = log_den_arr
+    cdef np.int64_t[::1] n_identical = n_identical_arr
+    cdef np.int64_t[::1] n_overflow = n_overflow_arr
+    cdef np.int8_t[::1] singular = singular_arr
+
+    for i in range(N):
+        if kstar[i] > kmax:
+            kmax = kstar[i]
+
+    with nogil, parallel(num_threads=n_jobs):
+        vi = <floatTYPE_t *> malloc((kmax + 1) * sizeof(floatTYPE_t))
+        for i in prange(N, schedule='dynamic'):
+            if interpolation:
+                rr = log(<floatTYPE_t> (kstar[i] - 1))
+            else:
+                rr = log(<floatTYPE_t> kstar[i])
+            rr = rr - (log_prefactor + id_sel * log(distances[i, kstar[i]]))
+
+            small_volume = False
+            for j in range(kstar[i]):
+                r = distances[i, j]
+                r1 = distances[i, j + 1]
+                ratio = r / r1
+                if fabs(ratio - 1.0) < resolution:
+                    ratio = ratio - 10 * resolution
+                    n_identical[i] += 1
+
+                exponent = id_sel * log(r1) + log(1 - pow(ratio, id_sel))
+                if exponent > 300.0:
+                    exponent = 300.0
+                    n_overflow[i] += 1
+
+                vi[j] = prefactor * exp(exponent)
+                if vi[j] < 1.0e-300:
+                    small_volume = True
+                    break
+
+            if small_volume:
+                log_den[i] = rr
+            else:
+                log_den[i] = _nrmaxl_point(rr, kstar[i], vi, fepsilon, &singular[i])
+        free(vi)
+
+    return log_den_arr, n_identical_arr, n_overflow_arr, bool(np.any(singular_arr))
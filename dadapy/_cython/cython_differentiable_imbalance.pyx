@@ -3,16 +3,24 @@
 import numpy as np
 
 cimport numpy as np
-from cython.parallel cimport parallel, prange
+from cython.parallel cimport parallel, prange, threadid
 
 import cython
 
 from libc.math cimport (  # absolute values for floats, needed when using PBC
+    INFINITY,
     exp,
     fabs,
     nearbyint,
     sqrt,
 )
+from libc.stdlib cimport free, malloc
+
+# integer types of the rank matrices: the compact ones of _return_full_rank_matrix and the default int
+ctypedef fused rank_t:
+    unsigned short
+    unsigned int
+    long
 
 
 # TODO: @wildromi clean up
@@ -154,7 +162,7 @@ def compute_dist_cython_parallel(double[:, :] X, int n_jobs, bint squared=False)
 @cython.boundscheck(False)
 @cython.cdivision(True)
 @cython.wraparound(False)
-def return_dii_gradient_cython(double[:,:] dists_rescaled_A not None, double[:,:] data_A not None, long[:,:] rank_matrix_B not None, double[:] weights not None, double lambd, double[:] period not None, int n_jobs, bint periodic = False):
+def return_dii_gradient_cython(double[:,:] dists_rescaled_A not None, double[:,:] data_A not None, rank_t[:,:] rank_matrix_B not None, double[:] weights not None, double lambd, double[:] period not None, int n_jobs, bint periodic = False):
     """Compute the gradient of DII between input data matrix A and groundtruth data matrix B; Cython implementation.
 
     Args:
@@ -162,7 +170,7 @@ def return_dii_gradient_cython(double[:,:] dists_rescaled_A not None, double[:,:
             The rescaled distances between points in input array A, where N is the number of points.
         data_A : numpy.ndarray, shape (N, D), of type 'float' (python) a.k.a. 'double' (C).
             The input array A, where N is the number of points and D is the number of dimensions.
-        rank_matrix_B : numpy.ndarray, shape (N, N), of type 'int' (python) a.k.a. 'long' (C).
+        rank_matrix_B : numpy.ndarray, shape (N, N), of type 'uint16', 'uint32' or 'int' (python) a.k.a. 'long' (C).
             The rank matrix for groundtruth data array B, where N is the number of points.
         weights : numpy.ndarray, shape (D,), of type 'float' (python) a.k.a. 'double' (C).
             The array of weight values for the input values, where D is the number of weights.
@@ -234,7 +242,7 @@ def return_dii_gradient_cython(double[:,:] dists_rescaled_A not None, double[:,:
                     gradient_view[i] = 0.
                 else:
                     alphacolumn = data_A[:,i,None] # data_A[:,i] creates a 1D vector, the ",None" adds a dimension
-                    gradient_view[i] = alphaweight_gradientterm_cython_PBC_parallel(alpha_weight=i, alphacolumn=alphacolumn, weights=weights, period=period, dists_rescaled_A=dists_rescaled_A, rank_matrix_B=rank_matrix_B, c_matrix=c_matrix, n_jobs=n_jobs)   
+                    gradient_view[i] = alphaweight_gradientterm_cython_PBC_parallel(i, alphacolumn, weights, period, dists_rescaled_A, rank_matrix_B, c_matrix, n_jobs)   
                     gradient_view[i] = (gradient_view[i] * weights[i]) / (lambd * N*N)
         else:
             for i in range(D):
@@ -242,7 +250,7 @@ def return_dii_gradient_cython(double[:,:] dists_rescaled_A not None, double[:,:
                     gradient_view[i] = 0.
                 else:
                     alphacolumn = data_A[:,i,None] # data_A[:,i] creates a 1D vector, the ",None" adds a dimension
-                    gradient_view[i] = alphaweight_gradientterm_cython_parallel(alpha_weight=i, alphacolumn=alphacolumn, weights=weights, dists_rescaled_A=dists_rescaled_A, rank_matrix_B=rank_matrix_B, c_matrix=c_matrix, n_jobs=n_jobs)   
+                    gradient_view[i] = alphaweight_gradientterm_cython_parallel(i, alphacolumn, weights, dists_rescaled_A, rank_matrix_B, c_matrix, n_jobs)   
                     gradient_view[i] = (gradient_view[i] * weights[i]) / (lambd * N*N)    
 
     return gradient
@@ -266,7 +274,7 @@ cdef double cmin(double[:] arr) nogil:
 @cython.boundscheck(False)
 @cython.cdivision(True)
 @cython.wraparound(False)
-cpdef double alphaweight_gradientterm_cython_PBC_parallel(int alpha_weight, double[:,:] alphacolumn, double[:] weights, double[:] period, double[:,:] dists_rescaled_A, long[:,:] rank_matrix_B, double[:,:] c_matrix, int n_jobs):
+cpdef double alphaweight_gradientterm_cython_PBC_parallel(int alpha_weight, double[:,:] alphacolumn, double[:] weights, double[:] period, double[:,:] dists_rescaled_A, rank_t[:,:] rank_matrix_B, double[:,::1] c_matrix, int n_jobs):
     
     cdef int D,N,i,j
     D = weights.shape[0]
@@ -314,7 +322,7 @@ cpdef double alphaweight_gradientterm_cython_PBC_parallel(int alpha_weight, doub
 @cython.boundscheck(False)
 @cython.cdivision(True)
 @cython.wraparound(False)
-cpdef double alphaweight_gradientterm_cython_parallel(int alpha_weight, double[:,:] alphacolumn, double[:] weights, double[:,:] dists_rescaled_A, long[:,:] rank_matrix_B, double[:,:] c_matrix, int n_jobs):
+cpdef double alphaweight_gradientterm_cython_parallel(int alpha_weight, double[:,:] alphacolumn, double[:] weights, double[:,:] dists_rescaled_A, rank_t[:,:] rank_matrix_B, double[:,::1] c_matrix, int n_jobs):
     
     cdef int D,N,i,j
     D = weights.shape[0]
@@ -354,3 +362,468 @@ cpdef double alphaweight_gradientterm_cython_parallel(int alpha_weight, double[:
     return gradient_alphaweight
 
 
+
+
+@cython.boundscheck(False)
+@cython.cdivision(True)
+@cython.wraparound(False)
+cdef inline double _rescaled_distance(double[:,:] data_A, double[:] weights, double[:] period, Py_ssize_t i, Py_ssize_t j, bint periodic) noexcept nogil:
+    # euclidean distance between points i and j of the input rescaled by the weights
+    cdef Py_ssize_t a
+    cdef double diff
+    cdef double dist = 0.
+    for a in range(data_A.shape[1]):
+        diff = data_A[i, a] - data_A[j, a]
+        if periodic and period[a] != 0.:
+            diff = diff - period[a] * nearbyint(diff / period[a])
+        dist = dist + weights[a] * weights[a] * diff * diff
+    return sqrt(dist)
+
+
+@cython.boundscheck(False)
+@cython.cdivision(True)
+@cython.wraparound(False)
+def return_nearest_distances_cython(double[:,:] data_A not None, double[:] weights not None, double[:] period not None, long[:,:] nn_indices_A not None, int n_jobs, bint periodic = False):
+    """Compute the distances of the first and second nearest neighbour of each point among a list of candidates; Cython implementation.
+
+    Args:
+        data_A : numpy.ndarray, shape (N, D), of type 'float' (python) a.k.a. 'double' (C).
+            The input array A, where N is the number of points and D is the number of dimensions.
+        weights : numpy.ndarray, shape (D,), of type 'float' (python) a.k.a. 'double' (C).
+            The array of weight values for the input values, where D is the number of weights.
+        period : numpy.ndarray, shape (D,)
+            D(input) periods of the unscaled input. Not used if periodic is False.
+        nn_indices_A : numpy.ndarray, shape (N, K), of type 'int' (python) a.k.a. 'long' (C).
+            The candidate neighbours of each point; the point itself is skipped if present.
+        n_jobs : int
+            The number of threads to use for parallel processing.
+        periodic : bool
+            Whether to apply periodic boundary conditions. Default is False.
+
+    Returns:
+        nearest_distances: numpy.ndarray, shape (N, 2). The rescaled distances of the two nearest candidates.
+    """
+    cdef Py_ssize_t N = data_A.shape[0]
+    cdef Py_ssize_t K = nn_indices_A.shape[1]
+    cdef Py_ssize_t i, j, m
+    cdef double dist
+
+    nearest_nonview = np.full((N, 2), np.inf, dtype=float)
+    cdef double[:, ::1] nearest = nearest_nonview
+
+    for i in prange(N, nogil=True, num_threads=n_jobs, schedule='static'):
+        for m in range(K):
+            j = nn_indices_A[i, m]
+            if j == i:
+                continue
+            dist = _rescaled_distance(data_A, weights, period, i, j, periodic)
+            if dist < nearest[i, 0]:
+                nearest[i, 1] = nearest[i, 0]
+                nearest[i, 0] = dist
+            elif dist < nearest[i, 1]:
+                nearest[i, 1] = dist
+
+    return nearest_nonview
+
+
+@cython.boundscheck(False)
+@cython.cdivision(True)
+@cython.wraparound(False)
+def return_dii_sparse_cython(double[:,:] data_A not None, double[:] weights not None, double[:] period not None, long[:,:] nn_indices_A not None, long[:,:] nn_indices_B not None, double lambd, double missing_rank, int n_jobs, bint periodic = False):
+    """Compute the DII and its gradient with the softmax of each point restricted to a list of candidate neighbours; Cython implementation.
+
+    Args:
+        data_A : numpy.ndarray, shape (N, D), of type 'float' (python) a.k.a. 'double' (C).
+            The input array A, where N is the number of points and D is the number of dimensions.
+        weights : numpy.ndarray, shape (D,), of type 'float' (python) a.k.a. 'double' (C).
+            The array of weight values for the input values, where D is the number of weights.
+        period : numpy.ndarray, shape (D,)
+            D(input) periods of the unscaled input. Not used if periodic is False.
+        nn_indices_A : numpy.ndarray, shape (N, K), of type 'int' (python) a.k.a. 'long' (C).
+            The candidate neighbours of each point in the rescaled input space; the point itself is skipped if present.
+        nn_indices_B : numpy.ndarray, shape (N, maxk+1), of type 'int' (python) a.k.a. 'long' (C).
+            The first maxk neighbours of each point in the groundtruth space, column 0 is the point itself.
+            The neighbour in column c has rank c.
+        lambd : float
+            The lambda scaling parameter of the softmax.
+        missing_rank : float
+            The rank given to neighbours in A which are not among the first maxk neighbours in B.
+        n_jobs : int
+            The number of threads to use for parallel processing.
+        periodic : bool
+            Whether to apply periodic boundary conditions. Default is False.
+
+    Returns:
+        dii: float. The DII with the restricted softmax.
+        gradient: numpy.ndarray, shape (D,). The gradient of the DII for each variable (dimension), with the same
+            normalisation as return_dii_gradient_cython.
+    """
+    cdef Py_ssize_t N = data_A.shape[0]
+    cdef Py_ssize_t D = data_A.shape[1]
+    cdef Py_ssize_t K = nn_indices_A.shape[1]
+    cdef Py_ssize_t maxk_B = nn_indices_B.shape[1] - 1
+    cdef Py_ssize_t i, j, m, a, t, tid
+    cdef double diff, q, summ, rank_sum, dii_sum, d_min
+    cdef long* position
+    cdef double* expon
+    cdef double* dists
+    cdef double* ranks
+    cdef double* first_sums
+    cdef double* second_sums
+
+    gradient_threads_nonview = np.zeros((n_jobs, D), dtype=float)
+    cdef double[:, ::1] gradient_threads = gradient_threads_nonview
+
+    dii_sum = 0.
+
+    with nogil, parallel(num_threads=n_jobs):
+        position = <long *> malloc(N * sizeof(long))
+        expon = <double *> malloc(K * sizeof(double))
+        dists = <double *> malloc(K * sizeof(double))
+        ranks = <double *> malloc(K * sizeof(double))
+        first_sums = <double *> malloc(D * sizeof(double))
+        second_sums = <double *> malloc(D * sizeof(double))
+        for t in range(N):
+            position[t] = -1
+
+        for i in prange(N, schedule='static'):
+            tid = threadid()
+            for m in range(1, maxk_B + 1):
+                position[nn_indices_B[i, m]] = m
+
+            # rescaled distances and groundtruth ranks of the candidates, the point itself gets an infinite distance
+            d_min = INFINITY
+            for m in range(K):
+                j = nn_indices_A[i, m]
+                if j == i:
+                    dists[m] = INFINITY
+                    continue
+                dists[m] = _rescaled_distance(data_A, weights, period, i, j, periodic)
+                if dists[m] < d_min:
+                    d_min = dists[m]
+                if position[j] > 0:
+                    ranks[m] = position[j]
+                else:
+                    ranks[m] = missing_rank
+
+            # restricted softmax
+            summ = 0.
+            for m in range(K):
+                expon[m] = exp(-(dists[m] - d_min) / lambd)
+                summ = summ + expon[m]
+            rank_sum = 0.
+            for m in range(K):
+                expon[m] = expon[m] / summ
+                rank_sum = rank_sum + expon[m] * ranks[m]
+            dii_sum += rank_sum
+
+            # gradient terms of the row: sum_j c_ij r_ij (-q_ij + sum_m c_im q_im), q_ij = dx_ij^2 / d_ij
+            for a in range(D):
+                first_sums[a] = 0.
+                second_sums[a] = 0.
+            for m in range(K):
+                if expon[m] == 0. or dists[m] == 0.:
+                    continue
+                j = nn_indices_A[i, m]
+                for a in range(D):
+                    diff = data_A[i, a] - data_A[j, a]
+                    if periodic and period[a] != 0.:
+                        diff = diff - period[a] * nearbyint(diff / period[a])
+                    q = diff * diff / dists[m]
+                    first_sums[a] = first_sums[a] + expon[m] * ranks[m] * q
+                    second_sums[a] = second_sums[a] + expon[m] * q
+            for a in range(D):
+                gradient_threads[tid, a] = gradient_threads[tid, a] - first_sums[a] + rank_sum * second_sums[a]
+
+            for m in range(1, maxk_B + 1):
+                position[nn_indices_B[i, m]] = -1
+
+        free(position)
+        free(expon)
+        free(dists)
+        free(ranks)
+        free(first_sums)
+        free(second_sums)
+
+    gradient = gradient_threads_nonview.sum(axis=0) * np.asarray(weights) / (lambd * N * N)
+
+    return 2. * dii_sum / (N * N), gradient
+
+
+@cython.boundscheck(False)
+@cython.cdivision(True)
+@cython.wraparound(False)
+def return_distance_rows_cython(double[:,:] data not None, double[:] weights not None, double[:] period not None, long[:] anchors not None, int n_jobs, bint periodic = False):
+    """Compute the rescaled distances from a set of anchor points to all points; Cython implementation.
+
+    Args:
+        data : numpy.ndarray, shape (N, D), of type 'float' (python) a.k.a. 'double' (C).
+            The input array, where N is the number of points and D is the number of dimensions.
+        weights : numpy.ndarray, shape (D,), of type 'float' (python) a.k.a. 'double' (C).
+            The array of weight values for the input values, where D is the number of weights.
+        period : numpy.ndarray, shape (D,)
+            D(input) periods of the unscaled input. Not used if periodic is False.
+        anchors : numpy.ndarray, shape (B,), of type 'int' (python) a.k.a. 'long' (C).
+            The indices of the anchor points.
+        n_jobs : int
+            The number of threads to use for parallel processing.
+        periodic : bool
+            Whether to apply periodic boundary conditions. Default is False.
+
+    Returns:
+        dist_rows: numpy.ndarray, shape (B, N). The rescaled distances of each anchor from all points, infinite from
+            the anchor itself.
+    """
+    cdef Py_ssize_t N = data.shape[0]
+    cdef Py_ssize_t B = anchors.shape[0]
+    cdef Py_ssize_t r, i, j
+
+    dist_rows_nonview = np.empty((B, N), dtype=float)
+    cdef double[:, ::1] dist_rows = dist_rows_nonview
+
+    for r in prange(B, nogil=True, num_threads=n_jobs, schedule='static'):
+        i = anchors[r]
+        for j in range(N):
+            dist_rows[r, j] = _rescaled_distance(data, weights, period, i, j, periodic)
+        dist_rows[r, i] = INFINITY
+
+    return dist_rows_nonview
+
+
+@cython.boundscheck(False)
+@cython.cdivision(True)
+@cython.wraparound(False)
+def return_dii_rows_cython(double[:,:] dist_rows_A not None, double[:,:] data_A not None, long[:] anchors not None, long[:,:] rank_rows_B not None, double[:] weights not None, double lambd, double[:] period not None, int n_jobs, bint periodic = False):
+    """Estimate the DII and its gradient from the rows of a set of anchor points; Cython implementation.
+
+    With all the points as anchors, the results are the DII and the gradient of return_dii_gradient_cython.
+
+    Args:
+        dist_rows_A : numpy.ndarray, shape (B, N), of type 'float' (python) a.k.a. 'double' (C).
+            The rescaled distances of the anchors from all points, see return_distance_rows_cython.
+        data_A : numpy.ndarray, shape (N, D), of type 'float' (python) a.k.a. 'double' (C).
+            The unscaled input array A, where N is the number of points and D is the number of dimensions.
+        anchors : numpy.ndarray, shape (B,), of type 'int' (python) a.k.a. 'long' (C).
+            The indices of the anchor points.
+        rank_rows_B : numpy.ndarray, shape (B, N), of type 'int' (python) a.k.a. 'long' (C).
+            The ranks of all points with respect to each anchor in the groundtruth space.
+        weights : numpy.ndarray, shape (D,), of type 'float' (python) a.k.a. 'double' (C).
+            The array of weight values for the input values, where D is the number of weights.
+        lambd : float
+            The lambda scaling parameter of the softmax.
+        period : numpy.ndarray, shape (D,)
+            D(input) periods of the unscaled input. Not used if periodic is False.
+        n_jobs : int
+            The number of threads to use for parallel processing.
+        periodic : bool
+            Whether to apply periodic boundary conditions. Default is False.
+
+    Returns:
+        dii: float. The DII estimated from the anchor rows.
+        gradient: numpy.ndarray, shape (D,). The gradient of the estimated DII for each variable (dimension).
+    """
+    cdef Py_ssize_t N = data_A.shape[0]
+    cdef Py_ssize_t D = data_A.shape[1]
+    cdef Py_ssize_t B = anchors.shape[0]
+    cdef Py_ssize_t r, i, j, a, tid
+    cdef double diff, q, summ, rank_sum, dii_sum, d_min
+    cdef double* expon
+    cdef double* first_sums
+    cdef double* second_sums
+
+    gradient_threads_nonview = np.zeros((n_jobs, D), dtype=float)
+    cdef double[:, ::1] gradient_threads = gradient_threads_nonview
+
+    dii_sum = 0.
+
+    with nogil, parallel(num_threads=n_jobs):
+        expon = <double *> malloc(N * sizeof(double))
+        first_sums = <double *> malloc(D * sizeof(double))
+        second_sums = <double *> malloc(D * sizeof(double))
+
+        for r in prange(B, schedule='static'):
+            tid = threadid()
+            i = anchors[r]
+
+            # softmax of the anchor row, subtracting the nearest distance to avoid overflow
+            d_min = INFINITY
+            for j in range(N):
+                if j != i and dist_rows_A[r, j] < d_min:
+                    d_min = dist_rows_A[r, j]
+            summ = 0.
+            for j in range(N):
+                expon[j] = exp(-(dist_rows_A[r, j] - d_min) / lambd)
+                summ = summ + expon[j]
+            summ = summ - expon[i]
+            expon[i] = 0.
+            rank_sum = 0.
+            for j in range(N):
+                expon[j] = expon[j] / summ
+                rank_sum = rank_sum + expon[j] * rank_rows_B[r, j]
+            dii_sum += rank_sum
+
+            # gradient terms of the row: sum_j c_ij r_ij (-q_ij + sum_m c_im q_im), q_ij = dx_ij^2 / d_ij
+            for a in range(D):
+                first_sums[a] = 0.
+                second_sums[a] = 0.
+            for j in range(N):
+                if expon[j] == 0. or dist_rows_A[r, j] == 0.:
+                    continue
+                for a in range(D):
+                    diff = data_A[i, a] - data_A[j, a]
+                    if periodic and period[a] != 0.:
+                        diff = diff - period[a] * nearbyint(diff / period[a])
+                    q = diff * diff / dist_rows_A[r, j]
+                    first_sums[a] = first_sums[a] + expon[j] * rank_rows_B[r, j] * q
+                    second_sums[a] = second_sums[a] + expon[j] * q
+            for a in range(D):
+                gradient_threads[tid, a] = gradient_threads[tid, a] - first_sums[a] + rank_sum * second_sums[a]
+
+        free(expon)
+        free(first_sums)
+        free(second_sums)
+
+    gradient = gradient_threads_nonview.sum(axis=0) * np.asarray(weights) / (lambd * N * B)
+
+    return 2. * dii_sum / (N * B), gradient
+
+
+@cython.boundscheck(False)
+@cython.cdivision(True)
+@cython.wraparound(False)
+def return_nearest_distances_cached_cython(double[:,:,::1] feature_sq_differences not None, double[:] weights not None, int n_jobs):
+    """Compute the rescaled distances of the first and second nearest neighbour of each point from cached squared differences; Cython implementation.
+
+    Args:
+        feature_sq_differences : numpy.ndarray, shape (N, N, D), of type 'float' (python) a.k.a. 'double' (C).
+            The squared difference of each feature between each pair of points, with PBC if any.
+        weights : numpy.ndarray, shape (D,), of type 'float' (python) a.k.a. 'double' (C).
+            The array of weight values for the input values, where D is the number of weights.
+        n_jobs : int
+            The number of threads to use for parallel processing.
+
+    Returns:
+        nearest_distances: numpy.ndarray, shape (N, 2). The rescaled distances of the two nearest neighbours.
+    """
+    cdef Py_ssize_t N = feature_sq_differences.shape[0]
+    cdef Py_ssize_t D = feature_sq_differences.shape[2]
+    cdef Py_ssize_t i, j, a
+    cdef double dist
+
+    nearest_nonview = np.full((N, 2), np.inf, dtype=float)
+    cdef double[:, ::1] nearest = nearest_nonview
+    weights_sq_nonview = np.square(weights)
+    cdef double[::1] weights_sq = weights_sq_nonview
+
+    for i in prange(N, nogil=True, num_threads=n_jobs, schedule='static'):
+        for j in range(N):
+            if j == i:
+                continue
+            dist = 0.
+            for a in range(D):
+                dist = dist + weights_sq[a] * feature_sq_differences[i, j, a]
+            dist = sqrt(dist)
+            if dist < nearest[i, 0]:
+                nearest[i, 1] = nearest[i, 0]
+                nearest[i, 0] = dist
+            elif dist < nearest[i, 1]:
+                nearest[i, 1] = dist
+
+    return nearest_nonview
+
+
+@cython.boundscheck(False)
+@cython.cdivision(True)
+@cython.wraparound(False)
+def return_dii_cached_cython(double[:,:,::1] feature_sq_differences not None, double[:] weights not None, rank_t[:,:] rank_matrix_B not None, double lambd, int n_jobs):
+    """Compute the DII and its gradient from cached squared differences, one row of the c-matrix at a time; Cython implementation.
+
+    The results are the ones of _return_dii and return_dii_gradient_cython, without building any N x N matrix.
+
+    Args:
+        feature_sq_differences : numpy.ndarray, shape (N, N, D), of type 'float' (python) a.k.a. 'double' (C).
+            The squared difference of each feature between each pair of points, with PBC if any.
+        weights : numpy.ndarray, shape (D,), of type 'float' (python) a.k.a. 'double' (C).
+            The array of weight values for the input values, where D is the number of weights.
+        rank_matrix_B : numpy.ndarray, shape (N, N), of type 'uint16', 'uint32' or 'int' (python) a.k.a. 'long' (C).
+            The rank matrix for groundtruth data array B, where N is the number of points.
+        lambd : float
+            The lambda scaling parameter of the softmax.
+        n_jobs : int
+            The number of threads to use for parallel processing.
+
+    Returns:
+        dii: float. The DII.
+        gradient: numpy.ndarray, shape (D,). The gradient of the DII for each variable (dimension).
+    """
+    cdef Py_ssize_t N = feature_sq_differences.shape[0]
+    cdef Py_ssize_t D = feature_sq_differences.shape[2]
+    cdef Py_ssize_t i, j, a, tid
+    cdef double q, summ, rank_sum, dii_sum, d_min
+    cdef double* dists
+    cdef double* expon
+    cdef double* first_sums
+    cdef double* second_sums
+
+    gradient_threads_nonview = np.zeros((n_jobs, D), dtype=float)
+    cdef double[:, ::1] gradient_threads = gradient_threads_nonview
+    weights_sq_nonview = np.square(weights)
+    cdef double[::1] weights_sq = weights_sq_nonview
+
+    dii_sum = 0.
+
+    with nogil, parallel(num_threads=n_jobs):
+        dists = <double *> malloc(N * sizeof(double))
+        expon = <double *> malloc(N * sizeof(double))
+        first_sums = <double *> malloc(D * sizeof(double))
+        second_sums = <double *> malloc(D * sizeof(double))
+
+        for i in prange(N, schedule='static'):
+            tid = threadid()
+
+            # rescaled distances of the row as a weighted sum of the cached terms
+            d_min = INFINITY
+            for j in range(N):
+                dists[j] = 0.
+                for a in range(D):
+                    dists[j] = dists[j] + weights_sq[a] * feature_sq_differences[i, j, a]
+                dists[j] = sqrt(dists[j])
+                if j != i and dists[j] < d_min:
+                    d_min = dists[j]
+
+            # softmax of the row, subtracting the nearest distance to avoid overflow
+            summ = 0.
+            for j in range(N):
+                if j == i:
+                    expon[j] = 0.
+                else:
+                    expon[j] = exp(-(dists[j] - d_min) / lambd)
+                summ = summ + expon[j]
+            rank_sum = 0.
+            for j in range(N):
+                expon[j] = expon[j] / summ
+                rank_sum = rank_sum + expon[j] * rank_matrix_B[i, j]
+            dii_sum += rank_sum
+
+            # gradient terms of the row: sum_j c_ij r_ij (-q_ij + sum_m c_im q_im), q_ij = dx_ij^2 / d_ij
+            for a in range(D):
+                first_sums[a] = 0.
+                second_sums[a] = 0.
+            for j in range(N):
+                if expon[j] == 0. or dists[j] == 0.:
+                    continue
+                for a in range(D):
+                    q = feature_sq_differences[i, j, a] / dists[j]
+                    first_sums[a] = first_sums[a] + expon[j] * rank_matrix_B[i, j] * q
+                    second_sums[a] = second_sums[a] + expon[j] * q
+            for a in range(D):
+                gradient_threads[tid, a] = gradient_threads[tid, a] - first_sums[a] + rank_sum * second_sums[a]
+
+        free(dists)
+        free(expon)
+        free(first_sums)
+        free(second_sums)
+
+    gradient = gradient_threads_nonview.sum(axis=0) * np.asarray(weights) / (lambd * N * N)
+
+    return 2. * dii_sum / (N * N), gradient
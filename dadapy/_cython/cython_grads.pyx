@@ -4,6 +4,8 @@ import cython
 import numpy as np
 
 cimport numpy as np
+from cython.parallel cimport parallel, prange
+from libc.stdlib cimport calloc, free, malloc
 
 DTYPE = np.int_
 floatTYPE = np.float_
@@ -46,6 +48,40 @@ def return_neigh_ind(np.ndarray[DTYPE_t, ndim = 2] dist_indices,
 
 # ----------------------------------------------------------------------------------------------
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def return_reverse_neigh_ind(np.ndarray[DTYPE_t, ndim = 2] dist_indices,
+                             np.ndarray[DTYPE_t, ndim = 1] nneighs):
+    # CSR index of the reverse neighbourhood graph, built with a counting sort:
+    # rev_nind_list[rev_nind_iptr[j]:rev_nind_iptr[j+1]] contains, in increasing order,
+    # all the points i having j among their first nneighs[i] neighbours (self excluded)
+    cdef DTYPE_t N = nneighs.shape[0]
+    cdef DTYPE_t nnz = nneighs.sum()
+    cdef np.ndarray[DTYPE_t, ndim = 1] rev_nind_list = np.empty(nnz, dtype=DTYPE)
+    cdef np.ndarray[DTYPE_t, ndim = 1] rev_nind_iptr = np.zeros(N + 1, dtype=DTYPE)
+    cdef np.ndarray[DTYPE_t, ndim = 1] fill
+
+    cdef DTYPE_t i, j, k
+
+    for i in range(N):
+        for k in range(1, nneighs[i] + 1):
+            rev_nind_iptr[dist_indices[i, k] + 1] += 1
+
+    for j in range(N):
+        rev_nind_iptr[j + 1] += rev_nind_iptr[j]
+
+    fill = rev_nind_iptr[:N].copy()
+    for i in range(N):
+        for k in range(1, nneighs[i] + 1):
+            j = dist_indices[i, k]
+            rev_nind_list[fill[j]] = i
+            fill[j] += 1
+
+    return rev_nind_list, rev_nind_iptr
+
+# ----------------------------------------------------------------------------------------------
+
 @cython.boundscheck(False)
 @cython.cdivision(True)
 def return_neigh_distances_array(   np.ndarray[floatTYPE_t, ndim = 2] distances,
@@ -118,185 +154,203 @@ def return_neigh_vector_diffs_periodic(np.ndarray[floatTYPE_t, ndim = 2] X,
 # ----------------------------------------------------------------------------------------------
 
 @cython.boundscheck(False)
+@cython.wraparound(False)
 @cython.cdivision(True)
-def return_common_neighs(np.ndarray[DTYPE_t, ndim = 1] kstar,
-                         np.ndarray[DTYPE_t, ndim = 2] dist_indices,
-                         np.ndarray[DTYPE_t, ndim = 2] nind_list):
-    cdef DTYPE_t N = kstar.shape[0]
-    cdef DTYPE_t nspar = nind_list.shape[0]
-
-    cdef DTYPE_t i, j, ind_spar
-
-    cdef np.ndarray[DTYPE_t, ndim=1] common_neighs_array = np.zeros(nspar, dtype=np.int_)
-
-    for ind_spar in range(nspar):
+def return_common_neighs(long[:] kstar,
+                         long[:,:] dist_indices,
+                         long[:,:] nind_list,
+                         int method,
+                         int n_jobs):
+    # method: 0 = "jaccard", 1 = "geometric", 2 = "squared_geometric" (see NeighGraph.compute_neigh_similarity_index)
+    cdef Py_ssize_t N = kstar.shape[0]
+    cdef Py_ssize_t nspar = nind_list.shape[0]
+    cdef Py_ssize_t kmax = np.max(kstar)
+    cdef Py_ssize_t ind_spar, i, j, pi, pj
+    cdef long ki, kj, count, ni, nj
+
+    # sort each neighbourhood once; the entries beyond kstar are pushed to the end of the row by a sentinel
+    neighs = np.array(dist_indices[:, :kmax])
+    neighs[np.arange(kmax)[None, :] >= np.asarray(kstar)[:, None]] = N
+    neighs.sort(axis=1)
+    cdef long[:, ::1] sorted_neighs = neighs
+
+    common_neighs_nonview = np.zeros(nspar, dtype=np.int_)
+    similarity_nonview = np.zeros(nspar, dtype=np.float_)
+    cdef long[::1] common_neighs_array = common_neighs_nonview
+    cdef double[::1] neigh_similarity_index = similarity_nonview
+
+    for ind_spar in prange(nspar, nogil=True, num_threads=n_jobs):
         i = nind_list[ind_spar, 0]
         j = nind_list[ind_spar, 1]
-        common_neighs_array[ind_spar] = np.in1d(dist_indices[i, :kstar[i]], dist_indices[j, :kstar[j]],
-                                          assume_unique=True).sum()
-
-    return common_neighs_array
-
-# ----------------------------------------------------------------------------------------------
+        ki = kstar[i]
+        kj = kstar[j]
+
+        # count the common elements of the two sorted neighbourhoods with a (branchless) merge
+        count = 0
+        pi = 0
+        pj = 0
+        while pi < ki and pj < kj:
+            ni = sorted_neighs[i, pi]
+            nj = sorted_neighs[j, pj]
+            count = count + (ni == nj)
+            pi = pi + (ni <= nj)
+            pj = pj + (nj <= ni)
+
+        common_neighs_array[ind_spar] = count
+        if method == 0:
+            neigh_similarity_index[ind_spar] = count / <double> (ki + kj - count)
+        elif method == 1:
+            neigh_similarity_index[ind_spar] = count / sqrt(<double> (ki * kj))
+        else:
+            neigh_similarity_index[ind_spar] = count * count / <double> (ki * kj)
 
+    return common_neighs_nonview, similarity_nonview
 
 # ----------------------------------------------------------------------------------------------
 
 @cython.boundscheck(False)
-@cython.cdivision(True)
-def return_common_neighs_comp_mat(np.ndarray[DTYPE_t, ndim = 1] kstar,
-                         np.ndarray[DTYPE_t, ndim = 2] dist_indices,
-                         np.ndarray[DTYPE_t, ndim = 2] nind_list):
-    cdef DTYPE_t N = kstar.shape[0]
-    cdef DTYPE_t nspar = nind_list.shape[0]
+@cython.wraparound(False)
+cdef inline double _quad_form(double[:,:,:] grads_covmat,
+                              double[:,:] neigh_vector_diffs,
+                              Py_ssize_t a,
+                              Py_ssize_t z,
+                              Py_ssize_t b) noexcept nogil:
+    # r_a @ cov_z @ r_b
+    cdef Py_ssize_t dim1, dim2
+    cdef double tmp = 0.
+    for dim1 in range(neigh_vector_diffs.shape[1]):
+        for dim2 in range(neigh_vector_diffs.shape[1]):
+            tmp = tmp + neigh_vector_diffs[a,dim1]*grads_covmat[z,dim1,dim2]*neigh_vector_diffs[b,dim2]
+    return tmp
 
-    cdef DTYPE_t i, j, ind_spar
 
-    cdef np.ndarray[DTYPE_t, ndim=1] common_neighs_array = np.zeros(nspar, dtype=np.int_)
-    cdef np.ndarray[DTYPE_t, ndim=2] common_neighs_mat = np.zeros((N,N), dtype=np.int_)
-
-    for ind_spar in range(nspar):
-        i = nind_list[ind_spar, 0]
-        j = nind_list[ind_spar, 1]
-        if common_neighs_mat[j,i] == 0:
-            common_neighs_mat[i,j] = np.in1d(dist_indices[i, :kstar[i]], dist_indices[j, :kstar[j]],
-                                          assume_unique=True).sum()
-            common_neighs_mat[j,i] = common_neighs_mat[i,j]
-            common_neighs_array[ind_spar] = common_neighs_mat[i,j]
-        else:
-            common_neighs_mat[i,j] = common_neighs_mat[j,i]
-            common_neighs_array[ind_spar] = common_neighs_mat[j,i]
-
-    return common_neighs_array, common_neighs_mat
-
-# ----------------------------------------------------------------------------------------------
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline double _cross_gamma(double[:,:,:] grads_covmat,
+                                double[:,:] neigh_vector_diffs,
+                                Py_ssize_t a,
+                                Py_ssize_t i,
+                                Py_ssize_t j,
+                                Py_ssize_t b,
+                                Py_ssize_t l,
+                                Py_ssize_t m,
+                                double* p_i_row,
+                                double* p_j_row) noexcept nogil:
+    # sum over the endpoints x of a=(i,j) and y of b=(l,m) with positive pearson coefficient of
+    # p[x,y] * sqrt(|(r_a @ cov_x @ r_b) * (r_a @ cov_y @ r_b)|)
+    cdef double gamma = 0.
+    cdef double tmpi = 0., tmpj = 0., tmpl = 0., tmpm = 0.
+    cdef bint use_i = p_i_row[l] > 0 or p_i_row[m] > 0
+    cdef bint use_j = p_j_row[l] > 0 or p_j_row[m] > 0
+    cdef bint use_l = p_i_row[l] > 0 or p_j_row[l] > 0
+    cdef bint use_m = p_i_row[m] > 0 or p_j_row[m] > 0
+
+    if use_i:
+        tmpi = _quad_form(grads_covmat, neigh_vector_diffs, a, i, b)
+    if use_j:
+        tmpj = _quad_form(grads_covmat, neigh_vector_diffs, a, j, b)
+    if use_l:
+        tmpl = _quad_form(grads_covmat, neigh_vector_diffs, a, l, b)
+    if use_m:
+        tmpm = _quad_form(grads_covmat, neigh_vector_diffs, a, m, b)
+
+    if p_i_row[l] > 0:
+        gamma = gamma + p_i_row[l]*sqrt(fabs(tmpi*tmpl))
+    if p_i_row[m] > 0:
+        gamma = gamma + p_i_row[m]*sqrt(fabs(tmpi*tmpm))
+    if p_j_row[l] > 0:
+        gamma = gamma + p_j_row[l]*sqrt(fabs(tmpj*tmpl))
+    if p_j_row[m] > 0:
+        gamma = gamma + p_j_row[m]*sqrt(fabs(tmpj*tmpm))
+    return gamma
 
 
 @cython.boundscheck(False)
+@cython.wraparound(False)
 @cython.cdivision(True)
 def return_deltaFs_inv_cross_covariance(double[:,:,:] grads_covmat,
                                         double[:,:] neigh_vector_diffs,
                                         long[:,:] nind_list,          # nspar x 2
-                                        double[:,:] p,                  # pearson_correlation matrix (NxN)
-                                        double[:] Fij_var_array):
-    cdef int dims = neigh_vector_diffs.shape[1]
-    cdef int nspar = nind_list.shape[0]
+                                        long[:] nind_iptr,            # N + 1
+                                        double[:] p_data,             # symmetric pearson_mat in CSR form,
+                                        long[:] p_indices,            # with unit diagonal
+                                        long[:] p_indptr,
+                                        double[:] Fij_var_array,
+                                        int n_jobs):
+    # Only the couples of edges a=(i,j), b=(l,m) with a positive pearson coefficient between an endpoint of a and
+    # an endpoint of b contribute to the cross-covariance. For each edge a they are found by visiting the rows i and j
+    # of the sparse pearson matrix and the outgoing and incoming edges of the points in these rows.
+    # Each edge a only accumulates its own denominator, so the edges are processed in parallel without
+    # synchronisation (each couple is visited twice, once from each edge).
+    cdef Py_ssize_t N = nind_iptr.shape[0] - 1
+    cdef Py_ssize_t nspar = nind_list.shape[0]
+    cdef Py_ssize_t a, b, i, j, x, y, s, s2, u, t
+
+    # incoming edges of each point, in CSR form
+    in_edges_nonview = np.argsort(np.asarray(nind_list[:, 1]), kind="stable").astype(np.int_)
+    in_iptr_nonview = np.zeros(N + 1, dtype=np.int_)
+    in_iptr_nonview[1:] = np.cumsum(np.bincount(np.asarray(nind_list[:, 1]), minlength=N))
+    cdef long[::1] in_edges = in_edges_nonview
+    cdef long[::1] in_iptr = in_iptr_nonview
 
     inv_Gamma_nonview   = np.zeros(nspar, dtype=np.float_)       # inverse of diagonal of Gamma matrix
     cdef double[::1] inv_Gamma = inv_Gamma_nonview
-    
-    #support
-    denom_nonview   = np.zeros(nspar, dtype=np.float_)
-    cdef double[::1] denom = denom_nonview
-
-    cdef double gamma, ptot, tmpi, tmpj, tmpl, tmpm, temp
-    cdef int i,j,l,m,a,b,dim1,dim2    
-
-    for a in range(nspar):
-        i = nind_list[a, 0]
-        j = nind_list[a, 1]
-        inv_Gamma[a] = Fij_var_array[a]
-        denom[a] += Fij_var_array[a]*Fij_var_array[a]
-        for b in range(a+1, nspar):
-            l = nind_list[b, 0]
-            m = nind_list[b, 1]
-            gamma = 0
-            ptot = 0
-            tmpi = 0
-            tmpj = 0
-            tmpl = 0
-            tmpm = 0
-            if p[i,l] > 0:
-                ptot += p[i,l]
-
-                for dim1 in range(dims):
-                    for dim2 in range(dims):
-                        # r_ij @ vari @ r_lm
-                        tmpi += neigh_vector_diffs[a,dim1]*grads_covmat[i,dim1,dim2]*neigh_vector_diffs[b,dim2]        
-                for dim1 in range(dims):
-                    for dim2 in range(dims):
-                        # r_ij @ varl @ r_lm
-                        tmpl += neigh_vector_diffs[a,dim1]*grads_covmat[l,dim1,dim2]*neigh_vector_diffs[b,dim2]
-                gamma += p[i,l]*sqrt(fabs(tmpi*tmpl))
-
-                if p[i,m] > 0:
-                    for dim1 in range(dims):
-                        for dim2 in range(dims):
-                            # r_ij @ varm @ r_lm
-                            tmpm += neigh_vector_diffs[a,dim1]*grads_covmat[m,dim1,dim2]*neigh_vector_diffs[b,dim2]
-                    gamma += p[i,m]*sqrt(fabs(tmpi*tmpm))
-            else:
-                if p[i,m] > 0:
-                    ptot += p[i,m]
-                    for dim1 in range(dims):
-                        for dim2 in range(dims):
-                            # r_ij @ vari @ r_lm
-                            tmpi += neigh_vector_diffs[a,dim1]*grads_covmat[i,dim1,dim2]*neigh_vector_diffs[b,dim2]        
-                    for dim1 in range(dims):
-                        for dim2 in range(dims):
-                            # r_ij @ varm @ r_lm
-                            tmpm += neigh_vector_diffs[a,dim1]*grads_covmat[m,dim1,dim2]*neigh_vector_diffs[b,dim2]        
-                    gamma += p[i,m]*sqrt(fabs(tmpi*tmpm))
-
-            if p[j,l] > 0:
-                if ptot == 0:
-                    ptot += p[j,l]
-                    for dim1 in range(dims):
-                        for dim2 in range(dims):
-                            # r_ij @ varj @ r_lm
-                            tmpj += neigh_vector_diffs[a,dim1]*grads_covmat[j,dim1,dim2]*neigh_vector_diffs[b,dim2]
-                    for dim1 in range(dims):
-                        for dim2 in range(dims):
-                            # r_ij @ varl @ r_lm
-                            tmpl += neigh_vector_diffs[a,dim1]*grads_covmat[l,dim1,dim2]*neigh_vector_diffs[b,dim2]
-                    gamma += p[j,l]*sqrt(fabs(tmpj*tmpl))
-                    if p[j,m] > 0:
-                        for dim1 in range(dims):
-                            for dim2 in range(dims):
-                                # r_ij @ varm @ r_lm
-                                tmpm += neigh_vector_diffs[a,dim1]*grads_covmat[m,dim1,dim2]*neigh_vector_diffs[b,dim2]
-                        gamma += p[j,m]*sqrt(fabs(tmpj*tmpm))
-                else:
-                    for dim1 in range(dims):
-                        for dim2 in range(dims):
-                            # r_ij @ varj @ r_lm
-                            tmpj += neigh_vector_diffs[a,dim1]*grads_covmat[j,dim1,dim2]*neigh_vector_diffs[b,dim2]
-                    if tmpl == 0:
-                        for dim1 in range(dims):
-                            for dim2 in range(dims):
-                                # r_ij @ varl @ r_lm
-                                tmpl += neigh_vector_diffs[a,dim1]*grads_covmat[l,dim1,dim2]*neigh_vector_diffs[b,dim2]
-                    gamma += p[j,l]*sqrt(fabs(tmpj*tmpl))
-                    if p[j,m] > 0:
-                        if tmpm == 0:
-                            for dim1 in range(dims):
-                                for dim2 in range(dims):
-                                    # r_ij @ varm @ r_lm
-                                    tmpm += neigh_vector_diffs[a,dim1]*grads_covmat[m,dim1,dim2]*neigh_vector_diffs[b,dim2]
-                        gamma += p[j,m]*sqrt(fabs(tmpj*tmpm))
-            else:
-                if p[j,m] > 0:
-                    if ptot == 0:
-                        ptot += p[j,m]
-                    if tmpm == 0:
-                        for dim1 in range(dims):
-                            for dim2 in range(dims):
-                                # r_ij @ varm @ r_lm
-                                tmpm += neigh_vector_diffs[a,dim1]*grads_covmat[m,dim1,dim2]*neigh_vector_diffs[b,dim2]
-                    for dim1 in range(dims):
-                        for dim2 in range(dims):
-                            # r_ij @ varj @ r_lm
-                            tmpj += neigh_vector_diffs[a,dim1]*grads_covmat[j,dim1,dim2]*neigh_vector_diffs[b,dim2]
-                    gamma += p[j,m]*sqrt(fabs(tmpj*tmpm))
-            if ptot != 0:
-                denom[a] += gamma * gamma / 16.
-                denom[b] += gamma * gamma / 16.
-        
-    for a in range(nspar):
-        inv_Gamma[a] /= denom[a]
-
-    #return Gamma, inv_Gamma
-    return np.asarray(inv_Gamma)
+
+    cdef double gamma, gamma_sq_sum
+    cdef double* p_i_row
+    cdef double* p_j_row
+    cdef long* visited
+
+    with nogil, parallel(num_threads=n_jobs):
+        # dense copies of the rows i and j of the pearson matrix, and last edge a from which each edge b was visited
+        p_i_row = <double *> calloc(N, sizeof(double))
+        p_j_row = <double *> calloc(N, sizeof(double))
+        visited = <long *> malloc(nspar * sizeof(long))
+        for t in range(nspar):
+            visited[t] = -1
+
+        for a in prange(nspar, schedule='dynamic'):
+            i = nind_list[a, 0]
+            j = nind_list[a, 1]
+            for s in range(p_indptr[i], p_indptr[i + 1]):
+                p_i_row[p_indices[s]] = p_data[s]
+            for s in range(p_indptr[j], p_indptr[j + 1]):
+                p_j_row[p_indices[s]] = p_data[s]
+
+            gamma_sq_sum = 0.
+            visited[a] = a
+            for u in range(2):
+                x = i if u == 0 else j
+                for s in range(p_indptr[x], p_indptr[x + 1]):
+                    if p_data[s] <= 0:
+                        continue
+                    y = p_indices[s]
+                    for b in range(nind_iptr[y], nind_iptr[y + 1]):
+                        if visited[b] != a:
+                            visited[b] = a
+                            gamma = _cross_gamma(grads_covmat, neigh_vector_diffs, a, i, j,
+                                                 b, nind_list[b, 0], nind_list[b, 1], p_i_row, p_j_row)
+                            gamma_sq_sum = gamma_sq_sum + gamma * gamma
+                    for s2 in range(in_iptr[y], in_iptr[y + 1]):
+                        b = in_edges[s2]
+                        if visited[b] != a:
+                            visited[b] = a
+                            gamma = _cross_gamma(grads_covmat, neigh_vector_diffs, a, i, j,
+                                                 b, nind_list[b, 0], nind_list[b, 1], p_i_row, p_j_row)
+                            gamma_sq_sum = gamma_sq_sum + gamma * gamma
+
+            inv_Gamma[a] = Fij_var_array[a] / (Fij_var_array[a] * Fij_var_array[a] + gamma_sq_sum / 16.)
+
+            for s in range(p_indptr[i], p_indptr[i + 1]):
+                p_i_row[p_indices[s]] = 0.
+            for s in range(p_indptr[j], p_indptr[j + 1]):
+                p_j_row[p_indices[s]] = 0.
+
+        free(p_i_row)
+        free(p_j_row)
+        free(visited)
+
+    return inv_Gamma_nonview
 
 
 # ----------------------------------------------------------------------------------------------
@@ -494,4 +548,79 @@ def return_grads_and_covmat_from_nnvecdiffs(np.ndarray[floatTYPE_t, ndim = 2] ne
 
     return grads, grads_covmat
 
-# ----------------------------------------------------------------------------------------------
\ No newline at end of file
+# ----------------------------------------------------------------------------------------------
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef inline double _grad_var_along(double[:,:] neigh_vector_diffs,
+                                   long[:] nind_iptr,
+                                   long[:] kstar,
+                                   double dp2,
+                                   double[:,:] grads,
+                                   Py_ssize_t i,
+                                   Py_ssize_t e) noexcept nogil:
+    # r_e @ cov_i @ r_e, with cov_i the covariance matrix of the gradient in i (Bessel's correction and
+    # regularisation included) as returned by return_grads_and_covmat_from_nnvecdiffs, computed from the
+    # neighbour vectors of i without building cov_i
+    cdef Py_ssize_t dims = neigh_vector_diffs.shape[1]
+    cdef Py_ssize_t ki = kstar[i] - 1
+    cdef Py_ssize_t j, dim, ind_j
+    cdef double kifloat = <double> ki
+    cdef double rk_sq = 0., r_sq = 0., proj_sq_sum = 0., proj, grad_proj = 0., scale
+
+    for dim in range(dims):
+        rk_sq = rk_sq + neigh_vector_diffs[nind_iptr[i+1]-1, dim] * neigh_vector_diffs[nind_iptr[i+1]-1, dim]
+        r_sq = r_sq + neigh_vector_diffs[e, dim] * neigh_vector_diffs[e, dim]
+        grad_proj = grad_proj + grads[i, dim] * neigh_vector_diffs[e, dim]
+
+    for j in range(ki):
+        ind_j = nind_iptr[i] + j
+        proj = 0.
+        for dim in range(dims):
+            proj = proj + neigh_vector_diffs[ind_j, dim] * neigh_vector_diffs[e, dim]
+        proj_sq_sum = proj_sq_sum + proj * proj
+
+    scale = dp2 / rk_sq / kifloat
+    return (proj_sq_sum * scale * scale - grad_proj * grad_proj / kifloat) * kstar[i] / kifloat + 1.0e-10 * r_sq
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def return_deltaFs_from_nnvecdiffs(double[:,:] neigh_vector_diffs,
+                                   long[:,:] nind_list,
+                                   long[:] nind_iptr,
+                                   long[:] kstar,
+                                   double id_selected,
+                                   double[:,:] grads,
+                                   double[:] pearson_array,
+                                   int n_jobs):
+    # deltaF_ij = (g_i + g_j) @ r_ij / 2 and its variance (E_i^2 + E_j^2 + 2 p_ij E_i E_j) / 4, with
+    # E_i^2 = r_ij @ cov_i @ r_ij, computed edge by edge without materialising the gradient covariance matrices
+    cdef Py_ssize_t nspar = nind_list.shape[0]
+    cdef Py_ssize_t dims = neigh_vector_diffs.shape[1]
+    cdef Py_ssize_t e, i, j, dim
+    cdef double dp2 = id_selected + 2.
+    cdef double Fij, vari, varj
+
+    Fij_array_nonview = np.zeros(nspar, dtype=np.float_)
+    Fij_var_array_nonview = np.zeros(nspar, dtype=np.float_)
+    cdef double[::1] Fij_array = Fij_array_nonview
+    cdef double[::1] Fij_var_array = Fij_var_array_nonview
+
+    for e in prange(nspar, nogil=True, num_threads=n_jobs):
+        i = nind_list[e, 0]
+        j = nind_list[e, 1]
+
+        Fij = 0.
+        for dim in range(dims):
+            Fij = Fij + (grads[i, dim] + grads[j, dim]) * neigh_vector_diffs[e, dim]
+        Fij_array[e] = 0.5 * Fij
+
+        vari = _grad_var_along(neigh_vector_diffs, nind_iptr, kstar, dp2, grads, i, e)
+        varj = _grad_var_along(neigh_vector_diffs, nind_iptr, kstar, dp2, grads, j, e)
+        Fij_var_array[e] = 0.25 * (vari + varj + 2 * pearson_array[e] * sqrt(vari * varj))
+
+    return Fij_array_nonview, Fij_var_array_nonview
+
+# ----------------------------------------------------------------------------------------------
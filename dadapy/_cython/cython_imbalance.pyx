@@ -0,0 +1,546 @@
+import cython
+import numpy as np
+
+cimport numpy as np
+from cython.parallel cimport parallel, prange
+from libc.math cimport INFINITY, fabs, nearbyint
+from libc.stdlib cimport free, malloc
+
+# ----------------------------------------------------------------------------------------------
+
+cdef inline unsigned long long _splitmix64(unsigned long long x) noexcept nogil:
+    # counter-based generator: the state x is advanced by the caller, the output is a well mixed 64-bit integer
+    x = x + 0x9E3779B97F4A7C15ULL
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9ULL
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EBULL
+    return x ^ (x >> 31)
+
+# ----------------------------------------------------------------------------------------------
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _return_ranks(long[:,:] dist_indices_1,
+                  long[:,:] dist_indices_2,
+                  int k,
+                  unsigned long long seed,
+                  int n_jobs):
+    # Ranks according to distance 2 of the first k neighbours according to distance 1 (column 0 is the point
+    # itself). A neighbour missing from the maxk_2 neighbours of distance 2 gets a uniform random rank in
+    # [maxk_2, N), drawn from a stream that only depends on seed and on the point, so that the result does not
+    # depend on the number of threads.
+    # For small k each neighbour is looked up with a linear scan of the row of distance 2, which stops at its
+    # rank; for larger k the row is scattered once into a per-thread position array of size N.
+    cdef Py_ssize_t N = dist_indices_1.shape[0]
+    cdef Py_ssize_t maxk_2 = dist_indices_2.shape[1]
+    cdef Py_ssize_t i, kn, r, t
+    cdef long neigh, rank
+    cdef unsigned long long state
+    cdef bint scatter = k > 4
+    cdef long* position
+
+    ranks_nonview = np.zeros((N, k), dtype=np.float_)
+    cdef double[:, ::1] ranks = ranks_nonview
+
+    with nogil, parallel(num_threads=n_jobs):
+        position = NULL
+        if scatter:
+            position = <long *> malloc(N * sizeof(long))
+            for t in range(N):
+                position[t] = -1
+
+        for i in prange(N, schedule='static'):
+            state = seed ^ (<unsigned long long> i * 0xD1B54A32D192ED03ULL)
+
+            if scatter:
+                for r in range(maxk_2):
+                    position[dist_indices_2[i, r]] = r
+
+            for kn in range(k):
+                neigh = dist_indices_1[i, kn + 1]
+                rank = -1
+                if scatter:
+                    rank = position[neigh]
+                else:
+                    for r in range(maxk_2):
+                        if dist_indices_2[i, r] == neigh:
+                            rank = r
+                            break
+
+                if rank < 0:
+                    state = _splitmix64(state)
+                    rank = maxk_2 + <long> (state % <unsigned long long> (N - maxk_2))
+                ranks[i, kn] = rank
+
+            if scatter:
+                for r in range(maxk_2):
+                    position[dist_indices_2[i, r]] = -1
+
+        free(position)
+
+    return ranks_nonview
+
+# ----------------------------------------------------------------------------------------------
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef inline double _coord_contribution(double[:,:] X,
+                                       double[:] period,
+                                       int metric,
+                                       Py_ssize_t coord,
+                                       Py_ssize_t i,
+                                       Py_ssize_t l) noexcept nogil:
+    # contribution of a single coordinate to the (squared, for metric 0) distance between points i and l
+    cdef double diff = X[i, coord] - X[l, coord]
+    if period[coord] > 0:
+        diff = diff - period[coord] * nearbyint(diff / period[coord])
+    if metric == 0:
+        return diff * diff
+    return fabs(diff)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef inline double _distance(double[:,:] X,
+                             double[:] period,
+                             int metric,
+                             Py_ssize_t i,
+                             Py_ssize_t l) noexcept nogil:
+    # (squared, for metric 0) distance between points i and l
+    cdef Py_ssize_t coord
+    cdef double dist = 0.
+    for coord in range(X.shape[1]):
+        dist = dist + _coord_contribution(X, period, metric, coord, i, l)
+    return dist
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void _insert_neighbour(double* best_d, long* best_l, int k, double d, long l) noexcept nogil:
+    # insert l at distance d in the sorted list of the k nearest neighbours found so far
+    cdef Py_ssize_t pos = k - 1
+    if d >= best_d[k - 1]:
+        return
+    while pos > 0 and best_d[pos - 1] > d:
+        best_d[pos] = best_d[pos - 1]
+        best_l[pos] = best_l[pos - 1]
+        pos = pos - 1
+    best_d[pos] = d
+    best_l[pos] = l
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline Py_ssize_t _base_neighbour_list(double[:,:] X,
+                                            double[:] period,
+                                            int metric,
+                                            long[:] base_coords,
+                                            long[:,:] base_neighbours,
+                                            Py_ssize_t i,
+                                            double* list_d,
+                                            long* list_l) noexcept nogil:
+    # partial distances in the base space of the candidate neighbours of i, which the neighbour search returns
+    # ordered up to rounding: they are sorted again by insertion, in linear time. Returns the length of the list,
+    # without i.
+    cdef Py_ssize_t n_list = 0
+    cdef Py_ssize_t p, s, pos
+    cdef long l
+    cdef double d
+    for p in range(base_neighbours.shape[1]):
+        l = base_neighbours[i, p]
+        if l == i:
+            continue
+        d = 0.
+        for s in range(base_coords.shape[0]):
+            d = d + _coord_contribution(X, period, metric, base_coords[s], i, l)
+        pos = n_list
+        while pos > 0 and list_d[pos - 1] > d:
+            list_d[pos] = list_d[pos - 1]
+            list_l[pos] = list_l[pos - 1]
+            pos = pos - 1
+        list_d[pos] = d
+        list_l[pos] = l
+        n_list = n_list + 1
+    return n_list
+
+
+cdef inline double _list_guard(double* list_d, Py_ssize_t n_list, Py_ssize_t N) noexcept nogil:
+    # lower bound of the partial distance of the points out of the candidate neighbour list
+    if n_list == N - 1:
+        return INFINITY
+    if n_list == 0:
+        return -INFINITY
+    return list_d[n_list - 1]
+
+
+@cython.cdivision(True)
+cdef inline long _random_rank(unsigned long long state, Py_ssize_t draw, Py_ssize_t low, Py_ssize_t N) noexcept nogil:
+    # draw-th uniform random rank in [low, N) of the counter-based stream state
+    return low + <long> (_splitmix64(state + <unsigned long long> draw * 0x9E3779B97F4A7C15ULL)
+                         % <unsigned long long> (N - low))
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void _fill_base_row(double[:,:] X,
+                                double[:] period,
+                                int metric,
+                                long[:] base_coords,
+                                Py_ssize_t i,
+                                double* base) noexcept nogil:
+    # partial distances in the base space from i to all the points
+    cdef Py_ssize_t l, s
+    for l in range(X.shape[0]):
+        base[l] = 0.
+        for s in range(base_coords.shape[0]):
+            base[l] = base[l] + _coord_contribution(X, period, metric, base_coords[s], i, l)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _return_greedy_rank_sums(double[:,:] X,
+                             long[:] base_coords,
+                             long[:,:] base_neighbours,
+                             long[:] cand_coords,
+                             long[:] cand_ids,
+                             long[:] rows,
+                             long[:,:] target_ranks,
+                             double[:] period,
+                             int metric,
+                             int k,
+                             long n_cols,
+                             unsigned long long seed,
+                             bint resolve,
+                             int n_jobs):
+    # For each row i in rows and each candidate space base_coords + [cand_coords[c]], returns lower and upper
+    # bounds of the sums over the first k neighbours of: the ranks in the candidate space of the target neighbours
+    # of i, and the ranks in the target space of the candidate neighbours of i. As with neighbour tables of n_cols
+    # columns, ranks from n_cols on are missing and get a random rank in [n_cols, N) (in [maxk_t, N) in the target
+    # space); each rank has its own draw, keyed on seed, the point, cand_ids[c] and the neighbour.
+    # The distance of a candidate space is the partial distance of the base space plus the contribution of the
+    # candidate coordinate, so a point is closer in the candidate space than d only if it is closer in the base
+    # space. The neighbours of i are searched in base_neighbours[i], its nearest neighbours in the base space:
+    # when the points out of the list could matter, the ranks are bounded from the list and, if resolve, computed
+    # scanning all the points (the bounds are then equal). Metric 0 compares squared euclidean distances, metric
+    # 1 manhattan distances.
+    cdef Py_ssize_t N = X.shape[0]
+    cdef Py_ssize_t n_rows = rows.shape[0]
+    cdef Py_ssize_t n_base = base_coords.shape[0]
+    cdef Py_ssize_t n_cand = cand_coords.shape[0]
+    cdef Py_ssize_t maxk_t = target_ranks.shape[1]
+    cdef Py_ssize_t max_list = base_neighbours.shape[1]
+    cdef Py_ssize_t r, i, c, j, l, p, q, s, kn, m, t, n_list
+    cdef long count, rank, low, high, min_pos, max_pos
+    cdef bint have_base
+    cdef double dt, guard
+    cdef unsigned long long state
+    cdef double* base
+    cdef double* list_d
+    cdef double* list_c
+    cdef long* list_l
+    cdef double* best_d
+    cdef long* best_l
+    cdef long* position
+
+    sums_nonview = np.zeros((n_rows, n_cand, 2, 2), dtype=np.float_)
+    cdef double[:, :, :, ::1] sums = sums_nonview
+
+    with nogil, parallel(num_threads=n_jobs):
+        base = <double *> malloc(N * sizeof(double))
+        list_d = <double *> malloc((max_list + 1) * sizeof(double))
+        list_c = <double *> malloc((max_list + 1) * sizeof(double))
+        list_l = <long *> malloc((max_list + 1) * sizeof(long))
+        best_d = <double *> malloc(k * sizeof(double))
+        best_l = <long *> malloc(k * sizeof(long))
+        position = <long *> malloc(N * sizeof(long))
+        for q in range(N):
+            position[q] = -1
+
+        for r in prange(n_rows, schedule='dynamic'):
+            i = rows[r]
+            n_list = _base_neighbour_list(X, period, metric, base_coords, base_neighbours, i, list_d, list_l)
+            guard = _list_guard(list_d, n_list, N)
+            for m in range(maxk_t):
+                position[target_ranks[i, m]] = m
+            # the partial distances from i to all the points, computed only if needed
+            have_base = False
+
+            for c in range(n_cand):
+                j = cand_coords[c]
+                state = seed ^ (<unsigned long long> i * 0xD1B54A32D192ED03ULL) \
+                             ^ (<unsigned long long> cand_ids[c] * 0x8CB92BA72F3D8DD7ULL)
+                for p in range(n_list):
+                    list_c[p] = list_d[p] + _coord_contribution(X, period, metric, j, i, list_l[p])
+
+                # ranks in the candidate space of the neighbours in the target space
+                for kn in range(k):
+                    t = target_ranks[i, kn + 1]
+                    dt = 0.
+                    for s in range(n_base):
+                        dt = dt + _coord_contribution(X, period, metric, base_coords[s], i, t)
+                    dt = dt + _coord_contribution(X, period, metric, j, i, t)
+                    count = 1
+                    for p in range(n_list):
+                        if list_c[p] < dt and list_l[p] != t:
+                            count = count + 1
+                    if count < n_cols and dt > guard and resolve:
+                        if not have_base:
+                            _fill_base_row(X, period, metric, base_coords, i, base)
+                            have_base = True
+                        count = 1
+                        for l in range(N):
+                            if l != i and l != t and base[l] + _coord_contribution(X, period, metric, j, i, l) < dt:
+                                count = count + 1
+                                if count >= n_cols:
+                                    break
+                    if count >= n_cols:
+                        low = _random_rank(state, kn, n_cols, N)
+                        high = low
+                    elif dt <= guard or resolve:
+                        low = count
+                        high = count
+                    else:
+                        # either the rank is below n_cols, or it is missing
+                        low = count
+                        high = n_cols - 1
+                        if n_cols < N:
+                            high = max(high, _random_rank(state, kn, n_cols, N))
+                    sums[r, c, 0, 0] = sums[r, c, 0, 0] + low
+                    sums[r, c, 0, 1] = sums[r, c, 0, 1] + high
+
+                # k nearest neighbours in the candidate space, kept sorted by insertion
+                for kn in range(k):
+                    best_d[kn] = INFINITY
+                    best_l[kn] = -1
+                for p in range(n_list):
+                    _insert_neighbour(best_d, best_l, k, list_c[p], list_l[p])
+                if best_d[k - 1] > guard and resolve:
+                    if not have_base:
+                        _fill_base_row(X, period, metric, base_coords, i, base)
+                        have_base = True
+                    for kn in range(k):
+                        best_d[kn] = INFINITY
+                        best_l[kn] = -1
+                    for l in range(N):
+                        if l != i:
+                            _insert_neighbour(best_d, best_l, k,
+                                              base[l] + _coord_contribution(X, period, metric, j, i, l), l)
+
+                # ranks in the target space of the neighbours in the candidate space
+                if best_d[k - 1] <= guard or resolve:
+                    for kn in range(k):
+                        rank = position[best_l[kn]]
+                        if rank < 0:
+                            rank = _random_rank(state, k + kn, maxk_t, N)
+                        sums[r, c, 1, 0] = sums[r, c, 1, 0] + rank
+                        sums[r, c, 1, 1] = sums[r, c, 1, 1] + rank
+                else:
+                    # the neighbours are closer than best_d[k - 1]: they are either missing from the target
+                    # neighbours, or among the target neighbours that close
+                    min_pos = N
+                    max_pos = 0
+                    for m in range(1, maxk_t):
+                        t = target_ranks[i, m]
+                        dt = 0.
+                        for s in range(n_base):
+                            dt = dt + _coord_contribution(X, period, metric, base_coords[s], i, t)
+                        dt = dt + _coord_contribution(X, period, metric, j, i, t)
+                        if dt <= best_d[k - 1]:
+                            min_pos = min(min_pos, m)
+                            max_pos = max(max_pos, m)
+                    for kn in range(k):
+                        low = min_pos
+                        high = max_pos
+                        if maxk_t < N:
+                            rank = _random_rank(state, k + kn, maxk_t, N)
+                            low = min(low, rank)
+                            high = max(high, rank)
+                        sums[r, c, 1, 0] = sums[r, c, 1, 0] + low
+                        sums[r, c, 1, 1] = sums[r, c, 1, 1] + high
+
+            for m in range(maxk_t):
+                position[target_ranks[i, m]] = -1
+
+        free(base)
+        free(list_d)
+        free(list_c)
+        free(list_l)
+        free(best_d)
+        free(best_l)
+        free(position)
+
+    return sums_nonview
+
+# ----------------------------------------------------------------------------------------------
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _return_exact_ranks(double[:,:] X_A,
+                        double[:,:] X_B,
+                        double[:] period_A,
+                        double[:] period_B,
+                        int metric,
+                        int k,
+                        int n_jobs):
+    # Exact ranks in space B of the k nearest neighbours in space A of each point, and vice versa, without
+    # sorting the neighbour lists. For each point, a first pass over all the other points finds the k nearest
+    # neighbours in both spaces; a second pass counts, for each of them, the points which are closer in the
+    # other space. Ties are broken by the index of the points, as a stable sort of the distances would do.
+    # Also returns the distance of the nearest neighbour of each point in both spaces. Time O(N^2 (D_A + D_B)),
+    # memory O(N k); metric 0 compares squared euclidean distances, metric 1 manhattan distances.
+    cdef Py_ssize_t N = X_A.shape[0]
+    cdef Py_ssize_t i, l, kn
+    cdef double d_A, d_B
+    cdef double* best_d_A
+    cdef double* best_d_B
+    cdef long* best_l_A
+    cdef long* best_l_B
+    cdef double* thr_A
+    cdef double* thr_B
+
+    ranks_AB_nonview = np.zeros((N, k), dtype=np.float_)
+    ranks_BA_nonview = np.zeros((N, k), dtype=np.float_)
+    cdef double[:, ::1] ranks_AB = ranks_AB_nonview
+    cdef double[:, ::1] ranks_BA = ranks_BA_nonview
+    nearest_A_nonview = np.zeros(N, dtype=np.float_)
+    nearest_B_nonview = np.zeros(N, dtype=np.float_)
+    cdef double[::1] nearest_A = nearest_A_nonview
+    cdef double[::1] nearest_B = nearest_B_nonview
+
+    with nogil, parallel(num_threads=n_jobs):
+        best_d_A = <double *> malloc(k * sizeof(double))
+        best_d_B = <double *> malloc(k * sizeof(double))
+        best_l_A = <long *> malloc(k * sizeof(long))
+        best_l_B = <long *> malloc(k * sizeof(long))
+        thr_A = <double *> malloc(k * sizeof(double))
+        thr_B = <double *> malloc(k * sizeof(double))
+
+        for i in prange(N, schedule='dynamic'):
+            for kn in range(k):
+                best_d_A[kn] = INFINITY
+                best_d_B[kn] = INFINITY
+                best_l_A[kn] = -1
+                best_l_B[kn] = -1
+            for l in range(N):
+                if l == i:
+                    continue
+                _insert_neighbour(best_d_A, best_l_A, k, _distance(X_A, period_A, metric, i, l), l)
+                _insert_neighbour(best_d_B, best_l_B, k, _distance(X_B, period_B, metric, i, l), l)
+
+            nearest_A[i] = best_d_A[0]
+            nearest_B[i] = best_d_B[0]
+
+            # distances in the other space of the neighbours
+            for kn in range(k):
+                thr_B[kn] = _distance(X_B, period_B, metric, i, best_l_A[kn])
+                thr_A[kn] = _distance(X_A, period_A, metric, i, best_l_B[kn])
+                ranks_AB[i, kn] = 1
+                ranks_BA[i, kn] = 1
+
+            for l in range(N):
+                if l == i:
+                    continue
+                d_A = _distance(X_A, period_A, metric, i, l)
+                d_B = _distance(X_B, period_B, metric, i, l)
+                for kn in range(k):
+                    if d_B < thr_B[kn] or (d_B == thr_B[kn] and l < best_l_A[kn]):
+                        ranks_AB[i, kn] = ranks_AB[i, kn] + 1
+                    if d_A < thr_A[kn] or (d_A == thr_A[kn] and l < best_l_B[kn]):
+                        ranks_BA[i, kn] = ranks_BA[i, kn] + 1
+
+        free(best_d_A)
+        free(best_d_B)
+        free(best_l_A)
+        free(best_l_B)
+        free(thr_A)
+        free(thr_B)
+
+    return ranks_AB_nonview, ranks_BA_nonview, nearest_A_nonview, nearest_B_nonview
+
+# ----------------------------------------------------------------------------------------------
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _return_jackknife_imbalances(long[:,:] dist_indices_1,
+                                 long[:,:] dist_indices_2,
+                                 long[:] inv_indptr_2,
+                                 long[:] inv_rows_2,
+                                 long[:] inv_cols_2,
+                                 long[:] removed,
+                                 int k,
+                                 unsigned long long seed,
+                                 int n_jobs):
+    # Leave-one-out imbalances from distance 1 to distance 2, one for each point in removed, computed from a
+    # single pair of neighbour tables of the full dataset (maxk + 1 columns, column 0 is the point itself).
+    # The neighbour lists of the dataset without point i are the full ones with i dropped and truncated to maxk
+    # columns: the first k neighbours in distance 1 skip i, and their positions in distance 2 decrease by one
+    # when i precedes them. The rows of distance 2 containing i are found from its inverse index (CSR arrays
+    # inv_*). Neighbours missing from the truncated lists get a random rank in [maxk, N - 1), from a stream keyed
+    # on seed, the removed point and the row.
+    cdef Py_ssize_t N = dist_indices_1.shape[0]
+    cdef Py_ssize_t width = dist_indices_2.shape[1] - 1
+    cdef Py_ssize_t n_removed = removed.shape[0]
+    cdef Py_ssize_t j, c, m, r, i, taken, p, t
+    cdef long q
+    cdef double rank_sum
+    cdef unsigned long long state
+    cdef long* pos_2
+
+    # positions in distance 2 of the first k + 1 neighbours in distance 1, -1 if missing
+    base_pos_nonview = np.full((N, k + 1), -1, dtype=np.int_)
+    cdef long[:, ::1] base_pos = base_pos_nonview
+
+    imbalances_nonview = np.zeros(n_removed, dtype=np.float_)
+    cdef double[::1] imbalances = imbalances_nonview
+
+    for j in prange(N, nogil=True, num_threads=n_jobs, schedule='static'):
+        for c in range(k + 1):
+            for m in range(width + 1):
+                if dist_indices_2[j, m] == dist_indices_1[j, c + 1]:
+                    base_pos[j, c] = m
+                    break
+
+    with nogil, parallel(num_threads=n_jobs):
+        pos_2 = <long *> malloc(N * sizeof(long))
+        for t in range(N):
+            pos_2[t] = -1
+
+        for r in prange(n_removed, schedule='static'):
+            i = removed[r]
+            for p in range(inv_indptr_2[i], inv_indptr_2[i + 1]):
+                pos_2[inv_rows_2[p]] = inv_cols_2[p]
+
+            rank_sum = 0.
+            for j in range(N):
+                if j == i:
+                    continue
+                state = seed ^ (<unsigned long long> i * 0xD1B54A32D192ED03ULL) \
+                             ^ (<unsigned long long> j * 0x8CB92BA72F3D8DD7ULL)
+                taken = 0
+                for c in range(k + 1):
+                    if taken == k:
+                        break
+                    if dist_indices_1[j, c + 1] == i:
+                        continue
+                    q = base_pos[j, c]
+                    if q >= 0 and 0 <= pos_2[j] < q:
+                        q = q - 1
+                    if q < 0 or q >= width:
+                        state = _splitmix64(state)
+                        q = width + <long> (state % <unsigned long long> (N - 1 - width))
+                    rank_sum = rank_sum + q
+                    taken = taken + 1
+
+            imbalances[r] = rank_sum / ((N - 1) * k) / ((N - 1) / 2.)
+
+            for p in range(inv_indptr_2[i], inv_indptr_2[i + 1]):
+                pos_2[inv_rows_2[p]] = -1
+
+        free(pos_2)
+
+    return imbalances_nonview
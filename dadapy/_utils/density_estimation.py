@@ -18,7 +18,7 @@ import warnings
 import numpy as np
 from scipy.special import gammaln
 
-from dadapy._cython import cython_maximum_likelihood_opt as cml
+from dadapy._cython import cython_density as cd
 from dadapy._cython import cython_maximum_likelihood_opt_full as cml_full
 
 
@@ -63,87 +63,50 @@ def return_not_normalised_density_kstarNN(
 
 
 def return_not_normalised_density_PAk(
-    distances, intrinsic_dim, kstar, interpolation=False, bias=False
+    distances, intrinsic_dim, kstar, interpolation=False, bias=False, n_jobs=1
 ):
     N = distances.shape[0]
 
-    log_den = np.zeros(N, dtype=float)
-    prefactor = np.exp(
-        intrinsic_dim / 2.0 * np.log(np.pi) - gammaln((intrinsic_dim + 2.0) / 2.0)
-    )
-    log_den_min = 9.9e300
-
     if not interpolation:
-        logkstars = np.log(kstar, dtype=float)
         log_den_err = np.sqrt((4 * kstar + 2) / (kstar * (kstar - 1)), dtype=float)
     else:
-        logkstars = 1.0 / np.log(kstar - 1, dtype=float)
         log_den_err = np.sqrt(
             (4 * (kstar - 1) + 2) / ((kstar - 1) * ((kstar - 1) - 1)), dtype=float
         )
 
     if bias:
-        warnings.warn(
-            "bias contribution to the density error is an experimental \
-            feature and might change in the future"
-        )
+        warnings.warn("bias contribution to the density error is an experimental \
+            feature and might change in the future")
         log_den_err = (log_den_err**2 + (kstar / N) ** (2 / intrinsic_dim)) ** 0.5
 
     dc = distances[np.arange(N), kstar]
 
-    if intrinsic_dim * np.log(np.max(dc)) > np.log(np.max(np.finfo(np.float64).max)):
+    # volume shells, jitter of identical distances, overflow clamping and likelihood
+    # maximisation are fused in a single parallel loop over the points
+    log_den, n_identical, n_overflow, is_singular = cd._return_density_PAk(
+        np.asarray(distances, dtype=np.float64),
+        float(intrinsic_dim),
+        np.asarray(kstar, dtype=np.int64),
+        interpolation,
+        n_jobs,
+    )
+
+    nidentical = np.sum(n_identical)
+    if nidentical > 0:
         warnings.warn(
-            "Some volumes (r^intrisic_dim) may cause overflow: those values will \
-            be silently set to e^300."
-        )
-        noverflows = np.sum(
-            intrinsic_dim * np.log(dc) + np.log(prefactor)
-            > np.log(np.max(np.finfo(np.float64).max))
+            f"Found {nidentical} nearest neighbours at identical distance, adding a small amount of noise"
         )
-        print(
-            f"intrinsic_dim = {intrinsic_dim}, rmax = {np.max(dc)}, rmin = {np.min(dc)}, float type = {dc[0].dtype}, fraction of potential overflows = {noverflows}/{N}"
-        )
-
-    max_ratio = 0.0
-    for i in range(N):
-        vi = np.zeros(max(kstar), dtype=np.float64)
 
-        rr = logkstars[i] - (
-            np.log(prefactor) + intrinsic_dim * np.log(distances[i, kstar[i]])
+    noverflows = np.sum(n_overflow)
+    if noverflows > 0:
+        warnings.warn(
+            f"ID too high. Found {noverflows} shell volumes > e^300: settting volumes to e^300"
         )
 
-        knn = 0
-
-        for j in range(kstar[i]):
-            r = distances[i, j]
-            r1 = distances[i, j + 1]
-            ratio = r / r1
-            if ratio > max_ratio:
-                max_ratio = ratio
-            if np.abs(ratio - 1.0) < np.finfo(r.dtype).resolution:
-                warnings.warn(
-                    "Found nearest neighbours at identical distance, adding a small \
-                    amount of noise to one distance."
-                )
-                ratio -= 10 * np.finfo(r.dtype).resolution
-
-            exponent = intrinsic_dim * np.log(r1) + np.log(1 - ratio**intrinsic_dim)
-
-            if exponent > 300:
-                vi[j] = prefactor * np.exp(300.0)
-            else:
-                vi[j] = prefactor * np.exp(exponent)
-
-            if vi[j] < 1.0e-300:
-                knn = 1
-                break
-
-        if knn == 0:
-            log_den[i] = cml._nrmaxl(rr, kstar[i], vi)
-        else:
-            log_den[i] = rr
-        if log_den[i] < log_den_min:
-            log_den_min = log_den[i]
+    if is_singular:
+        warnings.warn(
+            "Hessian matrix in NR max likelihood maximization is sigular: using fixed point step"
+        )
 
     return log_den, log_den_err, dc
 
@@ -215,3 +178,114 @@ def return_not_normalised_density_PAk_optimized(
         )
 
     return log_den, log_den_err, dc
+
+
+def return_binned_bootstrap_means(
+    values, errors, bin_indices, n_bins, n_boot, chunk_size, rng
+):
+    """Compute per-bin averages of noisy per-point values and their bootstrap errors.
+
+    The bootstrap replicas resample the points with Poisson(1) weights and perturb each value with a
+    Gaussian noise of standard deviation given by its error. Points are processed in chunks and
+    only the (n_bins, n_boot) per-bin sums are stored, so that memory does not grow with N.
+
+    Args:
+        values (np.ndarray(float)): shape (N,), per-point values (e.g. free energies)
+        errors (np.ndarray(float)): shape (N,), per-point errors on the values
+        bin_indices (np.ndarray(int)): shape (N,), bin of each point in [0, n_bins), negative to discard it
+        n_bins (int): number of bins
+        n_boot (int): number of bootstrap replicas
+        chunk_size (int): number of points processed at once
+        rng (np.random.Generator): random number generator
+
+    Returns:
+        means (np.ndarray(float)): shape (n_bins,), average value in each bin (nan for empty bins)
+        errs (np.ndarray(float)): shape (n_bins,), bootstrap standard deviation of the averages
+        counts (np.ndarray(int)): shape (n_bins,), number of points in each bin
+    """
+    N = values.shape[0]
+
+    sums = np.zeros(n_bins, dtype=float)
+    counts = np.zeros(n_bins, dtype=int)
+    boot_sums = np.zeros(n_bins * n_boot, dtype=float)
+    boot_weights = np.zeros(n_bins * n_boot, dtype=float)
+    replica_offsets = np.arange(n_boot)
+
+    for start in range(0, N, chunk_size):
+        stop = min(start + chunk_size, N)
+        bins_chunk = bin_indices[start:stop]
+        keep = bins_chunk >= 0
+        bins_chunk = bins_chunk[keep]
+        vals_chunk = values[start:stop][keep]
+        errs_chunk = errors[start:stop][keep]
+
+        sums += np.bincount(bins_chunk, weights=vals_chunk, minlength=n_bins)
+        counts += np.bincount(bins_chunk, minlength=n_bins)
+
+        weights = rng.poisson(1.0, size=(bins_chunk.shape[0], n_boot)).astype(float)
+        noisy_vals = vals_chunk[:, None] + errs_chunk[:, None] * rng.standard_normal(
+            size=(bins_chunk.shape[0], n_boot)
+        )
+        flat_idx = (bins_chunk[:, None] * n_boot + replica_offsets[None, :]).ravel()
+
+        boot_sums += np.bincount(
+            flat_idx, weights=(weights * noisy_vals).ravel(), minlength=n_bins * n_boot
+        )
+        boot_weights += np.bincount(
+            flat_idx, weights=weights.ravel(), minlength=n_bins * n_boot
+        )
+
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        # empty bins (or bins never drawn in a replica) give nan averages
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        means = sums / counts
+        boot_means = (boot_sums / boot_weights).reshape(n_bins, n_boot)
+        errs = np.nanstd(boot_means, axis=1)
+
+    errs[counts == 0] = np.nan
+
+    return means, errs, counts
+
+
+def return_binned_bootstrap_counts(bin_indices, n_bins, n_boot, chunk_size, rng):
+    """Count the points in each bin, in the data and in bootstrap replicas of the data.
+
+    The bootstrap replicas resample the points with Poisson(1) weights. Points are processed in chunks and
+    only the (n_bins, n_boot) per-bin counts are stored, so that memory does not grow with N.
+
+    Args:
+        bin_indices (np.ndarray(int)): shape (N,), bin of each point in [0, n_bins), negative if outside all bins
+        n_bins (int): number of bins
+        n_boot (int): number of bootstrap replicas
+        chunk_size (int): number of points processed at once
+        rng (np.random.Generator): random number generator
+
+    Returns:
+        counts (np.ndarray(int)): shape (n_bins,), number of points in each bin
+        boot_counts (np.ndarray(float)): shape (n_bins, n_boot), weight of the points in each bin in each replica
+        boot_totals (np.ndarray(float)): shape (n_boot,), weight of all the points, also the ones outside the
+            bins, in each replica
+    """
+    N = bin_indices.shape[0]
+
+    counts = np.zeros(n_bins, dtype=int)
+    boot_counts = np.zeros(n_bins * n_boot, dtype=float)
+    boot_totals = np.zeros(n_boot, dtype=float)
+    replica_offsets = np.arange(n_boot)
+
+    for start in range(0, N, chunk_size):
+        stop = min(start + chunk_size, N)
+        bins_chunk = bin_indices[start:stop]
+        weights = rng.poisson(1.0, size=(bins_chunk.shape[0], n_boot)).astype(float)
+        boot_totals += np.sum(weights, axis=0)
+
+        keep = bins_chunk >= 0
+        bins_chunk = bins_chunk[keep]
+        counts += np.bincount(bins_chunk, minlength=n_bins)
+
+        flat_idx = (bins_chunk[:, None] * n_boot + replica_offsets[None, :]).ravel()
+        boot_counts += np.bincount(
+            flat_idx, weights=weights[keep].ravel(), minlength=n_bins * n_boot
+        )
+
+    return counts, boot_counts.reshape(n_bins, n_boot), boot_totals
@@ -22,13 +22,15 @@ from warnings import warn
 import matplotlib.pyplot as plt
 import numpy as np
 from joblib import Parallel, delayed
-from scipy.spatial import cKDTree  # TODO: remove if removing compute_dist_PBC
-from scipy.stats import rankdata
+from scipy.spatial import cKDTree
 from sklearn.metrics.pairwise import euclidean_distances
 
 from dadapy._cython import cython_differentiable_imbalance as c_dii
+from dadapy._utils.shared_tasks import iterate_shared_tasks
 
 CYTHON_DTYPE = np.float64
+# number of matrix entries computed together by each thread of the blocked functions
+BLOCK_SIZE = 2**22
 
 
 def cast_ndarrays(func):
@@ -91,6 +93,33 @@ def _return_optimal_lambda_from_distances(distance_matrix, fraction=1.0):
     return fraction * ((np.min(min_distances_nn) + np.nanmean(min_distances_nn)) / 2)
 
 
+def _return_optimal_lambda_from_nn_distances(nn_distances, fraction=1.0):
+    # same as _return_optimal_lambda_from_distances, from the distances of the first neighbours (column 0 is the point)
+    min_distances_nn = nn_distances[:, 2] - nn_distances[:, 1]
+    return fraction * ((np.min(min_distances_nn) + np.nanmean(min_distances_nn)) / 2)
+
+
+def _return_nn_distances(data, k, n_jobs, period=None):
+    """Computes the first k neighbours of each point, optionally with periodic boundary conditions.
+
+    Args:
+        data (np.ndarray): N x D array containing N datapoints in D-dimensional space.
+        k (int): number of neighbours to compute.
+        period (np.ndarray, optional): D array of periodicity (PBC) for the data points, 0 for non periodic features.
+
+    Returns:
+        nn_distances, nn_indices (np.ndarray): N x (k+1) arrays with the distances and the indices of the neighbours,
+            column 0 is the point itself.
+    """
+    if period is not None and np.any(period != 0):
+        # wrap all variables around the period, except the 0-period ones
+        data = np.mod(data, period, out=data.copy(), where=period != 0)
+    else:
+        period = None
+    tree = cKDTree(data, boxsize=period)
+    return tree.query(data, k=k + 1, workers=n_jobs)
+
+
 @cast_ndarrays
 def _return_full_dist_matrix(
     data: np.ndarray, n_jobs: int, period: np.ndarray = None, cythond=True
@@ -137,10 +166,19 @@ def _return_full_dist_matrix(
 
 
 def _return_full_rank_matrix(
-    data, n_jobs, period: np.ndarray = None, distances=False, cythond=True
+    data,
+    n_jobs,
+    period: np.ndarray = None,
+    distances=False,
+    cythond=True,
+    memmap_file: str = None,
 ):
     """Computes the rank matrix based on input data points and optionally a period array, using the 'compute_dist_matrix' function.
 
+    The ranks are computed in blocks of rows, in parallel, and stored with the smallest unsigned integer type that
+    can hold N (uint16 up to N = 65535, uint32 above). Unless the distance matrix is requested or cythond is False,
+    the distances are also computed block by block, so that no N x N float matrix is built.
+
     Args:
         data (np.ndarray): N x D array containing N datapoints in D-dimensional space.
         distances (bool, optional): if True, return also the distance matrix. Default: False.
@@ -150,18 +188,45 @@ def _return_full_rank_matrix(
         cythond (bool, optional): Flag indicating whether to use Cython-based distance computation methods.
             If True (default), Cython-based methods are used if period is not None (otherwise sklearn Euclidean distance).
             If False, Python-based methods are used.
+        memmap_file (str, optional): path of a .npy file in which the rank matrix is stored as a memory map.
+            Default: None, the rank matrix is kept in memory.
 
     Returns:
         numpy.ndarray: N x N rank matrix, where N is the number of datapoints in the input data.
     """
+    data = np.asarray(data, dtype=CYTHON_DTYPE)
+    N, D = data.shape
+    dtype = np.uint16 if N <= np.iinfo(np.uint16).max else np.uint32
+    if memmap_file is None:
+        rank_matrix = np.empty((N, N), dtype=dtype)
+    else:
+        rank_matrix = np.lib.format.open_memmap(
+            memmap_file, mode="w+", dtype=dtype, shape=(N, N)
+        )
 
-    dist_matrix = _return_full_dist_matrix(
-        data=data, period=period, cythond=cythond, n_jobs=n_jobs
-    )
-    # np.fill_diagonal(dist_matrix, np.nan)  ### To give last rank to diag. The distance function already sets diagonal to max, so unnecessary
-    # Make rank matrix, notice that ranks go from 1 to N and np.nan elements are ranked N
-    rank_matrix = rankdata(dist_matrix, method="average", axis=1).astype(
-        int, copy=False
+    dist_matrix = None
+    if distances or not cythond:
+        dist_matrix = _return_full_dist_matrix(
+            data=data, period=period, cythond=cythond, n_jobs=n_jobs
+        )
+    else:
+        periodic = period is not None
+        period = np.zeros(D) if period is None else np.asarray(period, CYTHON_DTYPE)
+    block_size = max(1, BLOCK_SIZE // N)
+
+    def rank_block(start):
+        stop = min(start + block_size, N)
+        if dist_matrix is None:
+            dist_rows = c_dii.return_distance_rows_cython(
+                data, np.ones(D), period, np.arange(start, stop), 1, periodic
+            )
+        else:
+            dist_rows = dist_matrix[start:stop]
+        # Make rank matrix, notice that ranks go from 1 to N and the point itself is ranked N
+        rank_matrix[start:stop] = _return_rank_rows_from_distances(dist_rows)
+
+    Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(rank_block)(start) for start in range(0, N, block_size)
     )
     if distances:
         return rank_matrix, dist_matrix
@@ -169,6 +234,74 @@ def _return_full_rank_matrix(
         return rank_matrix
 
 
+def _return_feature_sq_differences(data, n_jobs, period: np.ndarray = None):
+    """Computes the squared difference of each feature between each pair of points, optionally with PBC.
+
+    The rescaled squared distance for any weights w is then sum_a w_a^2 * feature_sq_differences[:, :, a]. The
+    differences are computed in parallel blocks of rows; the result takes 8 * N^2 * D bytes.
+
+    Args:
+        data (np.ndarray): N x D array containing N datapoints in D-dimensional space.
+        period (np.ndarray, optional): D array of periodicity (PBC) for the data points, 0 for non periodic features.
+
+    Returns:
+        numpy.ndarray: N x N x D array of squared differences.
+    """
+    data = np.asarray(data, dtype=CYTHON_DTYPE)
+    N, D = data.shape
+    feature_sq_differences = np.empty((N, N, D), dtype=CYTHON_DTYPE)
+    if period is not None:
+        period = np.asarray(period, dtype=CYTHON_DTYPE)
+        safe_period = np.where(period != 0, period, 1.0)
+    block_size = max(1, BLOCK_SIZE // (N * D))
+
+    def difference_block(start):
+        stop = min(start + block_size, N)
+        differences = data[start:stop, None, :] - data[None, :, :]
+        if period is not None:
+            # minimum image convention for the periodic features
+            differences -= np.where(
+                period != 0, period * np.round(differences / safe_period), 0.0
+            )
+        np.square(differences, out=feature_sq_differences[start:stop])
+
+    Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(difference_block)(start) for start in range(0, N, block_size)
+    )
+    return feature_sq_differences
+
+
+def _return_dii_cached(
+    feature_sq_differences, weights, rank_matrix_B, n_jobs, lambd: float = None
+):
+    """Computes the DII and its gradient from the cached squared differences of _return_feature_sq_differences.
+
+    Args:
+        feature_sq_differences (np.ndarray): N x N x D array of squared differences of the unscaled input features.
+        weights (np.ndarray): D array of weights of the input features.
+        rank_matrix_B (np.ndarray): N x N rank matrix for the groundtruth data B.
+        lambd (float, optional): The lambda scaling parameter of the softmax. If None, it is calculated automatically
+            as in _return_optimal_lambda_from_distances. Default is None.
+
+    Returns:
+        dii (float): The DII.
+        gradient (np.ndarray): D array with the gradient of the DII, as in _return_dii_gradient.
+        lambd (float): The lambda used.
+    """
+    weights = np.asarray(weights, dtype=CYTHON_DTYPE)
+    if lambd is None:
+        nearest = c_dii.return_nearest_distances_cached_cython(
+            feature_sq_differences, weights, n_jobs
+        )
+        lambd = _return_optimal_lambda_from_nn_distances(
+            np.column_stack([np.zeros(len(nearest)), nearest])
+        )
+    dii, gradient = c_dii.return_dii_cached_cython(
+        feature_sq_differences, weights, rank_matrix_B, lambd, n_jobs
+    )
+    return dii, gradient, lambd
+
+
 def _return_dii(dist_matrix_A, rank_matrix_B, lambd):
     """Computes the DII between two matrices based on distances of input data and rank information of groundtruth data.
 
@@ -380,6 +513,113 @@ def _return_dii_gradient(
         )
 
 
+@cast_ndarrays
+def _return_dii_sparse(
+    data_A: np.ndarray,
+    weights: np.ndarray,
+    nn_indices_B: np.ndarray,
+    n_jobs: int,
+    lambd: float = None,
+    k: int = 32,
+    tol: float = None,
+    period: np.ndarray = None,
+    candidates: tuple = None,
+):
+    """Compute the DII and its gradient keeping in the softmax of each point only a list of candidate neighbours.
+
+    The candidates are the first k neighbours of each point, searched in the space of the input features with
+    non-zero weight. When tol is not None, k is doubled until the k-th neighbour of every point is farther than
+    lambd * ln(1/tol) from its nearest neighbour, so that each neglected neighbour has a softmax weight smaller than
+    tol times the largest one. The candidates of a previous call can be passed back: they are reused, without a new
+    neighbour search, as long as this bound still holds for the current weights. Groundtruth neighbours beyond the
+    columns of nn_indices_B are given the mean of the ranks they could take. Cost O(N k D) after the neighbour search.
+
+    Args:
+        data_A : numpy.ndarray, shape (N, D)
+            The input array A, where N is the number of points and D is the number of dimensions.
+        weights : numpy.ndarray, shape (D,)
+            The array of weight values for the input values.
+        nn_indices_B : numpy.ndarray, shape (N, maxk+1)
+            The first maxk neighbours of each point in the groundtruth space, column 0 is the point itself.
+        lambd : float, optional
+            The lambda scaling parameter of the softmax. If None, it is calculated automatically. Default is None.
+        k : int
+            The number of neighbours kept in the softmax of each point (starting value if tol is not None).
+        tol : float, optional
+            Bound on the softmax weight of a neglected neighbour, relative to the largest weight of the point.
+            If None, k is not increased and candidates are never reused.
+        period : numpy.ndarray, shape (D,), optional
+            D(input) periods of the unscaled input, 0 for non periodic features. Default is None.
+        n_jobs : int
+            The number of threads to use for parallel processing.
+        candidates : tuple, optional
+            The candidates returned by a previous call. Default is None.
+
+    Returns:
+        dii (float): The DII with the truncated softmax.
+        gradient (np.ndarray): shape (D,). The gradient of the DII, normalised as in _return_dii_gradient.
+        lambd (float): The lambda used.
+        k (int): The number of neighbours kept in the softmax.
+        candidates (tuple): The weights of the neighbour search, the distance of the k-th neighbour of each point
+            and the N x (k+1) indices of the candidates.
+    """
+    N, D = data_A.shape
+    k = min(k, N - 1)
+    missing_rank = (nn_indices_B.shape[1] - 1 + N) / 2
+    cutoff = 0.0 if tol is None else np.log(1 / tol)
+    period_array = weights * 0.0 if period is None else period
+    lambd_fixed = lambd
+
+    if tol is not None and candidates is not None:
+        weights_ref, reach, nn_indices_A = candidates
+        # no input distance shrinks by more than the smallest weight ratio, so points outside the list stay
+        # at least shrink * reach away
+        ref_nonzero = weights_ref != 0
+        shrink = np.min(np.abs(weights[ref_nonzero] / weights_ref[ref_nonzero]))
+        nearest = c_dii.return_nearest_distances_cython(
+            data_A, weights, period_array, nn_indices_A, n_jobs, period is not None
+        )
+        if lambd is None:
+            lambd = _return_optimal_lambda_from_nn_distances(
+                np.column_stack([np.zeros(N), nearest])
+            )
+        if not np.all(
+            shrink * reach >= np.maximum(nearest[:, 1], nearest[:, 0] + lambd * cutoff)
+        ):
+            candidates = None
+            lambd = lambd_fixed
+
+    if tol is None or candidates is None:
+        nonzero = weights != 0
+        while True:
+            nn_distances_A, nn_indices_A = _return_nn_distances(
+                data_A[:, nonzero] * weights[nonzero],
+                k,
+                n_jobs=n_jobs,
+                period=None if period is None else (period * weights)[nonzero],
+            )
+            if lambd_fixed is None:
+                lambd = _return_optimal_lambda_from_nn_distances(nn_distances_A)
+            reach = nn_distances_A[:, -1] if k < N - 1 else np.full(N, np.inf)
+            if tol is None or np.all(reach >= nn_distances_A[:, 1] + lambd * cutoff):
+                break
+            k = min(2 * k, N - 1)
+        candidates = (weights.copy(), reach, nn_indices_A)
+
+    dii, gradient = c_dii.return_dii_sparse_cython(
+        data_A,
+        weights,
+        period_array,
+        candidates[2],
+        np.asarray(nn_indices_B, dtype=np.int_),
+        lambd,
+        missing_rank,
+        n_jobs,
+        period is not None,
+    )
+    return dii, gradient, lambd, k, candidates
+
+
 @cast_ndarrays
 def _optimize_dii(
     groundtruth_data: np.ndarray,
@@ -395,6 +635,9 @@ def _optimize_dii(
     period: np.ndarray = None,
     groundtruthperiod: np.ndarray = None,
     cythond: bool = True,
+    cache_distances: bool = False,
+    rank_matrix_B: np.ndarray = None,
+    tol: float = None,
 ):
     """Optimize the differentiable information imbalance using gradient descent of the DII between input data matrix A and groundtruth data matrix B.
 
@@ -428,6 +671,16 @@ def _optimize_dii(
             The number of threads to use for parallel processing. Default is None, which uses the maximum number of available CPUs.
         cythond : bool, optional
             Whether to use Cython implementation for computing distances. Default is True.
+        cache_distances : bool, optional
+            Whether to cache the squared differences of each input feature between all pairs of points (8 N^2 D
+            bytes), so that in each epoch the distances are weighted sums of cached terms and the DII and its gradient
+            are computed together, one row at a time. Default is False.
+        rank_matrix_B : numpy.ndarray, shape (N, N), optional
+            The rank matrix of the groundtruth, if already computed. Default is None, it is computed from
+            groundtruth_data.
+        tol : float, optional
+            Stop the optimization when the loss (DII plus l1 term) changes by less than tol times its value in 10
+            epochs; the remaining epochs repeat the last values. Default is None, all the epochs are run.
 
     Returns:
         weights_list, diis,l1_penalties
@@ -445,9 +698,10 @@ def _optimize_dii(
     weights_list = np.zeros((n_epochs + 1, D))
     scaling = 1  # if there is no constraint on rescaling of weights
 
-    rank_matrix_B = _return_full_rank_matrix(
-        groundtruth_data, n_jobs=n_jobs, period=groundtruthperiod, cythond=cythond
-    )
+    if rank_matrix_B is None:
+        rank_matrix_B = _return_full_rank_matrix(
+            groundtruth_data, n_jobs=n_jobs, period=groundtruthperiod, cythond=cythond
+        )
     # initializations
     if constrain:
         scaling = 1 / np.max(np.abs(weights_0))
@@ -455,23 +709,6 @@ def _optimize_dii(
     weights = scaling * weights_0
     weights_list[0] = weights
 
-    # rescale input data with the weights
-    rescaled_data_A = weights * data
-    # for adaptive lambda: calculate distance matrix in rescaled input
-    if period is not None:
-        # Removed period typecheck here, this should be handled somewhere else
-        dists_rescaled_A = _return_full_dist_matrix(
-            data=rescaled_data_A,
-            period=weights * period,
-            cythond=cythond,
-            n_jobs=n_jobs,
-        )
-    else:
-        periodarray = None
-        dists_rescaled_A = _return_full_dist_matrix(
-            data=rescaled_data_A, period=None, cythond=cythond, n_jobs=n_jobs
-        )
-
     if lambd is not None:
         lambd = (
             scaling * lambd
@@ -479,27 +716,61 @@ def _optimize_dii(
         adaptive_lambd = False
     else:
         adaptive_lambd = True
-        lambd = _return_optimal_lambda_from_distances(dists_rescaled_A)
 
-    diis[0] = _return_dii(dists_rescaled_A, rank_matrix_B, lambd)
+    if cache_distances:
+        # the DII and its gradient for the current weights are computed together from the cached differences
+        feature_sq_differences = _return_feature_sq_differences(
+            data, n_jobs, period=period
+        )
+        diis[0], cached_gradient, lambd = _return_dii_cached(
+            feature_sq_differences,
+            weights,
+            rank_matrix_B,
+            n_jobs,
+            None if adaptive_lambd else lambd,
+        )
+    else:
+        # rescale input data with the weights
+        rescaled_data_A = weights * data
+        # for adaptive lambda: calculate distance matrix in rescaled input
+        if period is not None:
+            # Removed period typecheck here, this should be handled somewhere else
+            dists_rescaled_A = _return_full_dist_matrix(
+                data=rescaled_data_A,
+                period=weights * period,
+                cythond=cythond,
+                n_jobs=n_jobs,
+            )
+        else:
+            periodarray = None
+            dists_rescaled_A = _return_full_dist_matrix(
+                data=rescaled_data_A, period=None, cythond=cythond, n_jobs=n_jobs
+            )
+        if adaptive_lambd:
+            lambd = _return_optimal_lambda_from_distances(dists_rescaled_A)
+
+        diis[0] = _return_dii(dists_rescaled_A, rank_matrix_B, lambd)
     l1_penalties[0] = l1_penalty * np.sum(np.abs(weights))
     lrate = l_rate  # for not expon. decaying learning rates
 
     for i_epoch in range(n_epochs):
         # compute gradient * SCALING!!!! to be scale invariant in case of no adaptive lambda
-        gradient = (
-            _return_dii_gradient(
-                dists_rescaled_A,
-                data,
-                rank_matrix_B,
-                weights,
-                lambd,
-                period=period,
-                n_jobs=n_jobs,
-                cythond=cythond,
+        if cache_distances:
+            gradient = cached_gradient * scaling
+        else:
+            gradient = (
+                _return_dii_gradient(
+                    dists_rescaled_A,
+                    data,
+                    rank_matrix_B,
+                    weights,
+                    lambd,
+                    period=period,
+                    n_jobs=n_jobs,
+                    cythond=cythond,
+                )
+                * scaling
             )
-            * scaling
-        )
         if np.isnan(gradient).any():  # If any of the gradient elements turned to nan
             diis[i_epoch + 1] = diis[i_epoch]
             l1_penalties[i_epoch + 1] = l1_penalties[i_epoch]
@@ -541,23 +812,45 @@ def _optimize_dii(
                 scaling = 1 / np.max(np.abs(weights))
             weights = scaling * weights
 
-            # for adaptive lambda: calculate distance matrix in rescaled input
-            rescaled_data_A = weights * data
-            if period is not None:
-                periodarray = weights * period
-            dists_rescaled_A = _return_full_dist_matrix(
-                rescaled_data_A, period=periodarray, cythond=cythond, n_jobs=n_jobs
-            )
             lambd = (
                 scaling * lambd
             )  # to make the gradient scale invariant. adaptive lambda automatically scales lambda to the features for scale invariance
-            if adaptive_lambd:
-                lambd = _return_optimal_lambda_from_distances(dists_rescaled_A)
+            if cache_distances:
+                diis[i_epoch + 1], cached_gradient, lambd = _return_dii_cached(
+                    feature_sq_differences,
+                    weights,
+                    rank_matrix_B,
+                    n_jobs,
+                    None if adaptive_lambd else lambd,
+                )
+            else:
+                # for adaptive lambda: calculate distance matrix in rescaled input
+                rescaled_data_A = weights * data
+                if period is not None:
+                    periodarray = weights * period
+                dists_rescaled_A = _return_full_dist_matrix(
+                    rescaled_data_A, period=periodarray, cythond=cythond, n_jobs=n_jobs
+                )
+                if adaptive_lambd:
+                    lambd = _return_optimal_lambda_from_distances(dists_rescaled_A)
 
-            # compute DII
-            diis[i_epoch + 1] = _return_dii(dists_rescaled_A, rank_matrix_B, lambd)
+                # compute DII
+                diis[i_epoch + 1] = _return_dii(dists_rescaled_A, rank_matrix_B, lambd)
             l1_penalties[i_epoch + 1] = l1_penalty * np.sum(np.abs(weights))
             weights_list[i_epoch + 1] = weights
+
+            # convergence of the loss over the last 10 epochs, as the change in a single epoch is noisy
+            if tol is not None and i_epoch >= 9:
+                loss_old = diis[i_epoch - 9] + l1_penalties[i_epoch - 9]
+                loss_new = diis[i_epoch + 1] + l1_penalties[i_epoch + 1]
+                converged = abs(loss_new - loss_old) <= tol * abs(loss_old)
+            else:
+                converged = False
+            if converged:
+                diis[i_epoch + 2 :] = diis[i_epoch + 1]
+                l1_penalties[i_epoch + 2 :] = l1_penalties[i_epoch + 1]
+                weights_list[i_epoch + 2 :] = weights
+                break
     #  if weightcheck == 1:
     #      print("The l1-regularization of ",l1_penalty," is too high. All features set to 0. No optimization possible")
     if l1_penalty == 0.0:
@@ -566,6 +859,358 @@ def _optimize_dii(
         return weights_list, diis, l1_penalties
 
 
+@cast_ndarrays
+def _optimize_dii_sparse(
+    groundtruth_data: np.ndarray,
+    data: np.ndarray,
+    n_jobs: int,
+    weights_0: np.ndarray = None,
+    lambd: float = None,
+    n_epochs: int = 100,
+    l_rate: float = None,
+    constrain: bool = False,
+    l1_penalty: float = 0.0,
+    decaying_lr: bool = True,
+    period: np.ndarray = None,
+    groundtruthperiod: np.ndarray = None,
+    maxk_groundtruth: int = None,
+    k: int = None,
+    tol: float = 1e-3,
+):
+    """Optimize the DII like _optimize_dii, truncating the softmax of each point to its nearest neighbours.
+
+    Neither N x N matrix is built: the groundtruth space is described by its first maxk_groundtruth neighbours, and
+    the loss and gradient are computed with _return_dii_sparse from the first k neighbours in the rescaled input
+    space. k is doubled whenever a neglected neighbour of some point has a relative softmax weight above tol, and the
+    neighbour lists are only searched again when the weight update makes them too short. With
+    maxk_groundtruth = k = N-1 the results are the ones of _optimize_dii.
+
+    Args:
+        groundtruth_data, data, n_jobs, weights_0, lambd, n_epochs, l_rate, constrain, l1_penalty, decaying_lr,
+            period, groundtruthperiod: see _optimize_dii.
+        maxk_groundtruth (int): number of groundtruth neighbours with an exact rank. Default: min(100, N-1).
+        k (int): starting number of neighbours in the softmax. Default: min(32, N-1).
+        tol (float): bound on the softmax weight of a neglected neighbour, relative to the largest weight of the
+            point. Default: 1e-3.
+
+    Returns:
+        weights_list, diis, l1_penalties: see _optimize_dii.
+    """
+    N = data.shape[0]
+    D = data.shape[1]
+
+    diis = np.ones(n_epochs + 1)  # +1: to include initial value
+    l1_penalties = np.zeros(n_epochs + 1)
+    weights_list = np.zeros((n_epochs + 1, D))
+    scaling = 1  # if there is no constraint on rescaling of weights
+
+    if maxk_groundtruth is None:
+        maxk_groundtruth = min(100, N - 1)
+    if k is None:
+        k = min(32, N - 1)
+
+    _, nn_indices_B = _return_nn_distances(
+        groundtruth_data, maxk_groundtruth, n_jobs=n_jobs, period=groundtruthperiod
+    )
+
+    # initializations
+    if constrain:
+        scaling = 1 / np.max(np.abs(weights_0))
+
+    weights = scaling * weights_0
+    weights_list[0] = weights
+
+    if lambd is not None:
+        lambd = scaling * lambd
+        adaptive_lambd = False
+    else:
+        adaptive_lambd = True
+
+    diis[0], gradient, lambd, k, candidates = _return_dii_sparse(
+        data, weights, nn_indices_B, n_jobs, lambd, k, tol, period
+    )
+    l1_penalties[0] = l1_penalty * np.sum(np.abs(weights))
+    lrate = l_rate  # for not expon. decaying learning rates
+
+    for i_epoch in range(n_epochs):
+        gradient = gradient * scaling
+        if np.isnan(gradient).any():  # If any of the gradient elements turned to nan
+            diis[i_epoch + 1] = diis[i_epoch]
+            l1_penalties[i_epoch + 1] = l1_penalties[i_epoch]
+            weights_list[i_epoch + 1] = weights_list[i_epoch]
+            warn(
+                "At least one gradient element turned to Nan, no optimization possible."
+            )
+            break
+
+        # exponentially decaying lr
+        if decaying_lr == True:
+            lrate = l_rate * 2 ** (
+                -i_epoch / 10
+            )  # every 10 epochs the learning rate will be halfed
+
+        # Gradient Descent Clipping update (Tsuruoka 2008)
+        weights_new = weights - lrate * gradient
+        for i, gam in enumerate(weights_new):
+            if gam > 0:
+                weights_new[i] = max(0.0, gam - lrate * l1_penalty)
+            elif gam < 0:
+                weights_new[i] = np.abs(min(0.0, gam + lrate * l1_penalty))
+        weights = weights_new
+        # exit the loop if all weights are 0 (e.g. l1-regularization too strong)
+        if weights.any() == 0:
+            diis[i_epoch + 1] = diis[i_epoch]
+            l1_penalties[i_epoch + 1] = l1_penalties[i_epoch]
+            weights_list[i_epoch + 1] = weights_list[i_epoch]
+            warn(
+                f"The l1-regularization of "
+                + str(l1_penalty)
+                + " is too high. All features would be set to 0. No full optimization possible",
+            )
+            break
+
+        # apply constrain on the weights
+        if constrain:
+            scaling = 1 / np.max(np.abs(weights))
+        weights = scaling * weights
+
+        lambd = scaling * lambd
+        diis[i_epoch + 1], gradient, lambd, k, candidates = _return_dii_sparse(
+            data,
+            weights,
+            nn_indices_B,
+            n_jobs,
+            None if adaptive_lambd else lambd,
+            k,
+            tol,
+            period,
+            candidates,
+        )
+        l1_penalties[i_epoch + 1] = l1_penalty * np.sum(np.abs(weights))
+        weights_list[i_epoch + 1] = weights
+
+    if l1_penalty == 0.0:
+        return weights_list, diis, diis * 0
+    else:
+        return weights_list, diis, l1_penalties
+
+
+def _return_rank_rows(data, anchors, n_jobs, period=None):
+    """Computes the ranks of all points with respect to a set of anchor points, as the rows of _return_full_rank_matrix.
+
+    Args:
+        data (np.ndarray): N x D array containing N datapoints in D-dimensional space.
+        anchors (np.ndarray): B array with the indices of the anchor points.
+        period (np.ndarray, optional): D array of periodicity (PBC) for the data points, 0 for non periodic features.
+
+    Returns:
+        rank_rows (np.ndarray): B x N array of ranks, each anchor has the last rank with respect to itself.
+    """
+    dist_rows = c_dii.return_distance_rows_cython(
+        data,
+        np.ones(data.shape[1]),
+        np.zeros(data.shape[1]) if period is None else period,
+        anchors,
+        n_jobs,
+        period is not None,
+    )
+    return _return_rank_rows_from_distances(dist_rows)
+
+
+def _return_rank_rows_from_distances(dist_rows):
+    # average ranks as in rankdata(dist_rows, method="average", axis=1).astype(int), vectorised over the rows
+    n_rows, N = dist_rows.shape
+    order = np.argsort(dist_rows, axis=1)
+    sorted_rows = np.take_along_axis(dist_rows, order, axis=1)
+    positions = np.broadcast_to(np.arange(N), (n_rows, N))
+    new_value = np.ones((n_rows, N), dtype=bool)
+    new_value[:, 1:] = sorted_rows[:, 1:] != sorted_rows[:, :-1]
+    last_value = np.ones((n_rows, N), dtype=bool)
+    last_value[:, :-1] = new_value[:, 1:]
+    first = np.maximum.accumulate(np.where(new_value, positions, 0), axis=1)
+    last = np.minimum.accumulate(np.where(last_value, positions, N)[:, ::-1], axis=1)[
+        :, ::-1
+    ]
+    rank_rows = np.empty((n_rows, N), dtype=int)
+    np.put_along_axis(rank_rows, order, (first + last) // 2 + 1, axis=1)
+    return rank_rows
+
+
+@cast_ndarrays
+def _optimize_dii_stochastic(
+    groundtruth_data: np.ndarray,
+    data: np.ndarray,
+    n_jobs: int,
+    weights_0: np.ndarray = None,
+    lambd: float = None,
+    n_epochs: int = 1000,
+    l_rate: float = None,
+    constrain: bool = False,
+    l1_penalty: float = 0.0,
+    period: np.ndarray = None,
+    groundtruthperiod: np.ndarray = None,
+    batch_size: int = 256,
+    n_validation: int = None,
+    patience: int = 50,
+    betas: tuple = (0.9, 0.999),
+    seed: int = None,
+):
+    """Optimize the DII with Adam on minibatches of anchor points, stopping when the validation DII stops improving.
+
+    Each epoch samples batch_size anchor points and estimates the DII gradient from their rows of the c-matrix only,
+    at cost O(batch_size N D) instead of O(N^2 D). The weights are updated with Adam (Kingma & Ba 2015) followed by
+    the l1 clipping of _optimize_dii. The DII reported for each epoch is the one estimated from the rows of a fixed
+    set of validation anchors, whose groundtruth ranks are computed once; the adaptive lambda is computed from the
+    same rows. The optimization stops when the validation DII has not improved for patience epochs.
+
+    Args:
+        groundtruth_data, data, n_jobs, weights_0, lambd, constrain, l1_penalty, period, groundtruthperiod:
+            see _optimize_dii.
+        n_epochs (int): maximum number of epochs, each using one minibatch. Default: 1000.
+        l_rate (float): Adam step size. Default: 0.01 times the largest initial weight.
+        batch_size (int): number of anchor points per minibatch. Default: 256.
+        n_validation (int): number of validation anchors, not used in the minibatches. Default: batch_size.
+        patience (int): number of epochs without improvement of the validation DII before stopping. Default: 50.
+        betas (tuple): decay rates of the first and second moment estimates of Adam. Default: (0.9, 0.999).
+        seed (int): seed of the random generator drawing the anchors. Default: None.
+
+    Returns:
+        weights_list, diis, l1_penalties: see _optimize_dii. The histories end at the epoch with the lowest
+            validation DII.
+    """
+    N = data.shape[0]
+    D = data.shape[1]
+    rng = np.random.default_rng(seed)
+    beta_1, beta_2 = betas
+    eps = 1e-8
+
+    if n_validation is None:
+        n_validation = batch_size
+    n_validation = min(n_validation, N - 1)
+    batch_size = min(batch_size, N - n_validation)
+
+    diis = np.ones(n_epochs + 1)  # +1: to include initial value
+    l1_penalties = np.zeros(n_epochs + 1)
+    weights_list = np.zeros((n_epochs + 1, D))
+    scaling = 1  # if there is no constraint on rescaling of weights
+
+    permutation = rng.permutation(N)
+    validation_anchors = np.sort(permutation[:n_validation])
+    train_anchors = permutation[n_validation:]
+    validation_ranks = _return_rank_rows(
+        groundtruth_data, validation_anchors, n_jobs, period=groundtruthperiod
+    )
+    periodic = period is not None
+    period_array = period if periodic else np.zeros(D)
+
+    # initializations
+    if constrain:
+        scaling = 1 / np.max(np.abs(weights_0))
+
+    weights = scaling * weights_0
+    if l_rate is None:
+        l_rate = 0.01 * np.max(np.abs(weights))
+    if lambd is not None:
+        lambd = scaling * lambd
+        adaptive_lambd = False
+    else:
+        adaptive_lambd = True
+    moment_1 = np.zeros(D)
+    moment_2 = np.zeros(D)
+    best_epoch = 0
+
+    for i_epoch in range(n_epochs + 1):
+        # validation DII and adaptive lambda from the validation rows
+        dist_rows = c_dii.return_distance_rows_cython(
+            data, weights, period_array, validation_anchors, n_jobs, periodic
+        )
+        if adaptive_lambd:
+            nearest = np.partition(dist_rows, 1, axis=1)[:, :2]
+            lambd = _return_optimal_lambda_from_nn_distances(
+                np.column_stack([np.zeros(n_validation), nearest])
+            )
+        diis[i_epoch], _ = c_dii.return_dii_rows_cython(
+            dist_rows,
+            data,
+            validation_anchors,
+            validation_ranks,
+            weights,
+            lambd,
+            period_array,
+            n_jobs,
+            periodic,
+        )
+        l1_penalties[i_epoch] = l1_penalty * np.sum(np.abs(weights))
+        weights_list[i_epoch] = weights
+
+        if diis[i_epoch] < diis[best_epoch]:
+            best_epoch = i_epoch
+        if i_epoch == n_epochs or i_epoch - best_epoch >= patience:
+            break
+
+        # minibatch gradient
+        batch = rng.choice(train_anchors, batch_size, replace=False)
+        gradient = (
+            c_dii.return_dii_rows_cython(
+                c_dii.return_distance_rows_cython(
+                    data, weights, period_array, batch, n_jobs, periodic
+                ),
+                data,
+                batch,
+                _return_rank_rows(
+                    groundtruth_data, batch, n_jobs, period=groundtruthperiod
+                ),
+                weights,
+                lambd,
+                period_array,
+                n_jobs,
+                periodic,
+            )[1]
+            * scaling
+        )
+        if np.isnan(gradient).any():  # If any of the gradient elements turned to nan
+            warn(
+                "At least one gradient element turned to Nan, no optimization possible."
+            )
+            break
+
+        # Adam update followed by the Gradient Descent Clipping of the l1 term (Tsuruoka 2008)
+        moment_1 = beta_1 * moment_1 + (1 - beta_1) * gradient
+        moment_2 = beta_2 * moment_2 + (1 - beta_2) * gradient**2
+        step = (moment_1 / (1 - beta_1 ** (i_epoch + 1))) / (
+            np.sqrt(moment_2 / (1 - beta_2 ** (i_epoch + 1))) + eps
+        )
+        weights_new = weights - l_rate * step
+        for i, gam in enumerate(weights_new):
+            if gam > 0:
+                weights_new[i] = max(0.0, gam - l_rate * l1_penalty)
+            elif gam < 0:
+                weights_new[i] = np.abs(min(0.0, gam + l_rate * l1_penalty))
+        # exit the loop if all weights are 0 (e.g. l1-regularization too strong)
+        if not weights_new.any():
+            warn(
+                f"The l1-regularization of "
+                + str(l1_penalty)
+                + " is too high. All features would be set to 0. No full optimization possible",
+            )
+            break
+
+        # apply constrain on the weights
+        if constrain:
+            scaling = 1 / np.max(np.abs(weights_new))
+        weights = scaling * weights_new
+        lambd = scaling * lambd
+
+    # the histories end at the best epoch, also when the optimization runs for all the n_epochs
+    diis = diis[: best_epoch + 1]
+    l1_penalties = l1_penalties[: best_epoch + 1]
+    weights_list = weights_list[: best_epoch + 1]
+    if l1_penalty == 0.0:
+        return weights_list, diis, diis * 0
+    else:
+        return weights_list, diis, l1_penalties
+
+
 @cast_ndarrays
 def _optimize_dii_static_zeros(
     groundtruth_data: np.ndarray,
@@ -580,6 +1225,7 @@ def _optimize_dii_static_zeros(
     period: np.ndarray = None,
     groundtruthperiod: np.ndarray = None,
     cythond: bool = True,
+    rank_matrix_B: np.ndarray = None,
 ):
     """Optimization where 0 weights stay 0. Used in backward eliminitaion of features
     Args:
@@ -595,6 +1241,8 @@ def _optimize_dii_static_zeros(
         period (float or np.ndarray/list): D(input) periods (input formatted to be 0-period). If not a list, the same period is assumed for all D features
         groundtruthperiod (float or np.ndarray/list): D(groundtruth) periods (groundtruth formatted to be 0-period).
                                                       If not a list, the same period is assumed for all D(groundtruth) features
+        rank_matrix_B (np.ndarray): N x N rank matrix of the groundtruth, if already computed. Default: None, it is
+            computed from groundtruth_data.
     Returns:
         weights:
         diis:
@@ -607,9 +1255,10 @@ def _optimize_dii_static_zeros(
     diis = np.ones(n_epochs + 1)  # +1: to include initial value
     weights_list = np.zeros((n_epochs + 1, D))
     scaling = 1  # if there is no constraint on rescaling of weights
-    rank_matrix_B = _return_full_rank_matrix(
-        groundtruth_data, period=groundtruthperiod, cythond=cythond, n_jobs=n_jobs
-    )
+    if rank_matrix_B is None:
+        rank_matrix_B = _return_full_rank_matrix(
+            groundtruth_data, period=groundtruthperiod, cythond=cythond, n_jobs=n_jobs
+        )
 
     # initializations
     if constrain:
@@ -719,6 +1368,276 @@ def _optimize_dii_static_zeros(
     return weights_list, diis
 
 
+def _optimize_dii_static_zeros_shared(
+    arrays, task, weights_0, lambd, n_epochs, l_rate, constrain, decaying_lr, period
+):
+    """Run _optimize_dii_static_zeros on the shared "data" and "rank_matrix_B" of the batch engine, with one thread.
+
+    Args:
+        arrays (dict): shared arrays "data" and "rank_matrix_B"
+        task: identifier of the task, returned with the result
+        weights_0, lambd, n_epochs, l_rate, constrain, decaying_lr, period: see _optimize_dii_static_zeros
+
+    Returns:
+        task, weights, diis: the identifier and the results of _optimize_dii_static_zeros
+    """
+    weights, diis = _optimize_dii_static_zeros(
+        groundtruth_data=None,
+        data=arrays["data"],
+        weights_0=weights_0,
+        n_jobs=1,
+        lambd=lambd,
+        n_epochs=n_epochs,
+        l_rate=l_rate,
+        constrain=constrain,
+        decaying_lr=decaying_lr,
+        period=period,
+        rank_matrix_B=arrays["rank_matrix_B"],
+    )
+    return task, weights, diis
+
+
+def _optimize_dii_lasso_segment(
+    data,
+    rank_matrix_B,
+    weights_0,
+    l1_penalties,
+    n_jobs,
+    lambd=None,
+    n_epochs=100,
+    l_rate=None,
+    constrain=False,
+    decaying_lr=True,
+    period=None,
+    cythond=True,
+    tol=1e-3,
+):
+    """Optimize the DII for a sequence of l1-penalties, warm-starting each optimization from the previous one.
+
+    A weight set to zero gets a zero gradient and can not become non-zero again, so the penalties should be
+    increasing: each optimization starts from the denser solution of the previous, weaker penalty. If an
+    optimization ends with all weights at zero, the next one starts again from weights_0. The warm-started
+    optimizations start close to their solution and stop early when the loss has converged within tol, the
+    optimizations from weights_0 run all the epochs.
+
+    Args:
+        data (np.ndarray): N x D(input) array of the input features.
+        rank_matrix_B (np.ndarray): N x N rank matrix of the groundtruth.
+        weights_0 (np.ndarray): D(input) initial weights of the first optimization.
+        l1_penalties (list): l1-regularization strengths, optimized in this order.
+        n_jobs, lambd, n_epochs, l_rate, constrain, decaying_lr, period, cythond: see _optimize_dii.
+        tol (float): tolerance of the warm-started optimizations, see _optimize_dii. None runs all the epochs.
+
+    Returns:
+        weights (np.ndarray): len(l1_penalties) x (n_epochs+1) x D(input) weights during each optimization.
+        diis (np.ndarray): len(l1_penalties) x (n_epochs+1) DIIs during each optimization.
+        l1_terms (np.ndarray): len(l1_penalties) x (n_epochs+1) l1 terms of the loss during each optimization.
+    """
+    weights = np.zeros((len(l1_penalties), n_epochs + 1, data.shape[1]))
+    diis = np.zeros((len(l1_penalties), n_epochs + 1))
+    l1_terms = np.zeros((len(l1_penalties), n_epochs + 1))
+    weights_start = weights_0
+    for i, l1_penalty in enumerate(l1_penalties):
+        weights[i], diis[i], l1_terms[i] = _optimize_dii(
+            groundtruth_data=None,
+            data=data,
+            weights_0=weights_start,
+            lambd=lambd,
+            n_epochs=n_epochs,
+            l_rate=l_rate,
+            constrain=constrain,
+            l1_penalty=l1_penalty,
+            decaying_lr=decaying_lr,
+            period=period,
+            n_jobs=n_jobs,
+            cythond=cythond,
+            rank_matrix_B=rank_matrix_B,
+            tol=None if weights_start is weights_0 else tol,
+        )
+        weights_start = weights[i, -1] if weights[i, -1].any() else weights_0
+    return weights, diis, l1_terms
+
+
+def _optimize_dii_lasso_segment_shared(
+    arrays,
+    task,
+    weights_0,
+    l1_penalties,
+    lambd,
+    n_epochs,
+    l_rate,
+    constrain,
+    decaying_lr,
+    period,
+    tol,
+):
+    """Run _optimize_dii_lasso_segment on the shared "data" and "rank_matrix_B" of the batch engine, with one thread.
+
+    Args:
+        arrays (dict): shared arrays "data" and "rank_matrix_B"
+        task: identifier of the task, returned with the result
+        weights_0, l1_penalties, lambd, n_epochs, l_rate, constrain, decaying_lr, period, tol:
+            see _optimize_dii_lasso_segment
+
+    Returns:
+        task, weights, diis, l1_terms: the identifier and the results of _optimize_dii_lasso_segment
+    """
+    return (task,) + _optimize_dii_lasso_segment(
+        arrays["data"],
+        arrays["rank_matrix_B"],
+        weights_0,
+        l1_penalties,
+        1,
+        lambd=lambd,
+        n_epochs=n_epochs,
+        l_rate=l_rate,
+        constrain=constrain,
+        decaying_lr=decaying_lr,
+        period=period,
+        tol=tol,
+    )
+
+
+def _optimize_dii_lasso_segments(
+    segments,
+    data,
+    rank_matrix_B,
+    n_jobs,
+    lambd=None,
+    n_epochs=100,
+    l_rate=None,
+    constrain=False,
+    decaying_lr=True,
+    period=None,
+    cythond=True,
+    n_processes=1,
+    tol=1e-3,
+):
+    """Optimize independent warm-started segments of l1-penalties with _optimize_dii_lasso_segment.
+
+    With n_processes > 1 the segments are spread over worker processes by iterate_shared_tasks, which read the
+    data and the rank matrix from memory-mapped files; each process uses one thread.
+
+    Args:
+        segments (list): (weights_0, l1_penalties) of each segment.
+        data (np.ndarray): N x D(input) array of the input features.
+        rank_matrix_B (np.ndarray): N x N rank matrix of the groundtruth.
+        n_jobs, lambd, n_epochs, l_rate, constrain, decaying_lr, period, cythond: see _optimize_dii.
+        n_processes (int): number of worker processes. Default: 1, the segments are optimized in the calling
+            process with n_jobs threads.
+        tol (float): tolerance of the warm-started optimizations, see _optimize_dii_lasso_segment.
+
+    Returns:
+        list of (weights, diis, l1_terms) of each segment, see _optimize_dii_lasso_segment.
+    """
+    optimization_args = (lambd, n_epochs, l_rate, constrain, decaying_lr, period)
+    if n_processes == 1:
+        return [
+            _optimize_dii_lasso_segment(
+                data,
+                rank_matrix_B,
+                weights_0,
+                l1_penalties,
+                n_jobs,
+                *optimization_args,
+                cythond=cythond,
+                tol=tol,
+            )
+            for weights_0, l1_penalties in segments
+        ]
+
+    results = [None] * len(segments)
+    tasks = (
+        (i, weights_0, l1_penalties) + optimization_args + (tol,)
+        for i, (weights_0, l1_penalties) in enumerate(segments)
+    )
+    for i, weights, diis, l1_terms in iterate_shared_tasks(
+        _optimize_dii_lasso_segment_shared,
+        {"data": data, "rank_matrix_B": rank_matrix_B},
+        tasks,
+        n_jobs=min(n_processes, len(segments)),
+    ):
+        results[i] = (weights, diis, l1_terms)
+    return results
+
+
+@cast_ndarrays
+def _optimize_dii_lasso_path(
+    groundtruth_data: np.ndarray,
+    data: np.ndarray,
+    weights_0: np.ndarray,
+    l1_penalties: list,
+    n_jobs: int,
+    lambd: float = None,
+    n_epochs: int = 100,
+    l_rate: float = None,
+    constrain: bool = False,
+    decaying_lr: bool = True,
+    period: np.ndarray = None,
+    groundtruthperiod: np.ndarray = None,
+    cythond: bool = True,
+    n_processes: int = 1,
+    rank_matrix_B: np.ndarray = None,
+    tol: float = 1e-3,
+):
+    """Optimize the DII along a regularization path of l1-penalties, with warm starts and a single rank matrix.
+
+    The penalties are sorted by increasing strength and split into n_processes contiguous segments. Each segment
+    starts from weights_0 and warm-starts each optimization from the solution of the previous, weaker penalty
+    (see _optimize_dii_lasso_segment); the segments are optimized in parallel processes sharing the groundtruth
+    rank matrix, which is computed once.
+
+    Args:
+        groundtruth_data, data, weights_0, n_jobs, lambd, n_epochs, l_rate, constrain, decaying_lr, period,
+            groundtruthperiod, cythond: see _optimize_dii.
+        l1_penalties (list): l1-regularization strengths.
+        n_processes (int): number of path segments and worker processes. Default: 1.
+        rank_matrix_B (np.ndarray): N x N rank matrix of the groundtruth, if already computed. Default: None, it is
+            computed from groundtruth_data.
+        tol (float): tolerance of the warm-started optimizations, see _optimize_dii_lasso_segment.
+
+    Returns:
+        weights (np.ndarray): len(l1_penalties) x (n_epochs+1) x D(input) weights during each optimization.
+        diis (np.ndarray): len(l1_penalties) x (n_epochs+1) DIIs during each optimization.
+        l1_terms (np.ndarray): len(l1_penalties) x (n_epochs+1) l1 terms of the loss during each optimization.
+        All in the order of l1_penalties.
+    """
+    if rank_matrix_B is None:
+        rank_matrix_B = _return_full_rank_matrix(
+            groundtruth_data, n_jobs=n_jobs, period=groundtruthperiod, cythond=cythond
+        )
+    l1_penalties = np.asarray(l1_penalties, dtype=float)
+    order = np.argsort(l1_penalties, kind="stable")
+    segments = [
+        (weights_0, list(l1_penalties[indices]))
+        for indices in np.array_split(order, min(n_processes, len(order)))
+    ]
+    results = _optimize_dii_lasso_segments(
+        segments,
+        data,
+        rank_matrix_B,
+        n_jobs,
+        lambd=lambd,
+        n_epochs=n_epochs,
+        l_rate=l_rate,
+        constrain=constrain,
+        decaying_lr=decaying_lr,
+        period=period,
+        cythond=cythond,
+        n_processes=n_processes,
+        tol=tol,
+    )
+
+    weights = np.zeros((len(order), n_epochs + 1, data.shape[1]))
+    diis = np.zeros((len(order), n_epochs + 1))
+    l1_terms = np.zeros((len(order), n_epochs + 1))
+    # the segments are contiguous pieces of the sorted penalties
+    weights[order] = np.concatenate([result[0] for result in results])
+    diis[order] = np.concatenate([result[1] for result in results])
+    l1_terms[order] = np.concatenate([result[2] for result in results])
+    return weights, diis, l1_terms
+
+
 def _refine_lasso_optimization(
     gs,
     ks,
@@ -737,6 +1656,10 @@ def _refine_lasso_optimization(
     groundtruthperiod=None,
     cythond=True,
     verbose=False,
+    path=False,
+    n_processes=1,
+    rank_matrix_B=None,
+    tol=1e-3,
 ):
     """Generate more lasso runs in between lasso strengths that produced non-consecutive numbers of non-zero weights
 
@@ -758,6 +1681,15 @@ def _refine_lasso_optimization(
         cythond (bool): Flag indicating whether to use Cython-based distance computation methods.
             Should be True (default) unless you want to test the Python-based methods.
         verbose (bool): Default: False. If True, print the time it took to optimize each lasso strength.
+        path (bool): Default: False. If True, the new l1-penalties between two tested ones are optimized as a
+            regularization path warm-started from the solution of the weaker one, with a single rank matrix
+            (see _optimize_dii_lasso_segments).
+        n_processes (int): Default: 1. Number of worker processes optimizing the refinements in parallel if path
+            is True.
+        rank_matrix_B (np.ndarray): N x N rank matrix of the groundtruth, if already computed. Default: None, it is
+            computed from groundtruth_data.
+        tol (float): Default: 1e-3. Tolerance of the warm-started optimizations if path is True, see
+            _optimize_dii_lasso_segment.
 
     Returns:
         opt_l_rate (float): Learning rate, which leads to optimal unregularized (no l1-penalty) result in the specified number of epochs
@@ -807,46 +1739,78 @@ def _refine_lasso_optimization(
     all_ks = list(ks[0 : refinement_needed[0][0] + 1])
     all_ls = list(ls[0 : refinement_needed[0][0] + 1])
 
+    if rank_matrix_B is None:
+        rank_matrix_B = _return_full_rank_matrix(
+            groundtruth_data, n_jobs=n_jobs, period=groundtruthperiod, cythond=cythond
+        )
+    if path:
+        # one warm-started segment per refinement, starting from the weaker of the two tested penalties
+        path_results = _optimize_dii_lasso_segments(
+            [
+                (
+                    gs[refinement[0], -1] if gs[refinement[0], -1].any() else weights_0,
+                    newl1,
+                )
+                for refinement, newl1 in zip(refinement_needed, newpenalties)
+            ],
+            data,
+            rank_matrix_B,
+            n_jobs,
+            lambd=lambd,
+            n_epochs=n_epochs,
+            l_rate=l_rate,
+            constrain=constrain,
+            decaying_lr=decaying_lr,
+            period=period,
+            cythond=cythond,
+            n_processes=n_processes,
+            tol=tol,
+        )
+
     for i, newl1 in enumerate(newpenalties):
         gs_new = np.zeros((len(newl1), n_epochs + 1, data.shape[1]))
         ks_new = np.zeros((len(newl1), n_epochs + 1))
         ls_new = np.zeros((len(newl1), n_epochs + 1))
-        # do the new optimizations
-        for j in range(len(newl1)):
-            if verbose:
-                start = time.time()
-
-            gs_new[j], ks_new[j], ls_new[j] = _optimize_dii(
-                groundtruth_data=groundtruth_data,
-                data=data,
-                weights_0=weights_0,
-                lambd=lambd,
-                n_epochs=n_epochs,
-                l_rate=l_rate,
-                constrain=constrain,
-                l1_penalty=newl1[j],
-                decaying_lr=decaying_lr,
-                period=period,
-                groundtruthperiod=groundtruthperiod,
-                n_jobs=n_jobs,
-                cythond=cythond,
-            )
-
-            if verbose:
-                end = time.time()
-                print(
-                    "in intercollation ",
-                    i + 1,
-                    " of ",
-                    len(newpenalties),
-                    "for test l1 ",
-                    j + 1,
-                    " of ",
-                    len(newl1),
-                    ", the time was: ",
-                    end - start,
+        if path:
+            gs_new, ks_new, ls_new = path_results[i]
+        else:
+            # do the new optimizations
+            for j in range(len(newl1)):
+                if verbose:
+                    start = time.time()
+
+                gs_new[j], ks_new[j], ls_new[j] = _optimize_dii(
+                    groundtruth_data=groundtruth_data,
+                    data=data,
+                    weights_0=weights_0,
+                    lambd=lambd,
+                    n_epochs=n_epochs,
+                    l_rate=l_rate,
+                    constrain=constrain,
+                    l1_penalty=newl1[j],
+                    decaying_lr=decaying_lr,
+                    period=period,
+                    groundtruthperiod=groundtruthperiod,
+                    n_jobs=n_jobs,
+                    cythond=cythond,
+                    rank_matrix_B=rank_matrix_B,
                 )
 
+                if verbose:
+                    end = time.time()
+                    print(
+                        "in intercollation ",
+                        i + 1,
+                        " of ",
+                        len(newpenalties),
+                        "for test l1 ",
+                        j + 1,
+                        " of ",
+                        len(newl1),
+                        ", the time was: ",
+                        end - start,
+                    )
+
         # make the intercollated list of penalties
         all_l1s = all_l1s + newpenalties[i]  # add refinement
         all_gs = all_gs + list(gs_new)
@@ -15,15 +15,24 @@
 
 import numpy as np
 
+from dadapy._cython import cython_imbalance as cim
+from dadapy._utils.shared_tasks import iterate_shared_tasks
+from dadapy._utils.utils import check_zero_distances, compute_nn_distances
 
-def _return_ranks(dist_indices_1, dist_indices_2, rng, k=1):
+
+def _return_ranks(dist_indices_1, dist_indices_2, rng, k=1, n_jobs=1):
     """Finds all the ranks according to distance 2 of the neighbours according to distance 1.
        Neighbours in distance 1 are considered up to order k.
 
+    Neighbours in distance 1 which are not among the maxk_2 neighbours in distance 2 are given a random rank
+    between maxk_2 and N. The random ranks are drawn from streams seeded by rng and are reproducible for any n_jobs.
+
     Args:
         dist_indices_1 (np.ndarray(int)): N x maxk matrix, nearest neighbours according to distance 1
         dist_indices_2 (np.ndarray(int))): N x maxk_2 matrix, nearest neighbours according to distance 2
+        rng (np.random.Generator): random generator seeding the random ranks
         k (int): order of nearest neighbour considered for the calculation of the conditional ranks, default is 1
+        n_jobs (int): number of threads, default is 1
 
     Returns:
         conditional_ranks (np.ndarray(int)): N x k matrix, ranks according to distance 2 of the neighbours in distance 1
@@ -31,37 +40,26 @@ def _return_ranks(dist_indices_1, dist_indices_2, rng, k=1):
     """
     assert dist_indices_1.shape[0] == dist_indices_2.shape[0]
 
-    N = dist_indices_1.shape[0]
-    maxk_2 = dist_indices_2.shape[1]
-
-    conditional_ranks = np.zeros((N, k))
-
-    for i in range(N):
-        idx_k_d1 = dist_indices_1[i, 1 : k + 1]
+    seed = rng.integers(np.iinfo(np.int64).max, dtype=np.uint64)
 
-        wr = [
-            np.where(idx_k_d1[k_neighbor] == dist_indices_2[i])[0]
-            for k_neighbor in range(k)
-        ]
-
-        for k_neighbor in range(k):
-            if len(wr[k_neighbor]) == 0:
-                conditional_ranks[i, k_neighbor] = rng.integers(
-                    low=maxk_2, high=N, size=1
-                )
-            else:
-                conditional_ranks[i, k_neighbor] = wr[k_neighbor][0]
-
-    return conditional_ranks
+    return cim._return_ranks(
+        np.asarray(dist_indices_1, dtype=np.int_),
+        np.asarray(dist_indices_2, dtype=np.int_),
+        k,
+        seed,
+        n_jobs,
+    )
 
 
-def _return_imbalance(dist_indices_1, dist_indices_2, rng, k=1):
+def _return_imbalance(dist_indices_1, dist_indices_2, rng, k=1, n_jobs=1):
     """Compute the information imbalance between two precomputed distance measures.
 
     Args:
         dist_indices_1 (np.ndarray(int)): nearest neighbours according to distance 1
         dist_indices_2 (np.ndarray(int)): nearest neighbours according to distance 2
+        rng (np.random.Generator): random generator seeding the random ranks (see _return_ranks)
         k (int): order of nearest neighbour considered for the calculation of the imbalance, default = 1
+        n_jobs (int): number of threads, default is 1
 
     Returns:
         (float): information imbalance from distance 1 to distance 2
@@ -71,13 +69,372 @@ def _return_imbalance(dist_indices_1, dist_indices_2, rng, k=1):
 
     N = dist_indices_1.shape[0]
 
-    ranks = _return_ranks(dist_indices_1, dist_indices_2, rng=rng, k=k)
+    ranks = _return_ranks(dist_indices_1, dist_indices_2, rng=rng, k=k, n_jobs=n_jobs)
 
     imb = np.mean(ranks) / (N / 2.0)
 
     return imb
 
 
+def _return_jackknife_imbalances(
+    dist_indices_1, dist_indices_2, removed, rng, k=1, n_jobs=1
+):
+    """Compute the leave-one-out information imbalances from the neighbour tables of the full dataset.
+
+    The imbalance obtained removing point i equals the one computed from the neighbour lists of the dataset without
+    i, with maxk - 1 neighbours each, where maxk + 1 is the number of columns of the tables.
+
+    Args:
+        dist_indices_1 (np.ndarray(int)): N x (maxk + 1) matrix, nearest neighbours according to distance 1
+        dist_indices_2 (np.ndarray(int)): N x (maxk + 1) matrix, nearest neighbours according to distance 2
+        removed (np.ndarray(int)): indices of the points removed, one at a time
+        rng (np.random.Generator): random generator seeding the random ranks of missing neighbours
+        k (int): order of nearest neighbour considered for the calculation of the imbalances, default is 1
+        n_jobs (int): number of threads, default is 1
+
+    Returns:
+        imbalances (np.ndarray(float)): information imbalances from distance 1 to distance 2 without each point of
+            removed
+
+    """
+    assert dist_indices_1.shape == dist_indices_2.shape
+    N, maxk = dist_indices_2.shape
+    assert (
+        k < maxk - 1
+    ), "k must be smaller than the number of neighbours of the reduced datasets"
+
+    # inverse index of distance 2: the (row, column) pairs where each point appears as a neighbour
+    neighbours = np.asarray(dist_indices_2[:, 1:], dtype=np.int_).ravel()
+    order = np.argsort(neighbours, kind="stable")
+    inv_rows = order // (maxk - 1)
+    inv_cols = order % (maxk - 1) + 1
+    inv_indptr = np.zeros(N + 1, dtype=np.int_)
+    np.cumsum(np.bincount(neighbours, minlength=N), out=inv_indptr[1:])
+
+    seed = rng.integers(np.iinfo(np.int64).max, dtype=np.uint64)
+
+    return cim._return_jackknife_imbalances(
+        np.asarray(dist_indices_1, dtype=np.int_),
+        np.asarray(dist_indices_2, dtype=np.int_),
+        inv_indptr,
+        inv_rows,
+        inv_cols,
+        np.asarray(removed, dtype=np.int_),
+        k,
+        seed,
+        n_jobs,
+    )
+
+
+def _return_imbalances_exact(
+    X_A, X_B, k=1, metric="euclidean", period_A=None, period_B=None, n_jobs=1
+):
+    """Compute the information imbalances between two spaces from exact ranks, without sorting neighbour lists.
+
+    Equivalent to _return_imbalance on complete (N-1) neighbour lists of both spaces, with ties between distances
+    broken by the index of the points as in a stable sort, in O(N^2 (D_A + D_B)) time and O(N k) memory.
+
+    Args:
+        X_A (np.ndarray(float)): N x D_A coordinates in space A
+        X_B (np.ndarray(float)): N x D_B coordinates in space B
+        k (int): order of nearest neighbour considered for the calculation of the imbalances
+        metric (str): "euclidean" or "manhattan"
+        period_A (float, np.ndarray(float)): periods of the coordinates of space A, or None
+        period_B (float, np.ndarray(float)): periods of the coordinates of space B, or None
+        n_jobs (int): number of threads
+
+    Returns:
+        (float, float): the information imbalances from space A to space B and vice versa
+
+    """
+    assert X_A.shape[0] == X_B.shape[0]
+    N = X_A.shape[0]
+
+    ranks_AB, ranks_BA, nearest_A, nearest_B = cim._return_exact_ranks(
+        np.ascontiguousarray(X_A, dtype=np.float_),
+        np.ascontiguousarray(X_B, dtype=np.float_),
+        _return_period_array(period_A, X_A.shape[1]),
+        _return_period_array(period_B, X_B.shape[1]),
+        _return_metric_id(metric),
+        k,
+        n_jobs,
+    )
+    nearest = np.concatenate((nearest_A, nearest_B))
+    if metric == "euclidean":
+        nearest = np.sqrt(nearest)
+    check_zero_distances(nearest)
+
+    return np.mean(ranks_AB) / (N / 2.0), np.mean(ranks_BA) / (N / 2.0)
+
+
+def _return_metric_id(metric):
+    """Return the identifier of a metric in the cython_imbalance kernels."""
+    if metric == "euclidean":
+        return 0
+    if metric == "manhattan":
+        return 1
+    raise ValueError("only the euclidean and manhattan metrics are supported")
+
+
+def _return_period_array(period, dims):
+    """Return the periods of dims coordinates as an array, with 0 for non periodic coordinates."""
+    if period is None:
+        return np.zeros(dims)
+    return np.broadcast_to(np.asarray(period, dtype=np.float_), (dims,)).copy()
+
+
+def _return_inf_imb_incremental(
+    X,
+    base_tuples,
+    target_ranks,
+    rng,
+    k=1,
+    n_best=10,
+    symm=True,
+    metric="euclidean",
+    period=None,
+    maxk=None,
+    n_jobs=1,
+):
+    """Compute the imbalances between a target space and all the tuples obtained adding one feature to base tuples.
+
+    The ranks are the ones of neighbour tables of maxk neighbours, as in return_inf_imb_target_selected_coords:
+    the ranks in a candidate space from maxk + 1 on are replaced by random ranks. The distance of a candidate tuple
+    is the partial distance of its base tuple plus the contribution of the new feature, so its neighbours are
+    first searched among the nearest neighbours of the base tuple, computed once for all its candidates. The
+    partial distances also bound the ranks of each point for each candidate. Points are processed in random order
+    in chunks; after each chunk, a candidate whose lower bound on the imbalance exceeds the upper bound of the
+    n_best-th best candidate cannot be among the n_best tuples and is no longer evaluated.
+
+    Args:
+        X (np.ndarray(float)): N x D matrix of the features
+        base_tuples (list(list(int))): tuples of features to which one more feature is added
+        target_ranks (np.ndarray(int)): N x maxk_t nearest neighbours in the target space
+        rng (np.random.Generator): random generator for the order of the points and the random ranks
+        k (int): order of nearest neighbour considered for the calculation of the imbalances
+        n_best (int): number of best tuples which must be computed exactly
+        symm (bool): whether the tuples are ranked with the symmetrised information imbalance
+        metric (str): "euclidean" or "manhattan"
+        period (float, np.ndarray(float)): periods of the features, or None
+        maxk (int): number of neighbours of the tuple spaces, default is N - 1
+        n_jobs (int): number of threads
+
+    Returns:
+        coord_list (list(list(int))): the candidate tuples, without repetitions
+        imbalances (np.ndarray(float)): 2 x len(coord_list) matrix with the imbalances from the target to the
+            tuples and vice versa; np.nan for pruned tuples
+
+    """
+    N, dims = X.shape
+    metric_id = _return_metric_id(metric)
+    periods = _return_period_array(period, dims)
+    n_cols = N if maxk is None else min(maxk + 1, N)
+    # the candidate neighbours of a base tuple; the longer the list, the fewer points are searched out of it
+    n_list = min(2 * n_cols, N)
+
+    # candidate tuples without repetitions, grouped by the base tuple from which they are generated
+    coord_list = []
+    groups = []
+    seen = set()
+    for base in base_tuples:
+        cand_coords = []
+        cand_ids = []
+        for j in range(dims):
+            key = frozenset(base) | {j}
+            if j in base or key in seen:
+                continue
+            seen.add(key)
+            cand_coords.append(j)
+            cand_ids.append(len(coord_list))
+            coord_list.append([int(c) for c in base] + [j])
+        base = np.array(base, dtype=np.int_)
+        if len(base) > 0:
+            _, base_neighbours = compute_nn_distances(
+                X[:, base],
+                n_list - 1,
+                metric,
+                None if period is None else periods[base],
+                n_jobs=n_jobs,
+            )
+        else:
+            base_neighbours = np.zeros((N, 0))
+        groups.append(
+            (
+                base,
+                np.asarray(base_neighbours, dtype=np.int_),
+                np.array(cand_coords, dtype=np.int_),
+                np.array(cand_ids, dtype=np.int_),
+            )
+        )
+
+    n_tuples = len(coord_list)
+    active = np.ones(n_tuples, dtype=bool)
+    weights = np.array([np.sqrt(0.5), np.sqrt(0.5)]) if symm else np.array([0.0, 1.0])
+
+    X = np.ascontiguousarray(X, dtype=np.float_)
+    target_ranks = np.asarray(target_ranks, dtype=np.int_)
+    order = rng.permutation(N)
+    seed = rng.integers(np.iinfo(np.int64).max, dtype=np.uint64)
+    chunk_size = int(np.clip(2**20 // n_tuples, 1, max(N // 16, 1)))
+    starts = range(0, N, chunk_size)
+
+    def rank_sums(rows, resolve, mask):
+        # lower and upper bounds of the rank sums of the points in rows, exact if resolve
+        row_sums = np.zeros((n_tuples, 2, 2))
+        for base, base_neighbours, cand_coords, cand_ids in groups:
+            group_mask = mask[cand_ids]
+            if group_mask.any():
+                row_sums[cand_ids[group_mask]] = cim._return_greedy_rank_sums(
+                    X,
+                    base,
+                    base_neighbours,
+                    cand_coords[group_mask],
+                    cand_ids[group_mask],
+                    rows,
+                    target_ranks,
+                    periods,
+                    metric_id,
+                    k,
+                    n_cols,
+                    seed,
+                    resolve,
+                    n_jobs,
+                ).sum(axis=0)
+        return row_sums[mask]
+
+    def prune():
+        # a tuple whose lower bound exceeds the upper bound of the n_best-th best tuple cannot be among the n_best
+        if active.sum() > n_best:
+            lower = sums[:, :, :, 0].sum(axis=0) @ weights
+            upper = sums[:, :, :, 1].sum(axis=0) @ weights
+            active[:] &= lower <= np.sort(upper[active])[n_best - 1]
+
+    # bounds of the rank sums of each chunk of points, from the candidate neighbour lists only
+    sums = np.zeros((len(starts), n_tuples, 2, 2))
+    for chunk, start in enumerate(starts):
+        sums[chunk] = rank_sums(order[start : start + chunk_size], False, active)
+    prune()
+
+    # exact rank sums of the chunks in which some ranks are only bounded, for the tuples not pruned
+    for chunk, start in enumerate(starts):
+        bounded = active & (sums[chunk, :, :, 0] < sums[chunk, :, :, 1]).any(axis=1)
+        if bounded.any():
+            sums[chunk, bounded] = rank_sums(
+                order[start : start + chunk_size], True, bounded
+            )
+            prune()
+
+    imbalances = sums[:, :, :, 0].sum(axis=0) / (N * k) / (N / 2.0)
+    imbalances[~active] = np.nan
+
+    return coord_list, imbalances.T
+
+
+def _return_imb_with_coords_shared(
+    arrays, task, coords, target_coords, k, maxk, metric, period, target_period, seed
+):
+    """Compute the imbalances between a target space and the space of a subset of coordinates of the shared X.
+
+    The target ranks are the shared ones if target_coords is None, otherwise they are computed from the
+    target_coords columns of X.
+
+    Args:
+        arrays (dict): shared arrays, "X" and optionally "target_ranks"
+        task (int): index of the task, returned with the result
+        coords (list(int)): coordinates of X building the distance compared to the target
+        target_coords (list(int)): coordinates of X building the target distance, or None
+        k (int): order of nearest neighbour considered for the calculation of the imbalance
+        maxk (int): number of neighbours computed for the distance of coords (and target_coords)
+        metric (str): metric used to compute the distances
+        period (np.ndarray(float)): periods of coords, or None
+        target_period (np.ndarray(float)): periods of target_coords, or None
+        seed (int): seed of the random ranks
+
+    Returns:
+        (int, float, float): the task index and the information imbalances from target to coords and vice versa
+
+    """
+    X = arrays["X"]
+    rng = np.random.default_rng(seed)
+
+    _, dist_indices_coords = compute_nn_distances(
+        X[:, coords], maxk, metric, period, n_jobs=1
+    )
+    if target_coords is None:
+        target_ranks = arrays["target_ranks"]
+    else:
+        _, target_ranks = compute_nn_distances(
+            X[:, target_coords], maxk, metric, target_period, n_jobs=1
+        )
+
+    imb_target_coords = _return_imbalance(target_ranks, dist_indices_coords, rng, k=k)
+    imb_coords_target = _return_imbalance(dist_indices_coords, target_ranks, rng, k=k)
+
+    return task, imb_target_coords, imb_coords_target
+
+
+def _return_imb_causality_shared(
+    arrays, task, n_points, future_ranks, weight, k, metric, period_present, seed
+):
+    """Compute the imbalance from a weighted present space of the shared arrays to a future space.
+
+    The present space is (weight * cause, effect), or (weight[0] * cause, weight[1] * conditioning, effect) when
+    the shared arrays include "conditioning", restricted to its first n_points rows.
+
+    Args:
+        arrays (dict): shared arrays, "cause", "effect" and optionally "conditioning"
+        task (int): index of the task, returned with the result
+        n_points (int): number of points of the present space
+        future_ranks (np.ndarray(int)): neighbour table of the future space
+        weight (float, np.ndarray(float)): scaling parameter of cause, or of cause and conditioning
+        k (int): order of nearest neighbour considered for the calculation of the imbalance
+        metric (str): metric used to compute the distances
+        period_present (np.ndarray(float)): periods of the present space, or None
+        seed (int): seed of the random ranks
+
+    Returns:
+        (int, float): the task index and the information imbalance from the present to the future space
+
+    """
+    cause = arrays["cause"][:n_points]
+    effect = arrays["effect"][:n_points]
+    rng = np.random.default_rng(seed)
+
+    if "conditioning" in arrays:
+        conditioning = arrays["conditioning"][:n_points]
+        space_present = np.column_stack(
+            (weight[0] * cause, weight[1] * conditioning, effect)
+        )
+    else:
+        space_present = np.column_stack((weight * cause, effect))
+
+    # only the first k neighbours of the present space enter the imbalance
+    _, ranks_present = compute_nn_distances(
+        space_present, k, metric, period_present, n_jobs=1
+    )
+
+    return task, _return_imbalance(ranks_present, future_ranks, rng, k=k)
+
+
+def _iterate_imb_with_coords(arrays, tasks, n_jobs=1):
+    """Batch engine evaluating many imbalance tasks on shared arrays, yielding the results as they finish.
+
+    See iterate_shared_tasks.
+
+    Args:
+        arrays (dict): name -> np.ndarray of the arrays read by the tasks ("X" and optionally "target_ranks")
+        tasks (iterable(tuple)): arguments of _return_imb_with_coords_shared, one tuple per task
+        n_jobs (int): number of worker processes
+
+    Yields:
+        (int, float, float): the task index and the information imbalances from target to coords and vice versa
+
+    """
+    yield from iterate_shared_tasks(
+        _return_imb_with_coords_shared, arrays, tasks, n_jobs
+    )
+
+
 def _return_period_present(
     period_cause,
     period_effect,
@@ -0,0 +1,66 @@
+# Copyright 2021-2023 The DADApy Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from joblib import Parallel, delayed
+
+
+def iterate_shared_tasks(function, arrays, tasks, n_jobs=1):
+    """Batch engine evaluating function on many tasks reading shared arrays, yielding the results as they finish.
+
+    Each task is evaluated as function(arrays, *task). With n_jobs > 1 the arrays are dumped once to memory-mapped
+    files in a temporary folder and the tasks run on the joblib (loky) process pool: a task only transfers its
+    arguments and the file names of the arrays, which each worker maps read-only (copy-on-write) without copying;
+    joblib maps in the same way the large arrays passed as task arguments, once for all the tasks sharing them.
+    The tasks are dispatched lazily, so that the task list can be an iterable of arbitrary length. With n_jobs=1
+    the tasks are run in the calling process, in order, on the arrays themselves.
+
+    Args:
+        function (callable): module level function taking the dict of arrays followed by the task arguments
+        arrays (dict): name -> np.ndarray of the arrays read by the tasks
+        tasks (iterable(tuple)): arguments of function, one tuple per task
+        n_jobs (int): number of worker processes
+
+    Yields:
+        the results of function, one per task
+
+    """
+    if n_jobs == 1:
+        for task in tasks:
+            yield function(arrays, *task)
+        return
+
+    folder = tempfile.mkdtemp(prefix="dadapy_shared_")
+    try:
+        shared = {}
+        for name, arr in arrays.items():
+            filename = os.path.join(folder, f"{name}.npy")
+            np.save(filename, np.ascontiguousarray(arr))
+            # copy-on-write mappings can be passed to the compiled kernels, which require writable buffers
+            shared[name] = np.load(filename, mmap_mode="c")
+
+        yield from Parallel(
+            n_jobs=n_jobs,
+            backend="loky",
+            return_as="generator_unordered",
+            pre_dispatch="4 * n_jobs",
+            mmap_mode="c",
+        )(delayed(function)(shared, *task) for task in tasks)
+    finally:
+        shared = None
+        shutil.rmtree(folder, ignore_errors=True)
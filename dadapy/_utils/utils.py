@@ -102,28 +102,62 @@ def compute_cross_nn_distances(
         dist_indices (np.ndarray(float)): N x maxk matrix, distances of the neighbours of each point
 
     """
+    nn_index = build_nn_index(X, metric, period, n_jobs)
 
+    return query_nn_index(nn_index, X_new, maxk, metric, period, n_jobs)
+
+
+def build_nn_index(X, metric="euclidean", period=None, n_jobs=None):
+    """Build a nearest neighbour search index on the points of X.
+
+    The index can be stored and queried many times with query_nn_index.
+
+    Args:
+        X (np.array(float)): dataset of points to be indexed
+        metric (str): metric used to compute the distances
+        period (float, np.ndarray(float)): sizes of PBC walls. Single value is interpreted as cubic box.
+
+    Returns:
+        nn_index (NearestNeighbors or cKDTree): the search index
+
+    """
     if period is None:
-        nbrs = NearestNeighbors(n_neighbors=maxk, metric=metric, n_jobs=n_jobs).fit(X)
+        return NearestNeighbors(metric=metric, n_jobs=n_jobs).fit(X)
+
+    if metric not in ["euclidean", "minkowski", "manhattan"]:
+        raise KeyError(
+            "periodic distance computation is supported only for euclidean and manhattan metrics"
+        )
+
+    return cKDTree(X, boxsize=period)
+
+
+def query_nn_index(nn_index, X_new, maxk, metric="euclidean", period=None, n_jobs=None):
+    """Compute distances, up to neighbour maxk, between points of X_new and the points indexed by nn_index.
+
+    Args:
+        nn_index (NearestNeighbors or cKDTree): index built with build_nn_index
+        X_new (np.array(float)): dataset from which distances are computed
+        maxk (int): number of neighbours to save
+        metric (str): metric used to compute the distances
+        period (float, np.ndarray(float)): sizes of PBC walls. Single value is interpreted as cubic box.
+
+    Returns:
+        distances (np.ndarray(int)): N x maxk matrix, indices of the neighbours of each point
+        dist_indices (np.ndarray(float)): N x maxk matrix, distances of the neighbours of each point
 
-        distances, dist_indices = nbrs.kneighbors(X_new)
+    """
+    if period is None:
+        distances, dist_indices = nn_index.kneighbors(X_new, n_neighbors=maxk)
 
         # in case of hamming distance, make them integer
         if metric == "hamming":
-            distances *= X.shape[1]
+            distances *= nn_index.n_features_in_
 
     else:
-        if metric == "euclidean" or metric == "minkowski":
-            p = 2
-        elif metric == "manhattan":
-            p = 1
-        else:
-            raise KeyError(
-                "periodic distance computation is supported only for euclidean and manhattan metrics"
-            )
+        p = 1 if metric == "manhattan" else 2
 
-        tree = cKDTree(X, boxsize=period)
-        distances, dist_indices = tree.query(X_new, k=maxk, p=p, workers=n_jobs)
+        distances, dist_indices = nn_index.query(X_new, k=maxk, p=p, workers=n_jobs)
 
     return distances, dist_indices
 
@@ -147,7 +181,19 @@ def compute_nn_distances(X, maxk, metric="euclidean", period=None, n_jobs=None):
         X, X, maxk + 1, metric=metric, period=period, n_jobs=n_jobs
     )
 
-    zero_dists = np.sum(distances[:, 1:] <= 1.01 * np.finfo(np.float32).eps)
+    check_zero_distances(distances[:, 1:])
+
+    return distances, dist_indices
+
+
+def check_zero_distances(nn_distances):
+    """Warn if some neighbours are at 0 distance, meaning the dataset probably has identical points.
+
+    Args:
+        nn_distances (np.ndarray(float)): distances of the neighbours of the points, excluding the points themselves
+
+    """
+    zero_dists = np.sum(nn_distances <= 1.01 * np.finfo(np.float32).eps)
     if zero_dists > 0:
         warnings.warn(
             "There are points with neighbours at 0 distance, meaning the dataset probably has identical points.\n"
@@ -157,8 +203,6 @@ def compute_nn_distances(X, maxk, metric="euclidean", period=None, n_jobs=None):
             "remove_identical_points())."
         )
 
-    return distances, dist_indices
-
 
 def cast_to64(myarray):
     if myarray.dtype == "float32":
@@ -166,6 +210,69 @@ def cast_to64(myarray):
     return myarray
 
 
+def solve_pcg(A, B, x0=None, tol=1e-8, maxiter=None):
+    """Solve the symmetric positive (semi-)definite system A X = B with a Jacobi-preconditioned conjugate gradient.
+
+    The columns of B are solved simultaneously, so that each iteration costs a single sparse-dense matrix product.
+    For a singular A the right-hand sides must lie in the range of A; the component of the solution in the null
+    space of A is then the one of the starting guess.
+
+    Args:
+        A (scipy.sparse.spmatrix): N x N symmetric positive (semi-)definite matrix
+        B (np.ndarray(float)): size N or N x k, right-hand side(s) of the system
+        x0 (np.ndarray(float)): same shape as B, starting guess (warm start). Defaults to zero.
+        tol (float): relative tolerance on the residual norm of each column
+        maxiter (int): maximum number of iterations. Defaults to N.
+
+    Returns:
+        X (np.ndarray(float)): same shape as B, solution of the system
+
+    """
+    A = A.tocsr()
+    N = A.shape[0]
+    B = np.asarray(B, dtype=np.float_)
+    squeeze = B.ndim == 1
+    B = B.reshape(N, -1)
+    if x0 is None:
+        X = np.zeros_like(B)
+    else:
+        X = np.array(x0, dtype=np.float_).reshape(N, -1)
+    if maxiter is None:
+        maxiter = N
+
+    diag = A.diagonal()
+    inv_diag = np.divide(1.0, diag, out=np.ones(N), where=diag > 0)[:, None]
+
+    R = B - A @ X
+    Z = inv_diag * R
+    P = Z.copy()
+    rz = np.einsum("ij, ij -> j", R, Z)
+    thr = tol * np.linalg.norm(B, axis=0)
+
+    for _ in range(maxiter):
+        active = np.linalg.norm(R, axis=0) > thr
+        if not active.any():
+            break
+        AP = A @ P
+        pAp = np.einsum("ij, ij -> j", P, AP)
+        step = np.divide(rz, pAp, out=np.zeros_like(rz), where=active & (pAp > 0))
+        X += step * P
+        R -= step * AP
+        Z = inv_diag * R
+        rz_new = np.einsum("ij, ij -> j", R, Z)
+        beta = np.divide(rz_new, rz, out=np.zeros_like(rz), where=active & (rz > 0))
+        P = Z + beta * P
+        rz = rz_new
+
+    # the residual is checked again after the loop, as it can drop below tol in the last iteration
+    if np.any(np.linalg.norm(R, axis=0) > thr):
+        warnings.warn(
+            "The conjugate gradient did not converge in {} iterations".format(maxiter)
+        )
+
+    return X[:, 0] if squeeze else X
+
+
 # --------------------------------------------------------------------------------------
 # Helper functions
 
@@ -18,6 +18,7 @@ The *base* module contains the *Base* class.
 
 This class contains essential methods and attributes needed for all other classes.
 """
+
 import multiprocessing
 import time
 import warnings
@@ -62,6 +63,8 @@ class Base:
         self.metric = "euclidean"  # remove from here
         self.period = period  # remove from here
         self.rng = np.random.default_rng(rng_seed)
+        # nearest neighbour search index on X, built when needed and reset whenever X, metric or period change
+        self._nn_index = None
 
         if self.X is not None:
             assert isinstance(
@@ -167,6 +170,7 @@ class Base:
             sec = time.time()
 
         self.metric = metric
+        self._nn_index = None
 
         if period is not None:
             if isinstance(period, np.ndarray) and period.shape == (self.dims,):
@@ -246,6 +250,7 @@ class Base:
             )
 
             self.X = x_unique
+            self._nn_index = None
             self.N = n_unique
             self.maxk = min(self.maxk, self.N - 1)
 
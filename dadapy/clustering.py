@@ -27,7 +27,7 @@ import numpy as np
 import scipy as sp
 
 from dadapy._cython import cython_clustering as cf
-from dadapy._cython import cython_clustering_v2 as cf2
+from dadapy._cython import cython_grads as cgr
 from dadapy.density_estimation import DensityEstimation
 
 cores = multiprocessing.cpu_count()
@@ -77,16 +77,22 @@ class Clustering(DensityEstimation):
         self.delta = None  # Minimum distance from an element with higher density
         self.ref = None  # Index of the nearest element with higher density
 
+        # reverse neighbour index, with the dist_indices and kstar it was computed from
+        self._rev_nind = None
+
     def compute_clustering_ADP(self, Z=1.65, halo=False, v2=False):
         """Compute clustering according to the algorithm DPA.
 
         The only free parameter is the merging factor Z, which controls how the different density peaks are merged
         together. The higher the Z, the more aggressive the merging, the smaller the number of clusters.
-        The calculation is optimized though cython
+        The calculation is optimized though cython and parallelised over n_jobs threads. Only the saddle points
+        between couples of putative clusters that share a border are stored, so the memory required grows with
+        the number of neighbouring clusters rather than with the square of the number of putative clusters.
 
         Args:
             Z(float): merging parameter
             halo (bool): compute (or not) the halo points
+            v2 (bool): deprecated, kept for backward compatibility: the same implementation is used in both cases
 
         Returns:
             cluster_assignment (np.ndarray(int)): assignment of points to specific clusters
@@ -109,8 +115,9 @@ class Clustering(DensityEstimation):
 
         if v2 is True:
             warnings.warn(
-                """using adp implementation v2: this requires less memory but can
-                be two times slower than the original implementation""",
+                """the v2 argument is deprecated: the default implementation of ADP already
+                stores only the saddle points between neighbouring clusters""",
+                DeprecationWarning,
                 stacklevel=2,
             )
 
@@ -125,32 +132,22 @@ class Clustering(DensityEstimation):
         # centers are point of max density  (max(g) ) within their optimal neighborhood (defined by kstar)
         seci = time.time()
 
-        if v2:
-            out = cf2._compute_clustering(
-                Z,
-                halo,
-                self.kstar,
-                self.dist_indices.astype(int),
-                self.maxk,
-                self.verb,
-                self.log_den_err,
-                log_den_c,
-                g,
-                self.N,
-            )
-        else:
-            out = cf._compute_clustering(
-                Z,
-                halo,
-                self.kstar,
-                self.dist_indices.astype(int),
-                self.maxk,
-                self.verb,
-                self.log_den_err,
-                log_den_c,
-                g,
-                self.N,
-            )
+        dist_indices = self.dist_indices.astype(int)
+        rev_nind_list, rev_nind_iptr = self._return_reverse_neigh_ind()
+
+        out = cf._compute_clustering(
+            Z,
+            halo,
+            self.kstar,
+            dist_indices,
+            self.verb,
+            self.log_den_err,
+            log_den_c,
+            g,
+            rev_nind_list,
+            rev_nind_iptr,
+            self.n_jobs,
+        )
 
         secf = time.time()
 
@@ -168,37 +165,241 @@ class Clustering(DensityEstimation):
 
         return self.cluster_assignment
 
+    def compute_clustering_ADP_path(self, Zs, halo=False):
+        """Compute ADP clustering for a list of merging parameters Z, sharing the Z-independent steps.
+
+        The putative density peaks, the preliminary assignment of the points and the saddle points between
+        neighbouring putative clusters do not depend on Z: they are computed only once. For each Z,
+        only the multimodality test is then repeated on the graph of the neighbouring clusters,
+        merging at each step the couple of peaks with the highest saddle among those that are not
+        statistically significant. The saddle points are found with the density shift of the largest Z, and for
+        each Z only those which compute_clustering_ADP would also find are kept, so that the result for each Z is
+        identical to the one of compute_clustering_ADP.
+
+        Args:
+            Zs (list(float)): merging parameters
+            halo (bool): compute (or not) the halo points
+
+        Returns:
+            N_clusters (np.ndarray(int)): number of clusters found for each Z
+            cluster_assignments (np.ndarray(int)): array of shape (len(Zs), N) with the assignment of points to
+                clusters for each Z
+        """
+        if self.log_den is None:
+            self.compute_density_PAk()
+
+        assert not np.isnan(np.sum(self.log_den)), "log density contains nan values"
+        assert not np.isnan(
+            np.sum(self.log_den_err)
+        ), "log error density contains nan values"
+
+        Zs = np.atleast_1d(np.asarray(Zs, dtype=float))
+
+        # the shift making all the log densities positive is taken for the largest Z: apart from the admission of
+        # the border points (see below) the clustering depends only on density differences
+        log_den_min = np.min(self.log_den - np.max(Zs) * self.log_den_err)
+        log_den_c = self.log_den - log_den_min + 1
+        g = log_den_c - self.log_den_err
+
+        sec = time.time()
+
+        dist_indices = self.dist_indices.astype(int)
+        rev_nind_list, rev_nind_iptr = self._return_reverse_neigh_ind()
+
+        (
+            centers,
+            cluster_init,
+            edges,
+            edge_point,
+            edge_rho,
+            edge_err,
+        ) = cf._compute_clustering_topology(
+            self.kstar,
+            dist_indices,
+            self.verb,
+            self.log_den_err,
+            log_den_c,
+            g,
+            rev_nind_list,
+            rev_nind_iptr,
+            self.n_jobs,
+        )
+        Nclus = centers.shape[0]
+
+        if self.verb:
+            print(
+                "{0:0.2f} seconds computing the saddle points between {1} putative clusters".format(
+                    time.time() - sec, Nclus
+                )
+            )
+
+        N_clusters = np.zeros(len(Zs), dtype=int)
+        cluster_assignments = np.zeros((len(Zs), self.N), dtype=int)
+
+        for iz, Z in enumerate(Zs):
+            # only the points with g > 0 for the shift of this Z can be border points, as in compute_clustering_ADP;
+            # the shift is the largest for the largest Z, and the saddle point of each couple of clusters is its
+            # border point of highest g, so the test at this Z only removes whole couples
+            shift_z = np.min(self.log_den - Z * self.log_den_err) - log_den_min
+            is_edge = g[edge_point] - shift_z > 0
+            clsurv, owner, _, edges_m, _, edge_rho_m, _ = cf._merge_clusters(
+                Z,
+                log_den_c[centers],
+                self.log_den_err[centers],
+                edges[is_edge],
+                edge_point[is_edge],
+                edge_rho[is_edge],
+                edge_err[is_edge],
+            )
+            surviving_clusters = np.nonzero(clsurv)[0]
+
+            labels = -np.ones(Nclus, dtype=int)
+            labels[surviving_clusters] = np.arange(surviving_clusters.shape[0])
+            assignment = labels[owner[cluster_init]]
+
+            if halo:
+                # highest saddle point of each cluster
+                log_den_halo = -np.ones(surviving_clusters.shape[0])
+                np.maximum.at(log_den_halo, labels[edges_m[:, 0]], edge_rho_m)
+                np.maximum.at(log_den_halo, labels[edges_m[:, 1]], edge_rho_m)
+                assignment[log_den_c < log_den_halo[assignment]] = -1
+
+            N_clusters[iz] = surviving_clusters.shape[0]
+            cluster_assignments[iz] = assignment
+
+        return N_clusters, cluster_assignments
+
+    def predict_clusters(self, X_new, halo=False, Dthr=23.92812698, chunk_size=10000):
+        """Assign new points to the clusters found by ADP, without recomputing the clustering.
+
+        The PAk log density of each new point is interpolated from the primary dataset, and the point is given the
+        cluster of its nearest neighbour in the primary dataset with a higher density (the same rule used to assign
+        points to the density peaks in ADP). A point denser than all its maxk neighbours is assigned to the cluster
+        of its nearest neighbour. The nearest neighbour index of the primary dataset is built once and reused across
+        calls, and the new points are processed in chunks of chunk_size.
+
+        Args:
+            X_new (np.ndarray(float)): points to be assigned, of shape (N_new, dimension of embedding space)
+            halo (bool): flag as halo points (assignment -1) the new points with a log density lower than the highest
+                saddle point density of their cluster
+            Dthr (float): Likelihood ratio parameter used to compute optimal k
+            chunk_size (int): number of new points processed at a time
+
+        Returns:
+            cluster_assignment (np.ndarray(int)): assignment of the new points to the clusters
+        """
+        assert self.X is not None
+        assert (
+            self.cluster_indices is not None and self.log_den_bord is not None
+        ), "ADP clustering must be computed before predicting the clusters of new points"
+
+        if self.intrinsic_dim is None:
+            _ = self.compute_id_2NN()
+
+        # assignment of the primary dataset without halo points
+        core_assignment = np.empty(self.N, dtype=int)
+        for j, indices in enumerate(self.cluster_indices):
+            core_assignment[np.asarray(indices, dtype=int)] = j
+
+        g = self.log_den - self.log_den_err
+
+        # highest saddle point density of each cluster
+        log_den_halo = np.max(self.log_den_bord, axis=1)
+
+        X_new = np.atleast_2d(X_new)
+        N_new = X_new.shape[0]
+        cluster_assignment = np.empty(N_new, dtype=int)
+
+        for start in range(0, N_new, chunk_size):
+            stop = min(start + chunk_size, N_new)
+
+            cross_distances, cross_dist_indices = self._return_cross_nn_distances(
+                X_new[start:stop]
+            )
+            log_den_new, log_den_err_new = self._interpolate_density_PAk(
+                cross_distances, cross_dist_indices, Dthr
+            )
+
+            # first (i.e. nearest) neighbour with a higher density
+            is_denser = g[cross_dist_indices] > (log_den_new - log_den_err_new)[:, None]
+            first_denser = np.argmax(is_denser, axis=1)
+            first_denser[~is_denser.any(axis=1)] = 0
+
+            ref = cross_dist_indices[np.arange(stop - start), first_denser]
+            labels = core_assignment[ref]
+
+            if halo:
+                labels[log_den_new < log_den_halo[labels]] = -1
+
+            cluster_assignment[start:stop] = labels
+
+        return cluster_assignment
+
     def compute_DecGraph(self):
-        """Compute the decision graph."""
+        """Compute the decision graph.
+
+        For each point, the nearest point of higher density (ref) and its distance (delta) are searched first
+        among the stored neighbours, in parallel. The few points without a denser neighbour are then resolved
+        exactly with k-d tree queries of increasing size and, if still needed, with a compiled scan over the
+        points preceding them in decreasing density order.
+        """
         assert self.log_den is not None, "Compute density before"
         assert self.X is not None
-        self.delta = np.zeros(self.N)
-        self.ref = np.zeros(self.N, dtype="int")
-        tt = np.arange(self.N)
-        imax = []
-        ncalls = 0
-        for i in range(self.N):
-            ll = tt[((self.log_den > self.log_den[i]) & (tt != i))]
-            if ll.shape[0] > 0:
-                a1, a2, a3 = np.intersect1d(
-                    self.dist_indices[i, :], ll, return_indices=True, assume_unique=True
-                )
-                if a1.shape[0] > 0:
-                    aa = np.min(a2)
-                    self.delta[i] = self.distances[i, aa]
-                    self.ref[i] = self.dist_indices[i, aa]
-                else:
-                    ncalls = ncalls + 1
-                    dd = self.X[((self.log_den > self.log_den[i]) & (tt != i))]
-                    ds = np.transpose(
-                        sp.spatial.distance.cdist([np.transpose(self.X[i, :])], dd)
-                    )
-                    j = np.argmin(ds)
-                    self.ref[i] = ll[j]
-                    self.delta[i] = ds[j]
-            else:
-                self.delta[i] = -100.0
-                imax.append(i)
+
+        self.ref, self.delta = cf._return_nearest_higher_density_neighbour(
+            self.dist_indices.astype(int),
+            self.distances.astype(np.float64),
+            self.log_den.astype(np.float64),
+            self.n_jobs,
+        )
+
+        far = np.nonzero(self.ref == -1)[0]
+
+        # number of points with strictly higher density than each of the remaining points
+        order = np.argsort(-self.log_den, kind="stable")
+        n_denser = np.searchsorted(
+            -self.log_den[order], -self.log_den[far], side="left"
+        )
+        imax = far[n_denser == 0]
+        far = far[n_denser > 0]
+        ncalls = far.shape[0]
+
+        # search among increasingly large neighbourhoods, in blocks of bounded memory
+        if far.shape[0] > 0 and self.X.shape[1] <= 20:
+            tree = sp.spatial.cKDTree(self.X)
+            k = min(4 * self.dist_indices.shape[1], self.N)
+            while far.shape[0] > 0 and k < min(4096, self.N):
+                found = np.zeros(far.shape[0], dtype=bool)
+                block = max(1, 2**22 // k)
+                for start in range(0, far.shape[0], block):
+                    queries = far[start : start + block]
+                    dd, ii = tree.query(self.X[queries], k=k, workers=self.n_jobs)
+                    denser = self.log_den[ii] > self.log_den[queries][:, None]
+                    has_denser = np.any(denser, axis=1)
+                    first = np.argmax(denser, axis=1)
+                    rows = np.nonzero(has_denser)[0]
+                    self.ref[queries[rows]] = ii[rows, first[rows]]
+                    self.delta[queries[rows]] = dd[rows, first[rows]]
+                    found[start : start + block] = has_denser
+                far = far[~found]
+                k *= 4
+
+        # exact scan over all the denser points for the points still unresolved
+        if far.shape[0] > 0:
+            n_denser = np.searchsorted(
+                -self.log_den[order], -self.log_den[far], side="left"
+            )
+            ref, delta = cf._return_nearest_higher_density_brute(
+                np.ascontiguousarray(self.X, dtype=np.float64),
+                far,
+                order,
+                n_denser,
+                self.n_jobs,
+            )
+            self.ref[far] = ref
+            self.delta[far] = delta
+
+        self.ref[imax] = 0
         self.delta[imax] = 1.05 * np.max(self.delta)
         print("Number of points for which self.delta needed call to cdist=", ncalls)
 
@@ -219,35 +420,52 @@ class Clustering(DensityEstimation):
         """
         assert self.delta is not None
         ordered = np.argsort(-self.log_den)
-        self.cluster_assignment = np.zeros(self.N, dtype="int")
+        rank = np.empty(self.N, dtype=int)
+        rank[ordered] = np.arange(self.N)
         tt = np.arange(self.N)
-        center_label = np.zeros(self.N, dtype="int")
-        ncluster = -1
-        for i in range(self.N):
-            j = ordered[i]
-            if (self.log_den[j] > dens_cut) & (self.delta[j] > delta_cut):
-                ncluster = ncluster + 1
-                self.cluster_assignment[j] = ncluster
-                center_label[j] = ncluster
-            else:
-                self.cluster_assignment[j] = self.cluster_assignment[self.ref[j]]
-                center_label[j] = -1
+
+        # cluster centers, labelled in order of decreasing density
+        is_center = (self.log_den > dens_cut) & (self.delta > delta_cut)
+        centers = ordered[is_center[ordered]]
+        center_label = -np.ones(self.N, dtype=int)
+        center_label[centers] = np.arange(centers.shape[0])
+
+        # visiting the points by decreasing density, each point takes the cluster of its nearest point of
+        # higher density (ref): the cluster is the one of the center at the root of the chain of refs.
+        # A point whose ref comes after it in this order takes the cluster 0
+        parent = np.where(is_center, tt, self.ref)
+        is_first = ~is_center & (rank[self.ref] >= rank)
+        parent[is_first] = tt[is_first]
+        root_label = np.copy(center_label)
+        root_label[is_first] = 0
+
+        root = cf._return_roots(parent.astype(int), self.n_jobs)
+        self.cluster_assignment = root_label[root]
+
         self.centers = tt[(center_label != -1)]
+        self.cluster_centers = centers
+        self.N_clusters = centers.shape[0]
+
         if halo:
-            bord = np.zeros(self.N, dtype="int")
-            halo = np.copy(self.cluster_assignment)
+            bord = cf._return_DP_border_points(
+                self.dist_indices.astype(int),
+                self.distances,
+                self.dc,
+                self.cluster_assignment,
+                self.n_jobs,
+            )
 
-            for i in range(self.N):
-                for j in self.dist_indices[i, :][(self.distances[i, :] <= self.dc[i])]:
-                    if self.cluster_assignment[i] != self.cluster_assignment[j]:
-                        bord[i] = 1
-            halo_cutoff = np.zeros(ncluster + 1)
+            # highest density of the border points of each cluster
+            halo_cutoff = np.zeros(np.max(self.cluster_assignment) + 1)
             halo_cutoff[:] = np.min(self.log_den) - 1
-            for j in range(ncluster + 1):
-                td = self.log_den[((bord == 1) & (self.cluster_assignment == j))]
-                if td.size != 0:
-                    halo_cutoff[j] = np.max(td)
-            halo[tt[(self.log_den < halo_cutoff[self.cluster_assignment])]] = -1
+            np.maximum.at(
+                halo_cutoff,
+                self.cluster_assignment[bord == 1],
+                self.log_den[bord == 1],
+            )
+
+            halo = np.copy(self.cluster_assignment)
+            halo[self.log_den < halo_cutoff[self.cluster_assignment]] = -1
             self.cluster_assignment = halo
 
         return self.cluster_assignment
@@ -406,32 +624,51 @@ class Clustering(DensityEstimation):
 
     # ------------ helper methods for compute_clustering_ADP_pure_python ------------ #
 
+    def _return_reverse_neigh_ind(self):
+        """Return the reverse neighbourhoods, i.e. the points having each point among their kstar neighbours.
+
+        The index, in CSR form, is computed once and shared by the clustering methods until dist_indices or
+        kstar are computed again.
+        """
+        if (
+            self._rev_nind is None
+            or self._rev_nind[0] is not self.dist_indices
+            or self._rev_nind[1] is not self.kstar
+        ):
+            rev_nind_list, rev_nind_iptr = cgr.return_reverse_neigh_ind(
+                self.dist_indices.astype(int), self.kstar
+            )
+            self._rev_nind = (
+                self.dist_indices,
+                self.kstar,
+                rev_nind_list,
+                rev_nind_iptr,
+            )
+
+        return self._rev_nind[2], self._rev_nind[3]
+
     def _find_density_modes(self, g):
         """Find the modes of the density."""
-        centers = []
-        for i in range(self.N):
-            t = 0
-            for j in range(1, self.kstar[i] + 1):
-                if g[i] < g[self.dist_indices[i, j]]:
-                    t = 1
-                    break
-
-            # "i" is a center if it has no point at a higher density
-            if t == 0:
-                centers.append(i)
+        rev_nind_list, rev_nind_iptr = self._return_reverse_neigh_ind()
+
+        # "i" is a center if it has no point at a higher density among its kstar neighbours
+        in_kstar = np.arange(1, self.dist_indices.shape[1]) <= self.kstar[:, None]
+        has_denser = (g[:, None] < g[self.dist_indices[:, 1:]]) & in_kstar
+        centers = np.flatnonzero(~np.any(has_denser, axis=1)).tolist()
 
         centers_iter = centers.copy()
 
         removed_centers = []
         for i_center in centers_iter:
-            l, m = np.where(self.dist_indices == i_center)
+            # neighborhoods where i_center is within kstar
+            rev_neighbours = rev_nind_list[
+                rev_nind_iptr[i_center] : rev_nind_iptr[i_center + 1]
+            ]
+            if rev_neighbours.shape[0] == 0:
+                continue
 
-            # keep only neighborhoods where i_center is within kstar
-            mask = m <= self.kstar[l]
-            l, m = l[mask], m[mask]
             # index of the point of maximum density in these neighborhoods
-            max_rho = np.argmax(g[l])
-            max_rho = l[max_rho]
+            max_rho = rev_neighbours[np.argmax(g[rev_neighbours])]
 
             # if the density of 'max_rho' is higher than that of i_center,
             # remove i_center and store [i_center,  max_rho] (see later)
@@ -463,8 +700,8 @@ class Clustering(DensityEstimation):
         cluster_init = [-1] * self.N
 
         # assign centers to their own cluster
-        for i in centers:
-            cluster_init[i] = centers.index(i)
+        for i, center in enumerate(centers):
+            cluster_init[center] = i
 
         # Get the rank of the elements in the g vector
         # sorted in decreasing order.
@@ -510,13 +747,10 @@ class Clustering(DensityEstimation):
                 cluster_init[ele] = cluster_init[max_center]
 
         # useful list of points in the clusters
-        cl_struct = []
-        for i in range(len(centers)):
-            x1 = []
-            for j in range(self.N):
-                if cluster_init[j] == i:
-                    x1.append(j)
-            cl_struct.append(x1)
+        cluster_init_arr = np.array(cluster_init)
+        cl_struct = [
+            np.flatnonzero(cluster_init_arr == i).tolist() for i in range(len(centers))
+        ]
 
         return cluster_init, cl_struct
 
@@ -950,9 +1184,9 @@ class Clustering(DensityEstimation):
                             current_saddle = saddle_density[i, 0]
 
             if check == 1:
-                saddle_indices[
-                    to_remove, -1
-                ] = 0  # the couple center1, center2 is removed
+                saddle_indices[to_remove, -1] = (
+                    0  # the couple center1, center2 is removed
+                )
                 margin1 = max_a1 / max_sum_err1
                 margin2 = max_a2 / max_sum_err2
 
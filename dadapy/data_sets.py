@@ -25,7 +25,7 @@ import os
 
 import numpy as np
 
-from dadapy._utils.metric_comparisons import _return_imbalance
+from dadapy._utils.metric_comparisons import _return_jackknife_imbalances
 from dadapy._utils.utils import compute_nn_distances
 from dadapy.data import Data
 
@@ -51,16 +51,28 @@ class DataSets:
 
     @staticmethod
     def return_inf_imb_jackknife_d1_to_d2(
-        d1: Data, d2: Data, file_name="jackknife.txt", n=None, k=1
+        d1: Data,
+        d2: Data,
+        file_name="jackknife.txt",
+        n=None,
+        k=1,
+        n_jobs=cores,
+        checkpoint_every=1000,
     ):
         """Return the mean and the standard deviation of the information imbalalce using the Jackknife method.
 
+        The leave-one-out imbalances are obtained from a single neighbour table per dataset: removing a point drops
+        it from the neighbour lists of the others, which shifts the ranks that follow it by one.
+
         Args:
             d1 (Data): The first dataset
             d2 (Data): The second dataset
             file_name (str, optional): The file where the imbalances are saved. Defaults to "jackknife.txt". Set to "None" to avoid saving.
             n (_type_, optional): Number of Jackknife repetitions. Defaults to the number of dataset points.
             k (int, optional): The number of neighbours for the imbalance computations. Defaults to 1.
+            n_jobs (int, optional): Number of threads. Defaults to the number of cores.
+            checkpoint_every (int, optional): Number of imbalances computed between two writes of the file. Defaults
+                to 1000.
 
         Returns:
             mean and standard deviation of the imbalance estimates from d1 to d2.
@@ -71,7 +83,8 @@ class DataSets:
 
         if file_name is not None:
             print("Saving imbalances in " + file_name)
-            file_object = open(file_name, "a")
+            # the file is rewritten from scratch, and completed at each checkpoint
+            open(file_name, "w").close()
         else:
             print("Not saving imbalances")
 
@@ -79,23 +92,34 @@ class DataSets:
         rng.shuffle(random_indices)
 
         removed_indices = random_indices[:n]
+
+        # the neighbour lists of the reduced datasets have d1.maxk - 1 neighbours
+        dist_indices = []
+        for d in [d1, d2]:
+            if d.dist_indices is not None and d.dist_indices.shape[1] == d1.maxk + 1:
+                dist_indices.append(d.dist_indices)
+            else:
+                _, d_dist_indices = compute_nn_distances(
+                    d.X, d1.maxk, d.metric, d.period, n_jobs=n_jobs
+                )
+                dist_indices.append(d_dist_indices)
+
         imbalances_X1toX2 = []
-        for i in removed_indices:
-            print(i)
-            X1_i = np.delete(d1.X, [i], axis=0)
-            X2_i = np.delete(d2.X, [i], axis=0)
-            _, d1_dist_indices = compute_nn_distances(
-                X1_i, d1.maxk - 1, d1.metric, d1.period
-            )  # remove 1 maxk for jackknife
-            _, d2_dist_indices = compute_nn_distances(
-                X2_i, d1.maxk - 1, d1.metric, d1.period
+        for start in range(0, n, checkpoint_every):
+            imbalances_X1toX2.extend(
+                _return_jackknife_imbalances(
+                    dist_indices[0],
+                    dist_indices[1],
+                    removed_indices[start : start + checkpoint_every],
+                    rng,
+                    k=k,
+                    n_jobs=n_jobs,
+                )
             )
 
-            imb_X1toX2 = _return_imbalance(d1_dist_indices, d2_dist_indices, rng, k=k)
-            imbalances_X1toX2.append(imb_X1toX2)
-
             if file_name is not None:
-                np.savetxt(file_name, imbalances_X1toX2)
+                with open(file_name, "a") as file_object:
+                    np.savetxt(file_object, imbalances_X1toX2[start:])
 
         mean, std = np.mean(imbalances_X1toX2), np.std(imbalances_X1toX2)
 
@@ -29,9 +29,11 @@ import warnings
 import numpy as np
 from scipy import linalg as slin
 from scipy import sparse
+from scipy.sparse.csgraph import connected_components
 
 from dadapy._cython import cython_grads as cgr
 from dadapy._utils.density_estimation import return_not_normalised_density_kstarNN
+from dadapy._utils.utils import solve_pcg
 from dadapy.density_estimation import DensityEstimation
 from dadapy.neigh_graph import NeighGraph
 
@@ -57,9 +59,10 @@ class DensityAdvanced(DensityEstimation, NeighGraph):
             of the neighbourhood graph, it contains an estimate of the Pearson correlation coefficient between the
             directed deltaFij computed with the gradients in i and in j, namely between dot(g_i,(x_j-x_i)) and
             dot(g_j,(x_j-x_i)).
-        pearson_mat (np.ndarray(float), optional): size N x N. Entry (i,j) contains the Pearson correlation coefficient
-            between the directed deltaFij computed with the gradients in i and in j (see pearson_array) if (i,j) is an
-            edge of the directed neighbourhood graph; it contains a 0 otherwise.
+        pearson_mat (scipy.sparse.csr_matrix(float), optional): size N x N, symmetric. Entry (i,j) contains the
+            Pearson correlation coefficient between the directed deltaFij computed with the gradients in i and in j
+            (see pearson_array) if (i,j) is an edge of the directed neighbourhood graph, the one of the edge (j,i) if
+            only the latter is an edge, and 1 if i=j; it is not stored otherwise.
         Fij_array (list(np.array(float)), optional): size nspar. Stores for each couple in nind_list the estimates of
             deltaF_ij computed from point i as semisum of the gradients in i and minus the gradient in j
         Fij_var_array (np.array(float), optional): size nspar. Stores for each couple in nind_list the estimates of the
@@ -167,14 +170,11 @@ class DensityAdvanced(DensityEstimation, NeighGraph):
                 "ijk, i -> ijk", self.grads_covmat, self.kstar / (self.kstar - 1)
             )
             smallnumber = 1.0e-10
-            self.grads_covmat += smallnumber * np.tile(
-                np.eye(self.dims), (self.N, 1, 1)
-            )
+            diag_ind = np.arange(self.dims)
+            self.grads_covmat[:, diag_ind, diag_ind] += smallnumber
 
             # get diagonal elements of the covariance matrix
-            self.grads_var = np.zeros((self.N, self.dims))
-            for i in range(self.N):
-                self.grads_var[i, :] = np.diag(self.grads_covmat[i, :, :])
+            self.grads_var = self.grads_covmat[:, diag_ind, diag_ind]
 
         sec2 = time.time()
         if self.verb:
@@ -224,15 +224,30 @@ class DensityAdvanced(DensityEstimation, NeighGraph):
 
         # save in matrix form
         if comp_p_mat is True:
-            p_mat = sparse.lil_matrix((self.N, self.N), dtype=np.float_)
-            for nspar, indices in enumerate(self.nind_list):
-                i = indices[0]
-                j = indices[1]
-                p_mat[i, j] = self.pearson_array[nspar]
-                if p_mat[j, i] == 0:
-                    p_mat[j, i] = p_mat[i, j]
-            self.pearson_mat = p_mat.todense()
-            np.fill_diagonal(self.pearson_mat, 1.0)
+            self.pearson_mat = (
+                self._return_sparse_graph(self.pearson_array, symmetrize=True)
+                + sparse.identity(self.N, format="csr")
+            ).tocsr()
+
+    def return_sparse_pearson_graph(
+        self, symmetrize=False, similarity_method="jaccard"
+    ):
+        """Return the Pearson coefficients on the (directed) neighbourhood graph as a N x N scipy sparse csr_matrix.
+
+        If the attribute pearson_array is not assigned, invokes method compute_pearson.
+
+        Args:
+            symmetrize (bool): if True, also the edge (j,i) is stored for each edge (i,j) of the DNG
+            similarity_method (str): see docs for compute_pearson
+
+        Returns:
+            pgraph (scipy.sparse.csr_matrix): N x N matrix with entry (i,j) equal to the Pearson coefficient of the
+                edge (i,j) of the graph (see pearson_array)
+        """
+        if self.pearson_array is None:
+            self.compute_pearson(similarity_method=similarity_method)
+
+        return self._return_sparse_graph(self.pearson_array, symmetrize)
 
     def compute_deltaFs(self, similarity_method="jaccard", comp_p_mat=False):
         """Compute deviations deltaFij to standard kNN log-densities at point j as seen from point i using
@@ -251,8 +266,14 @@ class DensityAdvanced(DensityEstimation, NeighGraph):
 
         """
 
-        if self.grads_covmat is None:
-            self.compute_grads(comp_covmat=True)
+        if self.grads is None:
+            self.compute_grads()
+
+        # check or compute the Pearson coefficients
+        if self.pearson_array is None or (comp_p_mat and self.pearson_mat is None):
+            self.compute_pearson(
+                similarity_method=similarity_method, comp_p_mat=comp_p_mat
+            )
 
         if self.verb:
             print(
@@ -260,42 +281,23 @@ class DensityAdvanced(DensityEstimation, NeighGraph):
             )
         sec = time.time()
 
-        Fij_array = np.zeros(self.nspar)
-        self.Fij_var_array = np.zeros(self.nspar)
-
-        g1 = self.grads[self.nind_list[:, 0]]
-        g2 = self.grads[self.nind_list[:, 1]]
-        g_var1 = self.grads_covmat[self.nind_list[:, 0]]
-        g_var2 = self.grads_covmat[self.nind_list[:, 1]]
-
-        # check or compute common_neighs
-        if self.pearson_mat is None:
-            self.compute_pearson(
-                similarity_method=similarity_method, comp_p_mat=comp_p_mat
-            )
-
-        Fij_array = 0.5 * np.einsum("ij, ij -> i", g1 + g2, self.neigh_vector_diffs)
-        vari = np.einsum(
-            "ij, ij -> i",
-            self.neigh_vector_diffs,
-            np.einsum("ijk, ik -> ij", g_var1, self.neigh_vector_diffs),
-        )
-        varj = np.einsum(
-            "ij, ij -> i",
+        # the variances along each edge are computed from the neighbour vectors, without building the
+        # covariance matrices of the gradients
+        self.Fij_array, self.Fij_var_array = cgr.return_deltaFs_from_nnvecdiffs(
             self.neigh_vector_diffs,
-            np.einsum("ijk, ik -> ij", g_var2, self.neigh_vector_diffs),
-        )
-        self.Fij_var_array = 0.25 * (
-            vari + varj + 2 * self.pearson_array * np.sqrt(vari * varj)
+            self.nind_list,
+            self.nind_iptr,
+            self.kstar,
+            self.intrinsic_dim,
+            self.grads,
+            self.pearson_array,
+            self.n_jobs,
         )
 
         sec2 = time.time()
         if self.verb:
             print("{0:0.2f} seconds computing gradient corrections".format(sec2 - sec))
 
-        self.Fij_array = Fij_array
-        self.Fij_var_array = self.Fij_var_array
-
     # ----------------------------------------------------------------------------------------------
 
     def compute_deltaFs_inv_cross_covariance(self, similarity_method="jaccard"):
@@ -314,16 +316,23 @@ class DensityAdvanced(DensityEstimation, NeighGraph):
         if self.Fij_var_array is None:
             self.compute_deltaFs()
 
+        if self.grads_covmat is None:
+            self.compute_grads(comp_covmat=True)
+
         if self.verb:
             print("Estimation of the deltaFs cross-covariance started")
         sec = time.time()
         # compute a diagonal approximation of the inverse of the cross-covariance matrix
         self.inv_deltaFs_cov = cgr.return_deltaFs_inv_cross_covariance(
-            self.grads_var,
+            self.grads_covmat,
             self.neigh_vector_diffs,
             self.nind_list,
-            self.pearson_mat,
+            self.nind_iptr,
+            self.pearson_mat.data,
+            self.pearson_mat.indices.astype(int),
+            self.pearson_mat.indptr.astype(int),
             self.Fij_var_array,
+            self.n_jobs,
         )
 
         sec2 = time.time()
@@ -344,6 +353,8 @@ class DensityAdvanced(DensityEstimation, NeighGraph):
         alpha=1,
         log_den=None,
         log_den_err=None,
+        solver=None,
+        n_probes=60,
     ):
         """Compute the log-density for each point using BMTI.
 
@@ -362,14 +373,33 @@ class DensityAdvanced(DensityEstimation, NeighGraph):
                         finding the approximate diagonal inverse which multiplied by C gives the least-squares closest
                         matrix to the identity in the Frobenius norm
             comp_log_den_err (bool): if True, compute the error on the BMTI estimates. Can be highly time consuming
+                with the "dense" and "sparse" solvers, which invert the full NxN matrix of the system.
             mem_efficient (bool): if True, use a sparse matrice to solve BMTI linear system (slower). If False, use a
                 dense NxN matrix; this is faster, but can require a great amount of memory if the system is large.
+                Only used if solver is None.
             alpha (float): can take values from 0.0 to 1.0. Indicates the portion of BMTI in the sum of the likelihoods
                 alpha*L_BMTI + (1-alpha)*L_kstarNN. Setting alpha=1.0 corresponds to not reguarising BMTI.
             log_den (np.ndarray(float)): size N. The array of the log-densities of the regulariser.
             log_den_err (np.ndarray(float)): size N. The array of the log-density errors of the regulariser.
+            solver (str): method used to solve the BMTI linear system. Currently implemented methods:
+                    "dense": direct solution with a dense NxN matrix
+                    "sparse": direct sparse solution
+                    "cg": Jacobi-preconditioned conjugate gradient on the sparse system, warm-started from the
+                        regulariser log-density. Memory and time scale with the number of edges of the neighbourhood
+                        graph, which makes it the method of choice for large datasets. The errors are estimated
+                        with a stochastic (Hutchinson) estimator of the diagonal of the inverse matrix.
+                If None (default), "sparse" is used if mem_efficient is True, "dense" otherwise.
+            n_probes (int): number of random probe vectors used to estimate the errors with the "cg" solver. The
+                relative error on the estimated variances decreases with n_probes, while the memory needed grows as
+                N x n_probes.
 
         """
+        if solver is None:
+            solver = "sparse" if mem_efficient else "dense"
+        if solver not in ["dense", "sparse", "cg"]:
+            raise ValueError(
+                "The solver parameter is not valid, choose 'dense', 'sparse' or 'cg'"
+            )
 
         # compute changes in free energy
         if self.Fij_array is None:
@@ -393,11 +423,11 @@ class DensityAdvanced(DensityEstimation, NeighGraph):
             self.log_den = log_den
             self.log_den_err = log_den_err
 
-        # add a warnings.warning if self.N > 10000 and mem_efficient is False
-        if self.N > 15000 and mem_efficient is False:
+        # add a warnings.warning if self.N > 10000 and the dense solver is used
+        if self.N > 15000 and solver == "dense":
             warnings.warn(
                 "The number of points is large and the memory efficient option is not selected. \
-                If you run into memory issues, consider using the slower memory efficient option."
+                If you run into memory issues, consider using the 'cg' solver."
             )
 
         if self.verb:
@@ -413,7 +443,9 @@ class DensityAdvanced(DensityEstimation, NeighGraph):
             print("{0:0.2f} seconds to fill sparse matrix".format(sec2 - sec))
 
         # solve linear system
-        log_den = self._solve_BMTI_reg_linar_system(A, deltaFcum, mem_efficient)
+        log_den = self._solve_BMTI_reg_linar_system(
+            A, deltaFcum, solver, x0=self.log_den
+        )
         self.log_den = log_den
 
         if self.verb:
@@ -421,7 +453,19 @@ class DensityAdvanced(DensityEstimation, NeighGraph):
         sec2 = time.time()
 
         # compute error
-        if comp_log_den_err is True:
+        if comp_log_den_err is True and solver == "cg":
+            self.log_den_err = np.sqrt(
+                self._estimate_BMTI_inverse_diagonal(A, alpha, n_probes)
+            )
+
+            if self.verb:
+                print(
+                    "{0:0.2f} seconds estimating the diagonal of the inverse of A".format(
+                        time.time() - sec2
+                    )
+                )
+
+        elif comp_log_den_err is True:
             A = A.todense()
             B = slin.pinvh(A)
             self.log_den_err = np.sqrt(np.diag(B))
@@ -496,10 +540,61 @@ class DensityAdvanced(DensityEstimation, NeighGraph):
 
         return A, deltaFcum
 
-    def _solve_BMTI_reg_linar_system(self, A, deltaFcum, mem_efficient):
-        if mem_efficient is False:
+    def _solve_BMTI_reg_linar_system(self, A, deltaFcum, solver, x0=None):
+        if solver == "dense":
             log_den = np.linalg.solve(A.todense(), deltaFcum)
-        else:
+        elif solver == "sparse":
             log_den = sparse.linalg.spsolve(A.tocsr(), deltaFcum)
+        else:
+            log_den = solve_pcg(A, deltaFcum, x0=x0, tol=1e-10)
 
         return log_den
+
+    def _estimate_BMTI_inverse_diagonal(self, A, alpha, n_probes):
+        # Stochastic estimate of diag(A^-1) with the Hutchinson estimator, deflated as in Diag++: a third of the
+        # probes sketches the dominant subspace Q of A^-1 (the smooth, slowly decaying modes responsible for most
+        # of the variance of plain Hutchinson), whose contribution diag(A^-1 Q Q^T) is computed exactly; the
+        # remaining probes estimate the diagonal of A^-1 (I - Q Q^T) as mean_k z_k * A^-1 (I - Q Q^T) z_k.
+        # For alpha=1, A is singular with the vectors constant on each connected component of the graph as null
+        # space: all vectors are projected out of it, which estimates the diagonal of the pseudo-inverse as done
+        # by the direct solvers.
+        A = A.tocsr()
+        n_sketch = n_probes // 3
+        n_hutch = n_probes - n_sketch
+
+        if alpha == 1:
+            _, labels = connected_components(A, directed=False)
+
+            def project(vecs):
+                return self._remove_component_means(vecs, labels)
+
+        else:
+
+            def project(vecs):
+                return vecs
+
+        diag = np.zeros(self.N)
+        Q = np.zeros((self.N, 0))
+        if n_sketch > 0:
+            sketch = self.rng.choice([-1.0, 1.0], size=(self.N, n_sketch))
+            Q, _ = np.linalg.qr(project(solve_pcg(A, project(sketch), tol=1e-6)))
+            diag += np.einsum("ij, ij -> i", Q, project(solve_pcg(A, Q, tol=1e-6)))
+
+        probes = self.rng.choice([-1.0, 1.0], size=(self.N, n_hutch))
+        defl_probes = project(probes)
+        defl_probes -= Q @ (Q.T @ defl_probes)
+        diag += (
+            np.einsum(
+                "ij, ij -> i", probes, project(solve_pcg(A, defl_probes, tol=1e-6))
+            )
+            / n_hutch
+        )
+
+        return diag
+
+    @staticmethod
+    def _remove_component_means(vecs, labels):
+        sizes = np.bincount(labels)
+        means = np.zeros((sizes.shape[0], vecs.shape[1]))
+        np.add.at(means, labels, vecs)
+        return vecs - (means / sizes[:, None])[labels]
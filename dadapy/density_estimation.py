@@ -20,6 +20,7 @@ The different algorithms of density estimation are implemented as methods of thi
 """
 
 import multiprocessing
+import numbers
 import time
 import warnings
 
@@ -27,11 +28,13 @@ import numpy as np
 
 from dadapy._cython import cython_density as cd
 from dadapy._utils.density_estimation import (
+    return_binned_bootstrap_counts,
+    return_binned_bootstrap_means,
     return_not_normalised_density_kstarNN,
     return_not_normalised_density_PAk,
     return_not_normalised_density_PAk_optimized,
 )
-from dadapy._utils.utils import compute_cross_nn_distances
+from dadapy._utils.utils import build_nn_index, query_nn_index
 from dadapy.kstar import KStar
 
 cores = multiprocessing.cpu_count()
@@ -217,6 +220,8 @@ class DensityEstimation(KStar):
         Args:
             Dthr (float): Likelihood ratio parameter used to compute optimal k, the value of Dthr=23.92 corresponds
                 to a p-value of 1e-6.
+            optimized (bool): if True, the likelihood is maximised with vectorised volume computations;
+                if False, a fused compiled kernel parallel over the points (n_jobs threads) is used
 
         Returns:
             log_den (np.ndarray(float)): estimated log density
@@ -252,6 +257,7 @@ class DensityEstimation(KStar):
                 self.intrinsic_dim,
                 self.kstar,
                 interpolation=False,
+                n_jobs=self.n_jobs,
             )
 
         sec2 = time.time()
@@ -294,6 +300,117 @@ class DensityEstimation(KStar):
 
     # ----------------------------------------------------------------------------------------------
 
+    def return_entropy_bootstrap(self, n_boot=100, chunk_size=100000):
+        """Compute the sample Shannon entropy of the data distribution and its bootstrap error.
+
+        The entropy is the average negative log-density, as in return_entropy. Its error is the standard
+        deviation over n_boot replicas in which the points are resampled and each log-density is perturbed
+        according to its error. Points are processed in chunks of size chunk_size, so that the memory used
+        does not scale as N x n_boot.
+
+        Args:
+            n_boot (int): number of bootstrap replicas
+            chunk_size (int): number of points processed at once
+
+        Returns:
+            H (float): the estimated entropy of the distribution
+            H_err (float): the bootstrap error on the entropy
+        """
+        assert self.log_den is not None
+        assert self.log_den_err is not None
+
+        H, H_err, _ = return_binned_bootstrap_means(
+            -self.log_den,
+            self.log_den_err,
+            np.zeros(self.N, dtype=int),
+            1,
+            n_boot,
+            chunk_size,
+            self.rng,
+        )
+
+        return H[0], H_err[0]
+
+    # ----------------------------------------------------------------------------------------------
+
+    def return_free_energy_profile(self, cv, bins=50, n_boot=100, chunk_size=100000):
+        """Compute the free energy profile of the data projected on one or more collective variables.
+
+        The free energy of a bin is minus the log of the marginal probability density of the collective
+        variables in it, i.e. of the fraction of points falling in the bin divided by the bin volume. Its
+        error is the standard deviation over n_boot replicas in which the points are resampled with Poisson
+        weights, processed in chunks of size chunk_size so that memory scales with the number of bins and
+        not with N x n_boot.
+
+        Args:
+            cv (np.ndarray(float)): shape (N,) or (N, n_cv), collective variables of the N points
+            bins (int or sequence): number of bins or bin edges along each collective variable, as in
+                np.histogramdd
+            n_boot (int): number of bootstrap replicas
+            chunk_size (int): number of points processed at once
+
+        Returns:
+            free_energy (np.ndarray(float)): free energy in each bin (nan for empty bins), with one axis per
+                collective variable
+            free_energy_err (np.ndarray(float)): bootstrap error of free_energy
+            counts (np.ndarray(int)): number of points in each bin
+            edges (list(np.ndarray(float))): bin edges along each collective variable
+        """
+        cv = np.asarray(cv, dtype=float)
+        if cv.ndim == 1:
+            cv = cv[:, None]
+        assert cv.shape[0] == self.N, "cv must have one row per data point"
+
+        n_cv = cv.shape[1]
+        if isinstance(bins, numbers.Integral):
+            bins = [bins] * n_cv
+        elif n_cv == 1 and np.ndim(bins) == 1:
+            bins = [bins]
+        assert len(bins) == n_cv, "bins must be given for each collective variable"
+
+        edges = [np.histogram_bin_edges(cv[:, i], bins=b) for i, b in enumerate(bins)]
+        shape = tuple(len(e) - 1 for e in edges)
+
+        # the last bin is closed on the right as in np.histogramdd; points outside the edges are discarded
+        bin_indices = np.empty(cv.shape, dtype=int)
+        inside = np.ones(self.N, dtype=bool)
+        for i, e in enumerate(edges):
+            idx = np.searchsorted(e, cv[:, i], side="right") - 1
+            idx[cv[:, i] == e[-1]] = len(e) - 2
+            inside &= (idx >= 0) & (idx < len(e) - 1)
+            bin_indices[:, i] = idx
+
+        flat_indices = np.full(self.N, -1, dtype=int)
+        flat_indices[inside] = np.ravel_multi_index(tuple(bin_indices[inside].T), shape)
+
+        counts, boot_counts, boot_totals = return_binned_bootstrap_counts(
+            flat_indices, int(np.prod(shape)), n_boot, chunk_size, self.rng
+        )
+        widths = np.meshgrid(*[np.diff(e) for e in edges], indexing="ij")
+        volumes = np.prod(widths, axis=0).ravel()
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            free_energy = -np.log(counts / (self.N * volumes))
+            boot_free_energy = -np.log(
+                boot_counts / (boot_totals[None, :] * volumes[:, None])
+            )
+        free_energy[counts == 0] = np.nan
+        # bins left empty in a replica do not enter its error
+        boot_free_energy[~np.isfinite(boot_free_energy)] = np.nan
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            free_energy_err = np.nanstd(boot_free_energy, axis=1)
+        free_energy_err[counts == 0] = np.nan
+
+        return (
+            free_energy.reshape(shape),
+            free_energy_err.reshape(shape),
+            counts.reshape(shape),
+            edges,
+        )
+
+    # ----------------------------------------------------------------------------------------------
+
     def return_interpolated_density_kNN(self, X_new, k):
         """Return the kNN density of the primary dataset, evaluated on a new set of points "X_new".
 
@@ -310,9 +427,7 @@ class DensityEstimation(KStar):
         if self.intrinsic_dim is None:
             _ = self.compute_id_2NN()
 
-        cross_distances, _ = compute_cross_nn_distances(
-            X_new, self.X, self.maxk, self.metric, self.period
-        )
+        cross_distances, _ = self._return_cross_nn_distances(X_new)
 
         kstar = np.ones(X_new.shape[0], dtype=int) * k
 
@@ -343,29 +458,12 @@ class DensityEstimation(KStar):
         if self.intrinsic_dim is None:
             _ = self.compute_id_2NN()
 
-        cross_distances, cross_dist_indices = compute_cross_nn_distances(
-            X_new, self.X, self.maxk, self.metric, self.period
-        )
-
-        kstar = cd._compute_kstar_interp(
-            self.intrinsic_dim,
-            X_new.shape[0],
-            self.maxk,
-            Dthr,
-            cross_dist_indices,
-            cross_distances,
-            self.distances,
-        )
+        cross_distances, cross_dist_indices = self._return_cross_nn_distances(X_new)
 
-        log_den, log_den_err, _ = return_not_normalised_density_kstarNN(
-            cross_distances, self.intrinsic_dim, kstar, interpolation=True
+        return self._interpolate_density_kstarNN(
+            cross_distances, cross_dist_indices, Dthr
         )
 
-        # Normalise density
-        log_den -= np.log(self.N)
-
-        return log_den, log_den_err
-
     # ----------------------------------------------------------------------------------------------
 
     def return_interpolated_density_PAk(self, X_new, Dthr=23.92812698):
@@ -384,13 +482,51 @@ class DensityEstimation(KStar):
         if self.intrinsic_dim is None:
             _ = self.compute_id_2NN()
 
-        cross_distances, cross_dist_indices = compute_cross_nn_distances(
-            X_new, self.X, self.maxk, self.metric, self.period
+        cross_distances, cross_dist_indices = self._return_cross_nn_distances(X_new)
+
+        return self._interpolate_density_PAk(cross_distances, cross_dist_indices, Dthr)
+
+    # ----------------------------------------------------------------------------------------------
+
+    def _return_cross_nn_distances(self, X_new):
+        """Return the maxk nearest neighbours of the points X_new in the primary dataset.
+
+        The nearest neighbour search index on the primary dataset is built at the first call and then reused
+        until the coordinates, the metric or the period are set again.
+        """
+        if self._nn_index is None:
+            self._nn_index = build_nn_index(
+                self.X, self.metric, self.period, self.n_jobs
+            )
+
+        return query_nn_index(
+            self._nn_index, X_new, self.maxk, self.metric, self.period, self.n_jobs
+        )
+
+    def _interpolate_density_kstarNN(self, cross_distances, cross_dist_indices, Dthr):
+        kstar = cd._compute_kstar_interp(
+            self.intrinsic_dim,
+            cross_distances.shape[0],
+            self.maxk,
+            Dthr,
+            cross_dist_indices,
+            cross_distances,
+            self.distances,
+        )
+
+        log_den, log_den_err, _ = return_not_normalised_density_kstarNN(
+            cross_distances, self.intrinsic_dim, kstar, interpolation=True
         )
 
+        # Normalise density
+        log_den -= np.log(self.N)
+
+        return log_den, log_den_err
+
+    def _interpolate_density_PAk(self, cross_distances, cross_dist_indices, Dthr):
         kstar = cd._compute_kstar_interp(
             self.intrinsic_dim,
-            X_new.shape[0],
+            cross_distances.shape[0],
             self.maxk,
             Dthr,
             cross_dist_indices,
@@ -399,7 +535,11 @@ class DensityEstimation(KStar):
         )
 
         log_den, log_den_err, _ = return_not_normalised_density_PAk(
-            cross_distances, self.intrinsic_dim, kstar, self.maxk, interpolation=True
+            cross_distances,
+            self.intrinsic_dim,
+            kstar,
+            interpolation=True,
+            n_jobs=self.n_jobs,
         )
 
         # Normalise density
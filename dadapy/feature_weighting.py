@@ -19,10 +19,13 @@ The *feature_weighting* module contains the *FeatureWeighting* class.
 This class uses Differentiable Information Imbalance
 """
 
+import hashlib
 import multiprocessing
+import os
 import time
 import warnings
 from functools import wraps
+from inspect import signature
 from typing import Type, Union
 
 import numpy as np
@@ -31,7 +34,11 @@ from scipy.linalg import norm
 from dadapy._utils.differentiable_imbalance import (
     _extract_min_diis_lasso_optimization,
     _optimize_dii,
+    _optimize_dii_lasso_path,
+    _optimize_dii_sparse,
     _optimize_dii_static_zeros,
+    _optimize_dii_static_zeros_shared,
+    _optimize_dii_stochastic,
     _plot_min_lasso_results,
     _refine_lasso_optimization,
     _return_dii,
@@ -40,6 +47,7 @@ from dadapy._utils.differentiable_imbalance import (
     _return_full_rank_matrix,
     _return_optimal_lambda_from_distances,
 )
+from dadapy._utils.shared_tasks import iterate_shared_tasks
 from dadapy.base import Base
 
 cores = multiprocessing.cpu_count()
@@ -50,6 +58,15 @@ def check_maxk(func):
     @wraps(func)
     def with_check(*args, **kwargs):
         feature_selector: type[FeatureWeighting] = args[0]
+        if signature(func).bind(*args, **kwargs).arguments.get("sparse", False):
+            # the sparse optimization truncates the groundtruth neighbours at target_data.maxk: no warning, also
+            # from the methods it calls
+            maxk_warning = feature_selector._maxk_warning
+            feature_selector._maxk_warning = False
+            try:
+                return func(*args, **kwargs)
+            finally:
+                feature_selector._maxk_warning = maxk_warning
         if feature_selector._maxk_warning:
             if feature_selector.maxk != feature_selector.N - 1:
                 warnings.warn(
@@ -367,6 +384,10 @@ class FeatureWeighting(Base):
         learning_rate: float = None,
         l1_penalty: float = 0.0,
         decaying_lr: bool = True,
+        sparse: bool = False,
+        k: int = None,
+        tol: float = 1e-3,
+        cache_distances: bool = False,
     ):
         """Optimize the differentiable information imbalance using gradient descent
             of the DII between input data object A and groundtruth data object B.
@@ -391,6 +412,20 @@ class FeatureWeighting(Base):
                 The l1-regularization strength, if sparcity is needed. Default: 0 (l1-regularization turned off).
             decaying_lr: bool
                 Use exponentially decaying learning rate in gradient descent or not. Default: True.
+            sparse: bool
+                Truncate the softmax of each point to its nearest neighbours in the rescaled input space, and keep
+                only the first target_data.maxk neighbours in the groundtruth space, so that no N x N matrix is
+                built. Default: False.
+            k: int, optional
+                Starting number of neighbours in the truncated softmax, only used if sparse is True.
+                Default: min(32, N-1).
+            tol: float
+                Bound on the softmax weight of a neglected neighbour relative to the largest weight of the point,
+                only used if sparse is True. Default: 1e-3.
+            cache_distances: bool
+                Cache the squared differences of each feature between all pairs of points (8 N^2 D bytes), so that
+                the distances of each epoch are weighted sums of cached terms. Not used if sparse is True.
+                Default: False.
 
         Returns:
             final_weights: np.ndarray, shape (D). Array of the optmized weights.
@@ -420,7 +455,115 @@ class FeatureWeighting(Base):
                 trial_learning_rates=None,
             )
 
-        weights_list, diis, l1_loss_terms = _optimize_dii(
+        if sparse:
+            weights_list, diis, l1_loss_terms = _optimize_dii_sparse(
+                groundtruth_data=target_data.X,
+                groundtruthperiod=self._parse_period_for_dii(
+                    target_data.period, target_data.dims
+                ),
+                data=self.X,
+                period=period,
+                weights_0=initial_weights,
+                lambd=lambd,
+                constrain=constrain,
+                l1_penalty=l1_penalty,
+                n_epochs=n_epochs,
+                l_rate=learning_rate,
+                decaying_lr=decaying_lr,
+                n_jobs=self.n_jobs,
+                maxk_groundtruth=target_data.maxk,
+                k=k,
+                tol=tol,
+            )
+        else:
+            weights_list, diis, l1_loss_terms = _optimize_dii(
+                groundtruth_data=target_data.X,
+                groundtruthperiod=self._parse_period_for_dii(
+                    target_data.period, target_data.dims
+                ),
+                data=self.X,
+                period=period,
+                weights_0=initial_weights,
+                lambd=lambd,
+                constrain=constrain,
+                l1_penalty=l1_penalty,
+                n_epochs=n_epochs,
+                l_rate=learning_rate,
+                decaying_lr=decaying_lr,
+                n_jobs=self.n_jobs,
+                cythond=self._cythond,
+                cache_distances=cache_distances,
+            )
+        # TODO: include a function that gives at least a reasonable estimate for the l1 penalty when wanting x features
+        self.history = {
+            "weights_per_epoch": weights_list,
+            "dii_per_epoch": diis,
+            "l1_term_per_epoch": l1_loss_terms,
+        }
+        return weights_list[-1]
+
+    def return_weights_optimize_dii_stochastic(
+        self,
+        target_data: Type[Base],
+        n_epochs: int = 1000,
+        constrain: bool = False,
+        initial_weights: Union[np.ndarray, int, float] = None,
+        lambd: float = None,
+        learning_rate: float = None,
+        l1_penalty: float = 0.0,
+        batch_size: int = 256,
+        n_validation: int = None,
+        patience: int = 50,
+        seed: int = None,
+    ):
+        """Optimize the differentiable information imbalance with Adam on minibatches of anchor points.
+
+        Each epoch estimates the gradient from the rows of batch_size random points of the c-matrix, so that its
+        cost grows as N * batch_size instead of N^2. The optimization stops when the DII of a fixed set of
+        validation points has not improved for patience epochs.
+
+        Args:
+            target_data: FeatureWeighting object, containing the groundtruth data
+                (D_groundtruth x N array, period (optional)) to be compared to.
+            n_epochs: int, optional
+                The maximum number of epochs, each using one minibatch. Default: 1000.
+            constrain: bool
+                Constrain the sum of the weights to sum up to the number of weights. Default: False
+            initial_ weights : numpy.ndarray, shape (D,)
+                The array of starting weight values for the input values, where D is the dimension of data.
+                If none, it is initialized to 1/var for each variable
+                This cannot be initialized to 0's.
+            lambd : float, optional
+                The lambda scaling parameter of the softmax. If None, it is calculated automatically. Default is None.
+            learning_rate: float, optional
+                The Adam step size. If None, 0.01 times the largest initial weight.
+            l1_penalty: float, optional
+                The l1-regularization strength, if sparcity is needed. Default: 0 (l1-regularization turned off).
+            batch_size: int
+                The number of anchor points per minibatch. Default: 256.
+            n_validation: int, optional
+                The number of validation points, excluded from the minibatches. Default: batch_size.
+            patience: int
+                The number of epochs without improvement of the validation DII before stopping. Default: 50.
+            seed: int, optional
+                The seed of the random generator drawing the points. Default: None.
+
+        Returns:
+            final_weights: np.ndarray, shape (D). Array of the weights with the lowest validation DII.
+
+        History entries added to FeatureWeighting object, up to the epoch with the lowest validation DII:
+            weights_per_epoch: np.ndarray, shape (n_epochs_run+1, D).
+                List of lists of the weights during optimization.
+            dii_per_epoch: np.ndarray, shape (n_epochs_run+1, ).
+                List of the validation differentiable information imbalances during optimization.
+            l1_term_per_epoch: np.ndarray, shape (n_epochs_run+1, ).
+                List of the l1_penalty terms contributing to the the loss function during optimization.
+        These history entries can be accessed as follows: objectname.history['entry_name']
+        """
+        period = self._parse_own_period()
+        initial_weights = self._parse_initial_weights(initial_weights)
+
+        weights_list, diis, l1_loss_terms = _optimize_dii_stochastic(
             groundtruth_data=target_data.X,
             groundtruthperiod=self._parse_period_for_dii(
                 target_data.period, target_data.dims
@@ -433,11 +576,12 @@ class FeatureWeighting(Base):
             l1_penalty=l1_penalty,
             n_epochs=n_epochs,
             l_rate=learning_rate,
-            decaying_lr=decaying_lr,
             n_jobs=self.n_jobs,
-            cythond=self._cythond,
+            batch_size=batch_size,
+            n_validation=n_validation,
+            patience=patience,
+            seed=seed,
         )
-        # TODO: include a function that gives at least a reasonable estimate for the l1 penalty when wanting x features
         self.history = {
             "weights_per_epoch": weights_list,
             "dii_per_epoch": diis,
@@ -561,6 +705,223 @@ class FeatureWeighting(Base):
         # and chose at which number of non-zero weights still enough information is retained
         return imbalances_per_epoch[:, -1], weights_per_epoch[:, -1, :]
 
+    @check_maxk
+    def return_backward_greedy_dii_elimination_beam(
+        self,
+        target_data: Type[Base],
+        initial_weights: Union[np.ndarray, int, float] = None,
+        lambd: float = None,
+        n_epochs: int = 100,
+        learning_rate: float = None,
+        constrain: bool = False,
+        decaying_lr: bool = True,
+        n_candidates: int = None,
+        checkpoint_file: str = None,
+    ):
+        """Do a stepwise backward elimination of features, eliminating the one whose removal increases the DII least.
+
+        At each step, the n_candidates remaining features with the lowest weights are tentatively eliminated; each
+        candidate set is optimized with _optimize_dii_static_zeros, warm-started from the weights of the previous
+        step, and the candidate with the lowest final DII is kept. The candidates are optimized in parallel by
+        self.n_jobs processes sharing the data and the groundtruth rank matrix. With n_candidates=1 the
+        eliminations are the ones of return_backward_greedy_dii_elimination.
+
+        Args:
+            target_data: FeatureWeighting object, containing the groundtruth data
+                (D_groundtruth x N array, period (optional)) to be compared to.
+            initial_weights (np.ndarray or list): D(input) initial weights for the input features. No zeros allowed here
+            lambd (float): softmax scaling. If None (preferred) this chosen automatically with compute_optimal_lambda
+            n_epochs (int): number of epochs in each optimization cycle
+            learning_rate (float): learning rate.
+                Has to be tuned, especially if constrain=True (otherwise optmization could fail)
+            constrain (bool): if True, rescale the weights so the biggest weight = 1
+            decaying_lr (bool): default: True. Apply decaying learning rate = l_rate * 2**(-i_epoch/10)
+                - every 10 epochs the learning rate will be halfed
+            n_candidates (int): number of candidate eliminations evaluated at each step. Default: None, self.n_jobs
+                candidates, one per process.
+            checkpoint_file (str): path of a .npz file where the state is saved after each step. If the file exists,
+                the elimination resumes from the saved state, with its learning rate; a ValueError is raised if it
+                was saved with different data, target data, period, lambd, learning_rate (if given), constrain,
+                decaying_lr or n_candidates. Default: None, no checkpoints.
+
+        Returns:
+            final_diis: np.ndarray, shape (D). Array of the optmized DII for each of the according weights.
+            final_weights: np.ndarray, shape (D x D). Array of the optmized weights for each number of non-zero weights.
+
+        History entries added to FeatureWeighting object:
+            dii_per_epoch: np.ndarray, shape (D, n_epochs+1, ).
+                DII during optimization for every epoch and number of non-zero weights.
+            weights_per_epoch: np.ndarray, shape (D, n_epochs+1, D).
+                Weights during optimisation for every epoch and every number of non-zero weights.
+            eliminated_features: np.ndarray, shape (D-1, ).
+                Index of the feature eliminated at each step, -1 for the steps not performed.
+        These history entries can be accessed as follows: objectname.history['entry_name']
+        """
+        period = self._parse_own_period()
+        if n_candidates is None:
+            n_candidates = self.n_jobs
+        # settings a checkpoint must have been saved with to be resumed; the data are identified by their hashes
+        settings = {
+            "lambd": np.nan if lambd is None else lambd,
+            "constrain": constrain,
+            "decaying_lr": decaying_lr,
+            "n_candidates": n_candidates,
+            "period": np.full(self.dims, np.nan) if period is None else period,
+            "data_hash": np.frombuffer(
+                hashlib.sha256(np.ascontiguousarray(self.X).tobytes()).digest(),
+                dtype=np.uint8,
+            ),
+            "target_hash": np.frombuffer(
+                hashlib.sha256(np.ascontiguousarray(target_data.X).tobytes()).digest(),
+                dtype=np.uint8,
+            ),
+        }
+
+        if checkpoint_file is not None and os.path.exists(checkpoint_file):
+            with np.load(checkpoint_file) as checkpoint:
+                weights_per_epoch = checkpoint["weights_per_epoch"]
+                imbalances_per_epoch = checkpoint["imbalances_per_epoch"]
+                eliminated_features = checkpoint["eliminated_features"]
+                mismatched = [
+                    name
+                    for name, value in settings.items()
+                    if name not in checkpoint
+                    or not np.array_equal(checkpoint[name], value, equal_nan=True)
+                ]
+                if (
+                    learning_rate is not None
+                    and learning_rate != checkpoint["learning_rate"]
+                ):
+                    mismatched.append("learning_rate")
+                learning_rate = float(checkpoint["learning_rate"])
+            if weights_per_epoch.shape != (self.dims, n_epochs + 1, self.dims):
+                raise ValueError(
+                    f"the checkpoint in {checkpoint_file} does not match {self.dims} features and {n_epochs} epochs"
+                )
+            if mismatched:
+                raise ValueError(
+                    f"the checkpoint in {checkpoint_file} was saved with different {', '.join(mismatched)}"
+                )
+        else:
+            initial_weights = self._parse_initial_weights(initial_weights)
+            if learning_rate is None:
+                learning_rate = self.return_optimal_learning_rate(
+                    target_data=target_data,
+                    n_epochs=50,
+                    n_samples=200,
+                    initial_weights=initial_weights,
+                    lambd=lambd,
+                    decaying_lr=decaying_lr,
+                    trial_learning_rates=None,
+                )
+            weights_per_epoch = np.full((self.dims, n_epochs + 1, self.dims), np.nan)
+            imbalances_per_epoch = np.full((self.dims, n_epochs + 1), np.nan)
+            eliminated_features = np.full(self.dims - 1, -1)
+        optimization_args = (
+            lambd,
+            n_epochs,
+            learning_rate,
+            constrain,
+            decaying_lr,
+            period,
+        )
+
+        rank_matrix_B = _return_full_rank_matrix(
+            target_data.X,
+            period=self._parse_period_for_dii(target_data.period, target_data.dims),
+            n_jobs=self.n_jobs,
+        )
+
+        def save_checkpoint():
+            if checkpoint_file is not None:
+                temporary_file = checkpoint_file + ".tmp"
+                with open(temporary_file, "wb") as f:
+                    np.savez(
+                        f,
+                        weights_per_epoch=weights_per_epoch,
+                        imbalances_per_epoch=imbalances_per_epoch,
+                        eliminated_features=eliminated_features,
+                        learning_rate=learning_rate,
+                        **settings,
+                    )
+                os.replace(temporary_file, checkpoint_file)
+
+        if np.isnan(imbalances_per_epoch[0, -1]):
+            # for making a warm start already for the first optimization
+            end_weights = self.return_weights_optimize_dii(
+                target_data=target_data,
+                n_epochs=n_epochs,
+                initial_weights=initial_weights,
+                lambd=lambd,
+                learning_rate=learning_rate,
+                decaying_lr=decaying_lr,
+                l1_penalty=0.0,
+            )
+            gs, imbs = _optimize_dii_static_zeros(
+                groundtruth_data=None,
+                data=self.X,
+                weights_0=end_weights,
+                lambd=lambd,
+                n_epochs=n_epochs,
+                l_rate=learning_rate,
+                constrain=constrain,
+                decaying_lr=decaying_lr,
+                period=period,
+                n_jobs=self.n_jobs,
+                cythond=self._cythond,
+                rank_matrix_B=rank_matrix_B,
+            )
+            weights_per_epoch[0] = gs
+            imbalances_per_epoch[0] = imbs
+            save_checkpoint()
+
+        # resume from the last step performed
+        step = np.max(np.nonzero(~np.isnan(imbalances_per_epoch[:, -1]))[0])
+        parent_weights = weights_per_epoch[step, -1]
+        while np.count_nonzero(parent_weights) > 1:
+            start = time.time()
+            remaining = np.nonzero(parent_weights)[0]
+            candidates = remaining[
+                np.argsort(parent_weights[remaining], kind="stable")
+            ][:n_candidates]
+
+            def tasks(candidates, parent_weights):
+                for candidate in candidates:
+                    weights_0 = parent_weights.copy()
+                    weights_0[candidate] = 0
+                    yield (candidate, weights_0) + optimization_args
+
+            results = {}
+            for candidate, gs, imbs in iterate_shared_tasks(
+                _optimize_dii_static_zeros_shared,
+                {"data": self.X, "rank_matrix_B": rank_matrix_B},
+                tasks(candidates, parent_weights),
+                n_jobs=self.n_jobs,
+            ):
+                results[candidate] = (gs, imbs)
+            # the candidate with the lowest final DII, the lowest weight among equal DIIs
+            best = min(candidates, key=lambda candidate: results[candidate][1][-1])
+            gs, imbs = results[best]
+
+            eliminated_features[step] = best
+            parent_weights = gs[-1]
+            step = self.dims - np.count_nonzero(gs[0])
+            weights_per_epoch[step] = gs
+            imbalances_per_epoch[step] = imbs
+            save_checkpoint()
+            if self.verb:
+                print(
+                    f"number of nonzero weights: {self.dims - step}, candidates: {len(candidates)}, "
+                    f"execution time: {time.time() - start:.2f} s."
+                )
+
+        self.history = {
+            "dii_per_epoch": imbalances_per_epoch,
+            "weights_per_epoch": weights_per_epoch,
+            "eliminated_features": eliminated_features,
+        }
+        return imbalances_per_epoch[:, -1], weights_per_epoch[:, -1, :]
+
     @check_maxk
     def return_lasso_optimization_dii_search(
         self,
@@ -574,6 +935,9 @@ class FeatureWeighting(Base):
         decaying_lr: bool = True,
         refine: bool = False,
         plotlasso: bool = True,
+        path: bool = False,
+        n_processes: int = 1,
+        tol: float = 1e-3,
     ):
         """Search the number of resulting non-zero weights and the optimized DII for several l1-regularization strengths
         Args:
@@ -601,6 +965,16 @@ class FeatureWeighting(Base):
             plotlasso (bool): default: True. If True, a plot is shown,
                 with the optimal DII for each number of non-zero weights,
                 colored by the l1-penalty used. This plot can be used to select select results with reasonably low DII.
+            path (bool): default: False. If True, the l1-penalties are optimized as a regularization path:
+                in increasing order, each optimization warm-started from the solution of the previous penalty,
+                with the groundtruth rank matrix computed once. Refinements are warm-started in the same way.
+                Since each optimization continues from a previous solution, the results are more converged than
+                the independent optimizations with the same n_epochs, and can differ from them.
+            n_processes (int): default: 1. If path is True, the penalties are split into n_processes
+                independent path segments, optimized by as many processes sharing the rank matrix.
+            tol (float): default: 1e-3. If path is True, a warm-started optimization stops before n_epochs when
+                the loss changes by less than tol times its value in 10 epochs; its remaining epochs in the history
+                repeat the last values. None runs all the epochs.
 
         Returns:
             num_nonzero_features (np.ndarray): D-dimensional numbers of non-zero features.
@@ -673,34 +1047,71 @@ class FeatureWeighting(Base):
         if self.verb:
             print(len(l1_penalties), "l1-penalties to test:")
 
-        for i in range(len(l1_penalties)):
+        period = self._parse_own_period()
+        groundtruthperiod = self._parse_period_for_dii(
+            target_data.period, target_data.dims
+        )
+        rank_matrix_B = None
+        if path:
             start = time.time()
-
-            weights[i], diis[i], l1_loss_contributions[i] = _optimize_dii(
+            # the rank matrix of the path is shared with the refinement
+            rank_matrix_B = _return_full_rank_matrix(
+                target_data.X,
+                period=groundtruthperiod,
+                n_jobs=self.n_jobs,
+                cythond=self._cythond,
+            )
+            weights, diis, l1_loss_contributions = _optimize_dii_lasso_path(
                 groundtruth_data=target_data.X,
                 data=self.X,
                 weights_0=initial_weights,
+                l1_penalties=l1_penalties,
                 lambd=lambd,
                 n_epochs=n_epochs,
                 l_rate=learning_rate,
                 constrain=constrain,
-                l1_penalty=l1_penalties[i],
                 decaying_lr=decaying_lr,
-                period=self._parse_own_period(),
-                groundtruthperiod=self._parse_period_for_dii(
-                    target_data.period, target_data.dims
-                ),
+                period=period,
+                groundtruthperiod=groundtruthperiod,
                 n_jobs=self.n_jobs,
                 cythond=self._cythond,
+                n_processes=n_processes,
+                rank_matrix_B=rank_matrix_B,
+                tol=tol,
             )
-
-            end = time.time()
             if self.verb:
                 print(
-                    f"optimization with l1-penalty {i+1} of strength "
-                    + f"{l1_penalties[i]:.4g} took: {end - start:.2f} s.",
+                    f"optimization of the l1-penalty path took: {time.time() - start:.2f} s."
+                )
+        else:
+            for i in range(len(l1_penalties)):
+                start = time.time()
+
+                weights[i], diis[i], l1_loss_contributions[i] = _optimize_dii(
+                    groundtruth_data=target_data.X,
+                    data=self.X,
+                    weights_0=initial_weights,
+                    lambd=lambd,
+                    n_epochs=n_epochs,
+                    l_rate=learning_rate,
+                    constrain=constrain,
+                    l1_penalty=l1_penalties[i],
+                    decaying_lr=decaying_lr,
+                    period=self._parse_own_period(),
+                    groundtruthperiod=self._parse_period_for_dii(
+                        target_data.period, target_data.dims
+                    ),
+                    n_jobs=self.n_jobs,
+                    cythond=self._cythond,
                 )
 
+                end = time.time()
+                if self.verb:
+                    print(
+                        f"optimization with l1-penalty {i+1} of strength "
+                        + f"{l1_penalties[i]:.4g} took: {end - start:.2f} s.",
+                    )
+
         # Refine l1 search
         if refine:
             (
@@ -721,13 +1132,15 @@ class FeatureWeighting(Base):
                 l_rate=learning_rate,
                 constrain=constrain,
                 decaying_lr=decaying_lr,
-                period=self._parse_own_period(),
-                groundtruthperiod=self._parse_period_for_dii(
-                    target_data.period, target_data.dims
-                ),
+                period=period,
+                groundtruthperiod=groundtruthperiod,
                 n_jobs=self.n_jobs,
                 cythond=self._cythond,
                 verbose=self.verb,
+                path=path,
+                n_processes=n_processes,
+                rank_matrix_B=rank_matrix_B,
+                tol=tol,
             )
             weights = weights_list
             diis = dii_list
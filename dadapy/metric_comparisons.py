@@ -29,10 +29,15 @@ from joblib import Parallel, delayed
 from dadapy._cython import cython_overlap as c_ov
 from dadapy._utils.metric_comparisons import (
     _compute_2d_grid,
+    _iterate_imb_with_coords,
+    _return_imb_causality_shared,
     _return_imbalance,
+    _return_imbalances_exact,
+    _return_inf_imb_incremental,
     _return_period_mixed,
     _return_period_present,
 )
+from dadapy._utils.shared_tasks import iterate_shared_tasks
 from dadapy._utils.utils import compute_nn_distances
 from dadapy.base import Base
 
@@ -129,6 +134,19 @@ class MetricComparisons(Base):
             x_base = self.X[idx]
             x_other = coordinates[idx]
 
+            if self.metric in ["euclidean", "manhattan"]:
+                # exact ranks without computing the full neighbour lists
+                imb_ij[i], imb_ji[i] = _return_imbalances_exact(
+                    x_base,
+                    x_other,
+                    k=k,
+                    metric=self.metric,
+                    period_A=self.period,
+                    period_B=self.period,
+                    n_jobs=self.n_jobs,
+                )
+                continue
+
             dist_indices_base, _ = self._get_nn_indices(
                 x_base, None, None, subset_size - 1, force_computation=True
             )
@@ -139,11 +157,11 @@ class MetricComparisons(Base):
             assert dist_indices_base.shape[0] == dist_indices_other.shape[0]
 
             imb_ij[i] = _return_imbalance(
-                dist_indices_base, dist_indices_other, self.rng, k=k
+                dist_indices_base, dist_indices_other, self.rng, k=k, n_jobs=self.n_jobs
             )
 
             imb_ji[i] = _return_imbalance(
-                dist_indices_other, dist_indices_base, self.rng, k=k
+                dist_indices_other, dist_indices_base, self.rng, k=k, n_jobs=self.n_jobs
             )
 
         if avg:
@@ -182,8 +200,12 @@ class MetricComparisons(Base):
             X_, self.maxk, self.metric, self.period
         )
 
-        imb_ij = _return_imbalance(dist_indices_i, dist_indices_j, self.rng, k=k)
-        imb_ji = _return_imbalance(dist_indices_j, dist_indices_i, self.rng, k=k)
+        imb_ij = _return_imbalance(
+            dist_indices_i, dist_indices_j, self.rng, k=k, n_jobs=self.n_jobs
+        )
+        imb_ji = _return_imbalance(
+            dist_indices_j, dist_indices_i, self.rng, k=k, n_jobs=self.n_jobs
+        )
 
         return imb_ij, imb_ji
 
@@ -209,17 +231,29 @@ class MetricComparisons(Base):
                 )
             )
 
-        nmats = Parallel(n_jobs=self.n_jobs)(
-            delayed(self.return_inf_imb_two_selected_coords)([i], [j], k)
-            for i in range(ncoords)
-            for j in range(i)
-        )
-
         indices = [(i, j) for i in range(ncoords) for j in range(i)]
+        seeds = self.rng.integers(np.iinfo(np.int64).max, size=len(indices))
+        tasks = (
+            (
+                task,
+                [j],
+                [i],
+                k,
+                self.maxk,
+                self.metric,
+                self._return_period_of_coords([j]),
+                self._return_period_of_coords([i]),
+                seed,
+            )
+            for task, ((i, j), seed) in enumerate(zip(indices, seeds))
+        )
 
-        for idx, n in zip(indices, nmats):
-            n_mat[idx[0], idx[1]] = n[0]
-            n_mat[idx[1], idx[0]] = n[1]
+        for task, imb_ij, imb_ji in _iterate_imb_with_coords(
+            {"X": self.X}, tasks, self.n_jobs
+        ):
+            i, j = indices[task]
+            n_mat[i, j] = imb_ij
+            n_mat[j, i] = imb_ji
 
         return n_mat
 
@@ -318,12 +352,57 @@ class MetricComparisons(Base):
                 "computing loss with coord number on {} processors".format(self.n_jobs)
             )
 
-        n1s_n2s = Parallel(n_jobs=self.n_jobs)(
-            delayed(self._return_imb_with_coords)(self.X, coords, target_ranks, k)
-            for coords in coord_list
+        imbalances = np.zeros((2, len(coord_list)))
+        for (
+            task,
+            imb_target_coords,
+            imb_coords_target,
+        ) in self.iterate_inf_imb_target_selected_coords(target_ranks, coord_list, k=k):
+            imbalances[:, task] = imb_target_coords, imb_coords_target
+
+        return imbalances
+
+    def iterate_inf_imb_target_selected_coords(self, target_ranks, coord_list, k=1):
+        """Compute the information imbalances between the 'target' space and subsets of features as they finish.
+
+        X and target_ranks are shared once with a pool of n_jobs processes through memory-mapped files, and the
+        processes receive only the coordinates of each subset. The results are yielded in order of
+        completion, which makes it possible to monitor or save them while thousands of subsets are evaluated.
+
+        Args:
+            target_ranks (np.ndarray(int)): an array containing the ranks in the target space, could be e.g.
+                the nearest neighbor ranks for a different set of variables on the same data points.
+            coord_list (list(list(int))): a list of the type [[1, 2], [8, 3, 5], ...] where each
+                sub-list defines a set of coordinates for which the information imbalance should be
+                computed.
+            k (int): number of neighbours considered in the computation of the imbalances
+
+        Yields:
+            (int, float, float): the position in coord_list of a subset of coordinates, and the information
+            imbalances from the target space to the subset space and vice versa
+        """
+        assert self.X is not None
+        assert target_ranks.shape[0] == self.X.shape[0]
+
+        seeds = self.rng.integers(np.iinfo(np.int64).max, size=len(coord_list))
+        tasks = (
+            (
+                task,
+                list(coords),
+                None,
+                k,
+                self.maxk,
+                self.metric,
+                self._return_period_of_coords(coords),
+                None,
+                seed,
+            )
+            for task, (coords, seed) in enumerate(zip(coord_list, seeds))
         )
 
-        return np.array(n1s_n2s).T
+        yield from _iterate_imb_with_coords(
+            {"X": self.X, "target_ranks": target_ranks}, tasks, self.n_jobs
+        )
 
     def _return_imb_with_coords(self, X, coords, dist_indices, k):
         """Return the imbalances between a 'full' distance and a distance built using a subset of coordinates.
@@ -338,35 +417,36 @@ class MetricComparisons(Base):
             (float, float): the information imbalance from 'full' to 'alternative' and vice versa
         """
         X_ = X[:, coords]
-
-        if self.period is not None:
-            if isinstance(self.period, np.ndarray) and self.period.shape == (
-                self.dims,
-            ):
-                self.period = self.period
-            elif isinstance(self.period, (int, float)):
-                self.period = np.full((self.dims), fill_value=self.period, dtype=float)
-            else:
-                raise ValueError(
-                    f"'period' must be either a float scalar or a numpy array of floats of shape ({self.dims},)"
-                )
-            period_ = self.period[coords]
-        else:
-            period_ = self.period
+        period_ = self._return_period_of_coords(coords)
 
         _, dist_indices_coords = compute_nn_distances(
             X_, self.maxk, self.metric, period_, n_jobs=self.n_jobs
         )
 
         imb_coords_full = _return_imbalance(
-            dist_indices_coords, dist_indices, self.rng, k=k
+            dist_indices_coords, dist_indices, self.rng, k=k, n_jobs=self.n_jobs
         )
         imb_full_coords = _return_imbalance(
-            dist_indices, dist_indices_coords, self.rng, k=k
+            dist_indices, dist_indices_coords, self.rng, k=k, n_jobs=self.n_jobs
         )
 
         return imb_full_coords, imb_coords_full
 
+    def _return_period_of_coords(self, coords):
+        """Return the periods of a subset of coordinates, or None if no periodicity is set."""
+        if self.period is None:
+            return None
+
+        if isinstance(self.period, np.ndarray) and self.period.shape == (self.dims,):
+            self.period = self.period
+        elif isinstance(self.period, (int, float)):
+            self.period = np.full((self.dims), fill_value=self.period, dtype=float)
+        else:
+            raise ValueError(
+                f"'period' must be either a float scalar or a numpy array of floats of shape ({self.dims},)"
+            )
+        return self.period[coords]
+
     def greedy_feature_selection_full(self, n_coords, k=1, n_best=10, symm=True):
         """Greedy selection of the set of features which is most informative about full distance measure.
 
@@ -405,7 +485,7 @@ class MetricComparisons(Base):
         return best_tuples, best_imbalances, all_imbalances
 
     def greedy_feature_selection_target(
-        self, target_ranks, n_coords, k, n_best, symm=True
+        self, target_ranks, n_coords, k, n_best, symm=True, incremental=False
     ):
         """Greedy selection of the set of features which is most informative about a target distance.
 
@@ -422,19 +502,31 @@ class MetricComparisons(Base):
             n_best (int): the n_best tuples are chosen in each iteration to combinatorically add one variable
                 and calculate the imbalance until n_coords is reached
             symm (bool): whether to use the symmetrised information imbalance
+            incremental (bool): if True, the neighbours of each candidate tuple are searched among the nearest
+                neighbours of the selected tuple it extends, adding the contribution of its new feature to the
+                partial distances of the selected tuple (only euclidean and manhattan metrics). The ranks are
+                computed up to maxk as without incremental, but with different random ranks beyond maxk.
+                Candidates which provably cannot be among the n_best are pruned early and their imbalances in
+                all_imbalances are np.nan.
 
         Returns:
             best_tuples (list(list(int))): best coordinates selected at each iteration
             best_imbalances (np.ndarray(float,float)): imbalances (full-->coords, coords-->full) computed
                 at each iteration, belonging to the best tuple
             all_imbalances (list(list(list(int)))): all imbalances (full-->coords, coords-->full), computed
-                at each iteration, belonging all greedy tuples
+                at each iteration, belonging all greedy tuples. With incremental=True, the imbalances of the tuples
+                pruned because they cannot be among the n_best are not computed and are nan.
         """
         assert self.X is not None
 
         dims = self.dims  # number of features / variables
 
-        imbalances = self.return_inf_imb_target_all_coords(target_ranks, k=k)
+        if incremental:
+            _, imbalances = self._return_inf_imb_incremental(
+                target_ranks, [[]], k, n_best, symm
+            )
+        else:
+            imbalances = self.return_inf_imb_target_all_coords(target_ranks, k=k)
 
         if symm:
             proj = np.dot(imbalances.T, np.array([np.sqrt(0.5), np.sqrt(0.5)]))
@@ -466,20 +558,25 @@ class MetricComparisons(Base):
         all_single_coords = list(np.arange(dims).astype(int))
 
         while len(best_tuples) < n_coords:
-            c_list = []
-            for i in selected_coords:
-                for j in all_single_coords:
-                    if j not in i:
-                        ii = list(i)
-                        ii.append(j)
-                        c_list.append(ii)
-            coord_list = [
-                list(e) for e in set(frozenset(d) for d in c_list)
-            ]  # make sure no tuples are doubled
-
-            imbalances_ = self.return_inf_imb_target_selected_coords(
-                target_ranks, coord_list, k=k
-            )
+            if incremental:
+                coord_list, imbalances_ = self._return_inf_imb_incremental(
+                    target_ranks, selected_coords, k, n_best, symm
+                )
+            else:
+                c_list = []
+                for i in selected_coords:
+                    for j in all_single_coords:
+                        if j not in i:
+                            ii = list(i)
+                            ii.append(j)
+                            c_list.append(ii)
+                coord_list = [
+                    list(e) for e in set(frozenset(d) for d in c_list)
+                ]  # make sure no tuples are doubled
+
+                imbalances_ = self.return_inf_imb_target_selected_coords(
+                    target_ranks, coord_list, k=k
+                )
 
             if symm:
                 proj = np.dot(imbalances_.T, np.array([np.sqrt(0.5), np.sqrt(0.5)]))
@@ -502,6 +599,27 @@ class MetricComparisons(Base):
 
         return best_tuples, np.array(best_imbalances), all_imbalances
 
+    def _return_inf_imb_incremental(self, target_ranks, base_tuples, k, n_best, symm):
+        """Imbalances of the tuples obtained adding one feature to base_tuples, nan for the pruned ones.
+
+        See greedy_feature_selection_target.
+        """
+        assert target_ranks.shape[0] == self.X.shape[0]
+
+        return _return_inf_imb_incremental(
+            self.X,
+            [list(base) for base in base_tuples],
+            target_ranks,
+            self.rng,
+            k=k,
+            n_best=n_best,
+            symm=symm,
+            metric=self.metric,
+            period=self.period,
+            maxk=self.maxk,
+            n_jobs=self.n_jobs,
+        )
+
     def return_inf_imb_full_all_dplets(self, d, k=1):
         """Compute the information imbalances between the full space and all possible combinations of d coordinates.
 
@@ -850,12 +968,6 @@ class MetricComparisons(Base):
         Returns:
             imbalances (np.ndarray(float)): the information imbalances for the different weights
         """
-        if self.period is not None:
-            print(
-                f"WARNING: the period argument {self.period} set in the MetricComparisons class will be "
-                + "ignored.\nSet the periodicity of the features using instead the keywords "
-                + "'period_cause' and 'period_effect'."
-            )
         if (
             cause_present.shape[0] != effect_present.shape[0]
             or cause_present.shape[0] != effect_future.shape[0]
@@ -871,91 +983,198 @@ class MetricComparisons(Base):
                 "Number of points in 'conditioning_present' and 'cause_present' do not match!"
             )
 
-        dim_cause = cause_present.shape[1]
-        dim_effect = effect_present.shape[1]
-        dim_conditioning = (
-            None if conditioning_present is None else conditioning_present.shape[1]
+        ((_, imbalances),) = self._iterate_inf_imb_causality_tables(
+            cause_present,
+            effect_present,
+            conditioning_present,
+            [effect_future],
+            weights,
+            k,
+            period_cause,
+            period_effect,
+            period_conditioning,
         )
 
-        _, ranks_effect_future = compute_nn_distances(
-            effect_future, self.maxk, self.metric, period_effect
-        )
+        return list(imbalances)
 
-        imbalances = Parallel(n_jobs=self.n_jobs)(
-            delayed(self._return_inf_imb_causality_target_rank)(
-                cause_present,
-                effect_present,
-                ranks_effect_future,
-                conditioning_present,
-                weight,
-                k,
-                _return_period_present(
-                    period_cause,
-                    period_effect,
-                    period_conditioning,
-                    dim_cause,
-                    dim_effect,
-                    dim_conditioning,
-                    weight,
-                ),
-            )
-            for weight in weights
-        )
+    def return_inf_imb_causality_lags(
+        self,
+        cause,
+        effect,
+        taus,
+        weights,
+        conditioning=None,
+        k=1,
+        period_cause=None,
+        period_effect=None,
+        period_conditioning=None,
+    ):
+        """Return the imbalances (weight * cause(t), effect(t)) -> effect(t + tau) for a grid of weights and lags.
+
+           When conditioning is not None, the first space is extended with an additional weight,
+           resulting in (weight1 * cause(t), weight2 * conditioning(t), effect(t)) -> effect(t + tau).
+
+        Args:
+            cause (np.ndarray(float)): T x D1 matrix, trajectory of the putative driver system
+            effect (np.ndarray(float)): T x D2 matrix, trajectory of the putative driven system
+            taus (list(int), np.ndarray(int)): time lags, in number of frames
+            weights (list(float), np.ndarray(float)): scaling parameters for the variables at time t
+                (1D array if conditioning is None, 2D array of shape (n_weights,2) otherwise,
+                where the first column is referred to 'cause' and the second one to 'conditioning')
+            conditioning (np.ndarray(float): T x D3 matrix, trajectory of the conditioning system
+            k (int): order of nearest neighbour considered for the calculation of the imbalance
+            period_cause (int,float,np.ndarray(float)): periods of variables in 'cause'
+            period_effect (int,float,np.ndarray(float)): periods of variables in 'effect'
+            period_conditioning (int,float,np.ndarray(float)): periods of variables in 'conditioning'
+
+        Returns:
+            imbalances (np.ndarray(float)): array of shape (len(taus), len(weights)) with the information imbalances
+        """
+        imbalances = np.zeros((len(taus), len(weights)))
+        for i_tau, imbalances_tau in self.iterate_inf_imb_causality_lags(
+            cause,
+            effect,
+            taus,
+            weights,
+            conditioning,
+            k,
+            period_cause,
+            period_effect,
+            period_conditioning,
+        ):
+            imbalances[i_tau] = imbalances_tau
 
         return imbalances
 
-    def _return_inf_imb_causality_target_rank(
+    def iterate_inf_imb_causality_lags(
         self,
-        cause_present,
-        effect_present,
-        ranks_effect_future,
-        conditioning_present=None,
-        weight=1,
+        cause,
+        effect,
+        taus,
+        weights,
+        conditioning=None,
         k=1,
-        period_present=None,
+        period_cause=None,
+        period_effect=None,
+        period_conditioning=None,
     ):
-        """Return the imbalance (weight * cause_present, effect_present) -> effect_future.
+        """Compute the imbalances (weight * cause(t), effect(t)) -> effect(t + tau) for many weights and lags.
 
-           When 'conditioning_present' is not None, the imbalance that is computed is
-           (weight[0] * cause_present, weight[1] * conditioning_present, effect_present) -> effect_future.
+        The imbalances of each lag are yielded as soon as they are computed. The neighbour table of the future space
+        of each lag is computed once and shared by all the weights, and the (lag, weight) pairs are evaluated by a
+        pool of n_jobs processes, each of which only searches the first k neighbours of its present space. Only the
+        tables of the lags being evaluated are held in memory at a time. See return_inf_imb_causality_lags for the
+        arguments.
 
+        Yields:
+            (int, np.ndarray(float)): the position of a lag in taus, and the information imbalances for all the
+            weights at that lag
+        """
+        taus = [int(tau) for tau in taus]
+        T = cause.shape[0]
+        if effect.shape[0] != T or (
+            conditioning is not None and conditioning.shape[0] != T
+        ):
+            raise ValueError(
+                "Number of frames must be the same in 'cause', 'effect' and 'conditioning'!"
+            )
+        if min(taus) < 0 or max(taus) >= T - k:
+            raise ValueError(f"lags must be between 0 and {T - k - 1}")
+
+        yield from self._iterate_inf_imb_causality_tables(
+            cause,
+            effect,
+            conditioning,
+            [effect[tau:] for tau in taus],
+            weights,
+            k,
+            period_cause,
+            period_effect,
+            period_conditioning,
+        )
 
-        Args:
-            cause_present (np.ndarray(float)): N x D1 matrix, putative driver system data set at time 0
-            effect_present (np.ndarray(float)): N x D2 matrix, putative driven system data set at time 0
-            ranks_effect_future (np.ndarray(float)): N x maxk matrix, putative driven system ranks at time tau
-            conditioning_present (np.ndarray(float): N x D3 matrix, conditioning system data set at time 0
-            weight (float or np.ndarray(float)): scaling parameter space at time 0; scalar number if
-                conditioning_present is None, np.ndarray of shape (2,) otherwise
-            k (int): order of nearest neighbour considered for the calculation of the imbalance
-            period_present (np.ndarray(float)): periods of all features in space
-                (weight*cause_present, effect_present) if 'conditioning_present' is None, or in space
-                (weight[0] * cause_present, weight[1] * conditioning_present, effect_present) otherwise
+    def _iterate_inf_imb_causality_tables(
+        self,
+        cause,
+        effect,
+        conditioning,
+        effect_futures,
+        weights,
+        k,
+        period_cause,
+        period_effect,
+        period_conditioning,
+    ):
+        """Yield the imbalances from the present spaces to each future space in effect_futures, for all weights.
 
-        Returns:
-            imb (float): the information imbalance
+        The present space of the future space effect_futures[i] is built from the first len(effect_futures[i])
+        frames of cause, effect and conditioning. The rows of the table are yielded in order of completion.
         """
-        if conditioning_present is None:
-            space_present = np.column_stack((weight * cause_present, effect_present))
-        else:
-            space_present = np.column_stack(
-                (
-                    weight[0] * cause_present,
-                    weight[1] * conditioning_present,
-                    effect_present,
-                )
+        if self.period is not None:
+            print(
+                f"WARNING: the period argument {self.period} set in the MetricComparisons class will be "
+                + "ignored.\nSet the periodicity of the features using instead the keywords "
+                + "'period_cause' and 'period_effect'."
             )
 
-        _, ranks_present = compute_nn_distances(
-            space_present,
-            self.maxk,
-            self.metric,
-            period_present,
+        dim_cause = cause.shape[1]
+        dim_effect = effect.shape[1]
+        dim_conditioning = None if conditioning is None else conditioning.shape[1]
+
+        periods_present = [
+            _return_period_present(
+                period_cause,
+                period_effect,
+                period_conditioning,
+                dim_cause,
+                dim_effect,
+                dim_conditioning,
+                weight,
+            )
+            for weight in weights
+        ]
+        n_weights = len(weights)
+        seeds = self.rng.integers(
+            np.iinfo(np.int64).max, size=(len(effect_futures), n_weights)
         )
 
-        imb = _return_imbalance(ranks_present, ranks_effect_future, self.rng, k=k)
+        arrays = {"cause": cause, "effect": effect}
+        if conditioning is not None:
+            arrays["conditioning"] = conditioning
+
+        def tasks():
+            # the neighbour tables of the future spaces, shared by all the weights, are O(N maxk) each: they are
+            # computed lazily as the tasks are dispatched, so only those of the lags being evaluated are held at
+            # the same time (joblib maps each large table once for all the tasks reading it)
+            for i, effect_future in enumerate(effect_futures):
+                _, future_ranks = compute_nn_distances(
+                    effect_future,
+                    min(self.maxk, effect_future.shape[0] - 1),
+                    self.metric,
+                    period_effect,
+                    n_jobs=self.n_jobs,
+                )
+                for j in range(n_weights):
+                    yield (
+                        i * n_weights + j,
+                        effect_future.shape[0],
+                        future_ranks,
+                        weights[j],
+                        k,
+                        self.metric,
+                        periods_present[j],
+                        seeds[i, j],
+                    )
 
-        return imb
+        tables = {}
+        for task, imb in iterate_shared_tasks(
+            _return_imb_causality_shared, arrays, tasks(), self.n_jobs
+        ):
+            i, j = divmod(task, n_weights)
+            table = tables.setdefault(i, np.full(n_weights, np.nan))
+            table[j] = imb
+            if not np.isnan(table).any():
+                yield i, tables.pop(i)
 
     def return_inf_imb_causality_conditioning(
         self,
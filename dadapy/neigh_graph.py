@@ -50,11 +50,16 @@ class NeighGraph(KStar):
         nind_iptr (np.array(int), optional): size N+1. For each element i, it stores the 0-th index in
             nind_list at which all the edges of the form [i,.] (i.e. the ones connecting point i to its
             neighbours) start. The last entry is set to nind_list.shape[0].
+        rev_nind_list (np.array(int), optional): size nspar. Reverse (incoming) neighbourhood graph in CSR form: the
+            entries rev_nind_list[rev_nind_iptr[j]:rev_nind_iptr[j+1]] are the points i, in increasing order, such
+            that [i,j] is an edge of the DNG.
+        rev_nind_iptr (np.array(int), optional): size N+1. Row pointers of rev_nind_list.
         common_neighs_array (np.array(int), optional): size nspar. At position  p, it contains the total
             number of points in common between the neighbourhoods of the two points forming the p-th
             directed edge of the neighbourhood graph.
-        common_neighs_mat (np.ndarray(float), optional): size N x N. Entry (i,j) contains the total number
-            of points in common between the neighbourhoods of points i and j.
+        common_neighs_mat (scipy.sparse.csr_matrix(int), optional): size N x N, symmetric. Entry (i,j) contains the
+            total number of points in common between the neighbourhoods of points i and j, if (i,j) or (j,i) is an
+            edge of the DNG; it is not stored otherwise.
         neigh_similarity_index (np.ndarray(float), optional): size nspar. At position p, it contains an estimate of
             the overlap between the neighbourhoods of the two points forming the p-th directed edge of the
             neighbourhood graph.
@@ -79,6 +84,8 @@ class NeighGraph(KStar):
         self.nspar = None
         self.nind_list = None
         self.nind_iptr = None
+        self.rev_nind_list = None
+        self.rev_nind_iptr = None
         self.common_neighs_array = None
         self.common_neighs_mat = None
         self.neigh_similarity_index = None
@@ -102,6 +109,8 @@ class NeighGraph(KStar):
         self.nspar = None
         self.nind_list = None
         self.nind_iptr = None
+        self.rev_nind_list = None
+        self.rev_nind_iptr = None
         self.common_neighs_array = None
         self.common_neighs_mat = None
         self.neigh_similarity_index = None
@@ -137,6 +146,34 @@ class NeighGraph(KStar):
 
     # ----------------------------------------------------------------------------------------------
 
+    def compute_reverse_neigh_indices(self):
+        """Compute the reverse neighbourhood graph, i.e. for each point j all the points i such that [i,j] is an edge.
+
+        The graph is stored in CSR form in the rev_nind_list and rev_nind_iptr attributes, so that all the points
+        having j in their neighbourhood are found in O(in-degree of j).
+        """
+        if self.kstar is None:
+            self.compute_kstar()
+
+        if self.verb:
+            print("Computation of the reverse neighbour indices started")
+
+        sec = time.time()
+
+        self.rev_nind_list, self.rev_nind_iptr = cgr.return_reverse_neigh_ind(
+            self.dist_indices, self.kstar - 1
+        )
+
+        sec2 = time.time()
+        if self.verb:
+            print(
+                "{0:0.2f} seconds computing reverse neighbour indices".format(
+                    sec2 - sec
+                )
+            )
+
+    # ----------------------------------------------------------------------------------------------
+
     def compute_neigh_dists(self):
         """Compute the (directed) neighbour distances graph using kstar[i] neighbours for each point i.
 
@@ -165,11 +202,17 @@ class NeighGraph(KStar):
 
     # ----------------------------------------------------------------------------------------------
 
-    def return_sparse_distance_graph(self):
+    def return_sparse_distance_graph(self, symmetrize=False):
         """Return the (directed) neighbour distances graph as a N x N scipy sparse csr_matrix form.
 
         If the attribute neigh_dists is not assigned, invokes method compute_neigh_dists.
 
+        Args:
+            symmetrize (bool): if True, also the edge (j,i) is stored for each edge (i,j) of the DNG
+
+        Returns:
+            dgraph (scipy.sparse.csr_matrix): N x N matrix with entry (i,j) equal to the distance between i and j if
+                (i,j) is an edge of the graph
         """
 
         if self.neigh_dists is None:
@@ -178,15 +221,53 @@ class NeighGraph(KStar):
         if self.nind_list is None or self.nind_iptr is None:
             self.compute_neigh_indices()
 
-        dgraph = sparse.lil_matrix((self.N, self.N), dtype=np.float_)
+        return self._return_sparse_graph(self.neigh_dists, symmetrize)
 
-        for ind_spar, indices in enumerate(self.nind_list):
-            dgraph[indices[0], indices[1]] = self.neigh_dists[ind_spar]
+    # ----------------------------------------------------------------------------------------------
+
+    def return_sparse_similarity_graph(self, symmetrize=False, method="jaccard"):
+        """Return the (directed) neighbourhood similarity graph as a N x N scipy sparse csr_matrix form.
+
+        If the attribute neigh_similarity_index is not assigned, invokes method compute_neigh_similarity_index.
 
-        return dgraph.tocsr()
+        Args:
+            symmetrize (bool): if True, also the edge (j,i) is stored for each edge (i,j) of the DNG
+            method (str): see docs for compute_neigh_similarity_index
+
+        Returns:
+            sgraph (scipy.sparse.csr_matrix): N x N matrix with entry (i,j) equal to the neighbourhood similarity
+                index between i and j if (i,j) is an edge of the graph
+        """
+
+        if self.neigh_similarity_index is None:
+            self.compute_neigh_similarity_index(method=method)
+
+        return self._return_sparse_graph(self.neigh_similarity_index, symmetrize)
 
     # ----------------------------------------------------------------------------------------------
 
+    def _return_sparse_graph(self, weights, symmetrize=False):
+        """Return a N x N csr_matrix with weights[p] on the p-th edge of the DNG, built directly from nind_iptr.
+
+        The column indices in each row follow the order of nind_list (increasing neighbour rank), and the arrays of the
+        matrix share memory with weights whenever possible. In the symmetrized graph, the entry (j,i) of an edge (i,j)
+        whose reverse is not in the DNG takes the weight of (i,j).
+        """
+        graph = sparse.csr_matrix(
+            (weights, self.nind_list[:, 1], self.nind_iptr), shape=(self.N, self.N)
+        )
+
+        if symmetrize:
+            pattern = sparse.csr_matrix(
+                (np.ones(self.nspar), self.nind_list[:, 1], self.nind_iptr),
+                shape=(self.N, self.N),
+            )
+            graph_t = graph.T.tocsr()
+            # reverse edges not in the DNG
+            graph = graph + (graph_t - graph_t.multiply(pattern))
+
+        return graph
+
     def compute_neigh_vector_diffs(self):
         """Compute the vector differences from each point to its kstar nearest neighbors.
 
@@ -233,16 +314,12 @@ class NeighGraph(KStar):
             print("Computation of the numbers of common neighbours started")
 
         sec = time.time()
+        self.common_neighs_array, _ = cgr.return_common_neighs(
+            self.kstar, self.dist_indices, self.nind_list, 0, self.n_jobs
+        )
         if comp_common_neighs_mat is True:
-            (
-                self.common_neighs_array,
-                self.common_neighs_mat,
-            ) = cgr.return_common_neighs_comp_mat(
-                self.kstar, self.dist_indices, self.nind_list
-            )
-        else:
-            self.common_neighs_array = cgr.return_common_neighs(
-                self.kstar, self.dist_indices, self.nind_list
+            self.common_neighs_mat = self._return_sparse_graph(
+                self.common_neighs_array, symmetrize=True
             )
         sec2 = time.time()
         if self.verb:
@@ -268,29 +345,28 @@ class NeighGraph(KStar):
             "squared geometric": p_1,2 = (k_1,2)^2 / (k_1 * k_2), i.e. the square of the "geometric" version
         """
 
-        # check or compute common_neighs
-        if self.common_neighs_array is None:
-            self.compute_common_neighs()
+        methods = ["jaccard", "geometric", "squared_geometric"]
+        if method not in methods:
+            raise ValueError("method not recognised")
+
+        # compute neighbour indices
+        if self.nind_list is None:
+            self.compute_neigh_indices()
+
         if self.verb:
             print("Estimation of the neighbourhood similarity index started")
         sec = time.time()
-        k1 = self.kstar[self.nind_list[:, 0]]
-        k2 = self.kstar[self.nind_list[:, 1]]
-        # method to estimate neighbourhood similarity index
-        if method == "jaccard":
-            self.neigh_similarity_index = (
-                self.common_neighs_array * 1.0 / (k1 + k2 - self.common_neighs_array)
-            )
-        elif method == "geometric":
-            self.neigh_similarity_index = (
-                self.common_neighs_array * 1.0 / np.sqrt(k1 * k2)
-            )
-        elif method == "squared_geometric":
-            self.neigh_similarity_index = (
-                self.common_neighs_array * self.common_neighs_array * 1.0 / (k1 * k2)
-            )
-        else:
-            raise ValueError("method not recognised")
+        # count the common neighbours and compute the similarity index in a single pass
+        (
+            self.common_neighs_array,
+            self.neigh_similarity_index,
+        ) = cgr.return_common_neighs(
+            self.kstar,
+            self.dist_indices,
+            self.nind_list,
+            methods.index(method),
+            self.n_jobs,
+        )
 
         sec2 = time.time()
         if self.verb:
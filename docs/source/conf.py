@@ -87,7 +87,6 @@ html_theme_options = {
 
 autodoc_mock_imports = [
     "dadapy._cython.cython_clustering",
-    "dadapy._cython.cython_clustering_v2",
     "dadapy._cython.cython_maximum_likelihood_opt",
     "dadapy._cython.cython_maximum_likelihood_opt_full",
     "dadapy._cython.cython_density",
@@ -95,4 +94,5 @@ autodoc_mock_imports = [
     "dadapy._cython.cython_distances",
     "dadapy._cython.cython_grads",
     "dadapy._cython.cython_differentiable_imbalance",
+    "dadapy._cython.cython_imbalance",
 ]
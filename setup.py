@@ -1,4 +1,4 @@
-import os
+import subprocess
 
 from setuptools import Extension, setup
 
@@ -18,8 +18,8 @@ ext_modules = []
 
 ext_modules += [
     Extension(
-        "dadapy._cython.cython_clustering",
-        sources=["dadapy/_cython/cython_clustering.c"],
+        "dadapy._cython.cython_maximum_likelihood_opt",
+        sources=["dadapy/_cython/cython_maximum_likelihood_opt.c"],
         include_dirs=[get_numpy_include()],
         define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
     )
@@ -27,69 +27,57 @@ ext_modules += [
 
 ext_modules += [
     Extension(
-        "dadapy._cython.cython_clustering_v2",
-        sources=["dadapy/_cython/cython_clustering_v2.c"],
+        "dadapy._cython.cython_maximum_likelihood_opt_full",
+        sources=["dadapy/_cython/cython_maximum_likelihood_opt_full.c"],
         include_dirs=[get_numpy_include()],
         define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
     )
 ]
 
+
 ext_modules += [
     Extension(
-        "dadapy._cython.cython_maximum_likelihood_opt",
-        sources=["dadapy/_cython/cython_maximum_likelihood_opt.c"],
+        "dadapy._cython.cython_overlap",
+        sources=["dadapy/_cython/cython_overlap.c"],
         include_dirs=[get_numpy_include()],
         define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
     )
 ]
 
-ext_modules += [
+exts_parallel = [
     Extension(
-        "dadapy._cython.cython_maximum_likelihood_opt_full",
-        sources=["dadapy/_cython/cython_maximum_likelihood_opt_full.c"],
+        "dadapy._cython.cython_clustering",
+        sources=["dadapy/_cython/cython_clustering.c"],
         include_dirs=[get_numpy_include()],
         define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
-    )
-]
-
-
-ext_modules += [
+    ),
     Extension(
         "dadapy._cython.cython_density",
         sources=["dadapy/_cython/cython_density.c"],
         include_dirs=[get_numpy_include()],
         define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
-    )
-]
-
-ext_modules += [
+    ),
     Extension(
-        "dadapy._cython.cython_overlap",
-        sources=["dadapy/_cython/cython_overlap.c"],
+        "dadapy._cython.cython_distances",
+        sources=["dadapy/_cython/cython_distances.c"],
         include_dirs=[get_numpy_include()],
         define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
-    )
-]
-
-ext_modules += [
+    ),
     Extension(
         "dadapy._cython.cython_grads",
         sources=["dadapy/_cython/cython_grads.c"],
         include_dirs=[get_numpy_include()],
         define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
-    )
-]
-
-exts_parallel = [
+    ),
     Extension(
-        "dadapy._cython.cython_distances",
-        sources=["dadapy/_cython/cython_distances.c"],
+        "dadapy._cython.cython_differentiable_imbalance",
+        sources=["dadapy/_cython/cython_differentiable_imbalance.c"],
         include_dirs=[get_numpy_include()],
         define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
     ),
     Extension(
-        "dadapy._cython.cython_differentiable_imbalance",
-        sources=["dadapy/_cython/cython_differentiable_imbalance.c"],
+        "dadapy._cython.cython_imbalance",
+        sources=["dadapy/_cython/cython_imbalance.c"],
         include_dirs=[get_numpy_include()],
         define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
     ),
@@ -98,10 +86,24 @@ exts_parallel = [
 extra_compile_args = (["-fopenmp"],)
 extra_link_args = (["-fopenmp"],)
 
-# Check if the '-fopenmp' flag is supported
-command = 'gcc -fopenmp -E - < /dev/null > /dev/null 2>&1 && echo "OpenMP supported" || echo "OpenMP not supported"'
 
-if os.system(command) == "OpenMP supported":
+def openmp_supported():
+    """Check if the '-fopenmp' flag is supported by the compiler."""
+    try:
+        return (
+            subprocess.run(
+                ["gcc", "-fopenmp", "-E", "-"],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            ).returncode
+            == 0
+        )
+    except OSError:
+        return False
+
+
+if openmp_supported():
     # If '-fopenmp' is supported, add the extra compile and link arguments
     # Installing cython_distances using OpenMP
     for ext_parallel in exts_parallel:
@@ -140,3 +140,95 @@ def test_clustering_ADP_cython():
     assert cl.N_clusters == 2
 
     assert (cl.cluster_assignment == expected_cluster_assignment).all()
+
+
+def test_clustering_ADP_path():
+    """Test that the ADP path reproduces ADP clustering at each Z."""
+    filename = os.path.join(
+        os.path.split(__file__)[0], "../../examples/datasets/Fig1.dat"
+    )
+    cl = Clustering(coordinates=np.genfromtxt(filename)[:2000])
+    cl.compute_density_PAk()
+
+    Zs = [0.5, 1.65, 4.0]
+    N_clusters, cluster_assignments = cl.compute_clustering_ADP_path(Zs, halo=True)
+
+    for iz, Z in enumerate(Zs):
+        cluster_assignment = cl.compute_clustering_ADP(Z=Z, halo=True)
+        assert N_clusters[iz] == cl.N_clusters
+        assert (cluster_assignments[iz] == cluster_assignment).all()
+
+    # large errors at the low density points make the density shift depend strongly on Z
+    cl.log_den_err = cl.log_den_err + 10.0 * (cl.log_den < np.median(cl.log_den))
+    Zs = [0.0, 0.3, 1.0, 3.0]
+    N_clusters, cluster_assignments = cl.compute_clustering_ADP_path(Zs)
+
+    for iz, Z in enumerate(Zs):
+        cluster_assignment = cl.compute_clustering_ADP(Z=Z)
+        assert N_clusters[iz] == cl.N_clusters
+        assert (cluster_assignments[iz] == cluster_assignment).all()
+
+
+def test_predict_clusters():
+    """Test the assignment of new points to the ADP clusters."""
+    filename = os.path.join(
+        os.path.split(__file__)[0], "../../examples/datasets/Fig1.dat"
+    )
+    X_fig1 = np.genfromtxt(filename)
+    cl = Clustering(coordinates=X_fig1[:2000])
+    _ = cl.compute_clustering_ADP(Z=1.65)
+
+    X_new = X_fig1[2000:3000]
+    cluster_assignment = cl.predict_clusters(X_new)
+
+    assert cluster_assignment.shape == (1000,)
+    assert (cluster_assignment >= 0).all()
+    assert (cluster_assignment < cl.N_clusters).all()
+
+    # new points are mostly assigned to the cluster of their nearest neighbour
+    cross_dist_indices = cl._return_cross_nn_distances(X_new)[1]
+    nn_assignment = cl.cluster_assignment[cross_dist_indices[:, 0]]
+    assert np.mean(cluster_assignment == nn_assignment) > 0.95
+
+    assert (cl.predict_clusters(X_new, chunk_size=97) == cluster_assignment).all()
+
+    halo_assignment = cl.predict_clusters(X_new, halo=True)
+    is_core = halo_assignment != -1
+    assert (halo_assignment[is_core] == cluster_assignment[is_core]).all()
+
+
+def test_clustering_ADP_n_jobs():
+    """Test that ADP clustering does not depend on the number of threads."""
+    filename = os.path.join(
+        os.path.split(__file__)[0], "../../examples/datasets/Fig1.dat"
+    )
+    X_fig1 = np.genfromtxt(filename)[:3000]
+
+    cl_serial = Clustering(coordinates=X_fig1, n_jobs=1)
+    cluster_assignment_serial = cl_serial.compute_clustering_ADP(Z=1.0, halo=True)
+
+    cl = Clustering(coordinates=X_fig1, n_jobs=4)
+    cluster_assignment = cl.compute_clustering_ADP(Z=1.0, halo=True)
+
+    assert cl.N_clusters == cl_serial.N_clusters
+    assert (cluster_assignment == cluster_assignment_serial).all()
+    assert np.array_equal(cl.bord_indices, cl_serial.bord_indices)
+    assert np.allclose(cl.log_den_bord, cl_serial.log_den_bord)
+
+
+def test_reverse_neighbour_index_cache():
+    """Test that the reverse neighbour index is shared by the ADP methods and follows kstar."""
+    X = np.load(filename)
+
+    cl = Clustering(coordinates=X)
+    cl.compute_clustering_ADP(Z=1.5)
+    rev_nind = cl._return_reverse_neigh_ind()
+    assert rev_nind[0] is cl._return_reverse_neigh_ind()[0]
+
+    cl.compute_clustering_ADP_path([1.5, 2.5])
+    assert cl._return_reverse_neigh_ind()[0] is rev_nind[0]
+
+    cl.set_kstar(5)
+    rev_nind_list, rev_nind_iptr = cl._return_reverse_neigh_ind()
+    assert rev_nind_list is not rev_nind[0]
+    assert rev_nind_iptr[-1] == 5 * cl.N
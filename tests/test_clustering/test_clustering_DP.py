@@ -18,6 +18,7 @@
 import os
 
 import numpy as np
+import pytest
 
 from dadapy import Clustering
 
@@ -149,3 +150,57 @@ def test_compute_cluster_DP():
     cl.compute_DecGraph()
     _ = cl.compute_clustering_DP(dens_cut=-3.0, delta_cut=3.0)
     assert (cl.cluster_assignment == expected_cluster_assignment).all()
+
+
+def test_compute_DecGraph_brute_force():
+    """Test compute_DecGraph against a brute force search of the nearest denser point."""
+    rng = np.random.default_rng(0)
+    Y = rng.normal(size=(300, 2))
+
+    cl = Clustering(coordinates=Y, maxk=5)
+    cl.compute_density_kNN(k=3)
+    cl.compute_DecGraph()
+
+    dmat = np.linalg.norm(Y[:, None, :] - Y[None, :, :], axis=-1)
+    imax = np.argmax(cl.log_den)
+    for i in range(Y.shape[0]):
+        if i == imax:
+            continue
+        denser = np.nonzero(cl.log_den > cl.log_den[i])[0]
+        j = denser[np.argmin(dmat[i, denser])]
+        assert cl.ref[i] == j
+        assert cl.delta[i] == pytest.approx(dmat[i, j])
+
+
+def test_compute_cluster_DP_sequential():
+    """Test the DP clustering against the assignment of points in order of decreasing density."""
+    rng = np.random.default_rng(1)
+    Y = np.concatenate([rng.normal(size=(300, 2)), rng.normal(size=(300, 2)) + 4])
+
+    cl = Clustering(coordinates=Y)
+    cl.compute_density_PAk()
+    cl.compute_DecGraph()
+
+    dens_cut, delta_cut = np.median(cl.log_den), 1.5
+    cluster_assignment = cl.compute_clustering_DP(
+        dens_cut=dens_cut, delta_cut=delta_cut
+    )
+
+    expected = np.zeros(cl.N, dtype=int)
+    ncluster = -1
+    for j in np.argsort(-cl.log_den):
+        if cl.log_den[j] > dens_cut and cl.delta[j] > delta_cut:
+            ncluster += 1
+            expected[j] = ncluster
+        else:
+            expected[j] = expected[cl.ref[j]]
+
+    assert cl.N_clusters == ncluster + 1 == 2
+    assert (cluster_assignment == expected).all()
+
+    halo_assignment = cl.compute_clustering_DP(
+        dens_cut=dens_cut, delta_cut=delta_cut, halo=True
+    )
+    is_core = halo_assignment != -1
+    assert (halo_assignment[is_core] == expected[is_core]).all()
+    assert not is_core.all()
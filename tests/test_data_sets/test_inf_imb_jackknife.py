@@ -46,3 +46,21 @@ def test_information_imbalance_jackknife():
 
     assert np.isclose(mean, 1, atol=3 * std)
     assert np.isclose(mean, 1.0176471788593)
+
+
+def test_information_imbalance_jackknife_checkpoints(tmp_path):
+    """Test that all the imbalances are written to file across checkpoints."""
+    X = np.load(filename)[:100, :]
+
+    d1 = MetricComparisons(coordinates=X[:, [0]], maxk=20)
+    d2 = MetricComparisons(coordinates=X[:, [1]], maxk=20)
+
+    file_name = str(tmp_path / "jackknife.txt")
+    mean, std = DataSets.return_inf_imb_jackknife_d1_to_d2(
+        d1, d2, file_name=file_name, n=50, checkpoint_every=20
+    )
+
+    imbalances = np.loadtxt(file_name)
+    assert imbalances.shape == (50,)
+    assert np.isclose(mean, np.mean(imbalances))
+    assert np.isclose(std, np.std(imbalances))
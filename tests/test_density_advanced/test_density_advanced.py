@@ -81,7 +81,7 @@ def test_compute_pearson():
     da.set_kstar(2)
     da.compute_pearson(comp_p_mat=True)
     assert np.allclose(da.pearson_array, expected_pearson_array)
-    assert np.allclose(da.pearson_mat, expected_pearson_mat)
+    assert np.allclose(da.pearson_mat.toarray(), expected_pearson_mat)
 
 
 def test_compute_deltaFs():
@@ -103,6 +103,27 @@ def test_compute_deltaFs():
     assert np.allclose(da.Fij_var_array, expected_Fij_var_array)
 
 
+def test_compute_deltaFs_covmat():
+    """Test that the deltaFs variances match the ones from the gradient covariance matrices."""
+    X = np.random.default_rng(0).normal(size=(200, 4))
+
+    da = DensityAdvanced(coordinates=X, maxk=15, n_jobs=2)
+    da.compute_distances()
+    da.set_id(4)
+    da.compute_deltaFs()
+    da.compute_grads(comp_covmat=True)
+
+    r = da.neigh_vector_diffs
+    var = [
+        np.einsum("ij, ijk, ik -> i", r, da.grads_covmat[da.nind_list[:, k]], r)
+        for k in range(2)
+    ]
+    expected_Fij_var_array = 0.25 * (
+        var[0] + var[1] + 2 * da.pearson_array * np.sqrt(var[0] * var[1])
+    )
+    assert np.allclose(da.Fij_var_array, expected_Fij_var_array)
+
+
 expected_density_BMTI = np.array(
     [
         -1.744691095848123652,
@@ -146,3 +167,51 @@ def test_density_BMTI():
     da.compute_density_BMTI(alpha=0.99)
 
     assert np.allclose(da.log_den, expected_density_BMTI)
+
+
+def test_deltaFs_inv_cross_covariance():
+    """Test the LSDI inverse cross-covariance against a dense evaluation."""
+    filename = os.path.join(os.path.split(__file__)[0], "../2gaussians_in_2d.npy")
+
+    X = np.load(filename)[:40]
+
+    da = DensityAdvanced(coordinates=X, maxk=8, n_jobs=2)
+    da.compute_distances()
+    da.set_id(2)
+    da.compute_deltaFs_inv_cross_covariance()
+
+    p_mat = da.pearson_mat.toarray()
+    cov = da.grads_covmat
+    r = da.neigh_vector_diffs
+    denom = da.Fij_var_array**2
+    for a, (i, j) in enumerate(da.nind_list):
+        for b, (l, m) in enumerate(da.nind_list[:a]):
+            tmp = {x: r[a] @ cov[x] @ r[b] for x in (i, j, l, m)}
+            gamma = sum(
+                p_mat[x, y] * np.sqrt(abs(tmp[x] * tmp[y]))
+                for x in (i, j)
+                for y in (l, m)
+                if p_mat[x, y] > 0
+            )
+            denom[a] += gamma**2 / 16
+            denom[b] += gamma**2 / 16
+
+    assert np.allclose(da.inv_deltaFs_cov, da.Fij_var_array / denom)
+
+
+def test_density_BMTI_cg():
+    """Test the density_BMTI method with the conjugate gradient solver."""
+    filename = os.path.join(os.path.split(__file__)[0], "../2gaussians_in_2d.npy")
+
+    X = np.load(filename)
+
+    da = DensityAdvanced(coordinates=X, maxk=10)
+    da.compute_distances()
+    da.set_id(2)
+    da.compute_density_BMTI(alpha=0.99, comp_log_den_err=True)
+    log_den, log_den_err = da.log_den, da.log_den_err
+
+    da.compute_density_BMTI(alpha=0.99, comp_log_den_err=True, solver="cg", n_probes=90)
+
+    assert np.allclose(da.log_den, log_den)
+    assert np.median(np.abs(da.log_den_err / log_den_err - 1)) < 0.2
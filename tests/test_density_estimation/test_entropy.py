@@ -0,0 +1,65 @@
+# Copyright 2021-2023 The DADApy Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""Module for testing the entropy and free energy profile estimators."""
+
+import os
+
+import numpy as np
+import pytest
+
+from dadapy import DensityEstimation
+
+
+def test_entropy_bootstrap():
+    """Test that the bootstrap entropy is coherent with return_entropy."""
+    filename = os.path.join(os.path.split(__file__)[0], "../2gaussians_in_2d.npy")
+
+    X = np.load(filename)
+
+    de = DensityEstimation(coordinates=X)
+    de.compute_density_PAk()
+
+    H, H_err = de.return_entropy_bootstrap(n_boot=50, chunk_size=17)
+
+    assert H == pytest.approx(de.return_entropy())
+    assert 0 < H_err < 1
+
+
+def test_free_energy_profile():
+    """Test that the free energy profile is minus the log of the histogram density."""
+    filename = os.path.join(os.path.split(__file__)[0], "../2gaussians_in_2d.npy")
+
+    X = np.load(filename)
+
+    de = DensityEstimation(coordinates=X)
+
+    F, F_err, counts, edges = de.return_free_energy_profile(
+        X[:, 0], bins=np.int64(5), n_boot=50, chunk_size=17
+    )
+
+    hist, hist_edges = np.histogram(X[:, 0], bins=5, density=True)
+
+    assert np.sum(counts) == X.shape[0]
+    assert np.allclose(edges[0], hist_edges)
+    assert F == pytest.approx(-np.log(hist))
+    assert np.all(F_err > 0)
+
+    F2d, _, counts2d, edges2d = de.return_free_energy_profile(X, bins=[3, 4], n_boot=10)
+    hist2d, _ = np.histogramdd(X, bins=edges2d, density=True)
+
+    assert F2d.shape == (3, 4)
+    assert np.sum(counts2d) == X.shape[0]
+    assert np.allclose(F2d[counts2d > 0], -np.log(hist2d[counts2d > 0]))
@@ -42,3 +42,40 @@ def test_density_estimation_kNN():
     expected_diff = np.array([np.log(k) - np.log(k - 1)] * len(diff))
 
     assert diff == pytest.approx(expected_diff, abs=1e-6)
+
+
+def test_density_estimation_PAk():
+    """Test the PAk interpolator is coherent with the PAk estimator."""
+    filename = os.path.join(os.path.split(__file__)[0], "../2gaussians_in_2d.npy")
+
+    X = np.load(filename)
+
+    de = DensityEstimation(coordinates=X, n_jobs=2)
+
+    computed, _ = de.compute_density_PAk()
+
+    interpolated, interpolated_err = de.return_interpolated_density_PAk(X + 1e-3)
+
+    assert interpolated.shape == (X.shape[0],)
+    assert np.all(np.isfinite(interpolated_err))
+    assert interpolated == pytest.approx(computed, abs=0.1)
+
+
+def test_cross_nn_index_reset():
+    """Test that the cached neighbour search index follows the metric and the coordinates."""
+    X = np.array([[0.0, 0.0], [0.0, 0.0], [1.0, 0.0], [0.0, 2.0], [3.0, 3.0]])
+    X_new = np.array([[0.9, 0.9]])
+
+    de = DensityEstimation(coordinates=X, maxk=3)
+    distances, _ = de._return_cross_nn_distances(X_new)
+    assert distances[0, 0] == pytest.approx(np.sqrt(0.82))
+
+    de.compute_distances(metric="manhattan")
+    distances, _ = de._return_cross_nn_distances(X_new)
+    assert distances[0, 0] == pytest.approx(1.0)
+
+    de.compute_distances(metric="euclidean")
+    de.remove_identical_points()
+    distances, _ = de._return_cross_nn_distances(X_new)
+    expected = np.sort(np.linalg.norm(np.unique(X, axis=0) - X_new, axis=1))[:3]
+    assert distances[0] == pytest.approx(expected)
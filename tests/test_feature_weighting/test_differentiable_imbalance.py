@@ -140,3 +140,149 @@ def test_py_kernel_gradient():
             # TODO: Is it okay for these to be so "far apart".
             assert cython_grad.shape[0] == n_dim
             assert np.allclose(cython_grad, py_grad, atol=1e-1, rtol=1e-2)
+
+
+def test_optimize_dii_sparse():
+    """Test the truncated-softmax optimization against the dense one when no neighbour is truncated."""
+    n_data = 60
+    data = rng.random((n_data, 4), dtype=dii.CYTHON_DTYPE)
+    groundtruth = data[:, :2] + 0.05 * rng.random((n_data, 2))
+    for period in [None, np.array([0.0, 1.0, 0.0, 1.0])]:
+        weights_dense, diis_dense, _ = dii._optimize_dii(
+            groundtruth, data, 1, np.ones(4), n_epochs=10, l_rate=1.0, period=period
+        )
+        weights_sparse, diis_sparse, _ = dii._optimize_dii_sparse(
+            groundtruth,
+            data,
+            1,
+            np.ones(4),
+            n_epochs=10,
+            l_rate=1.0,
+            period=period,
+            maxk_groundtruth=n_data - 1,
+            k=n_data - 1,
+        )
+        assert np.allclose(diis_sparse, diis_dense)
+        assert np.allclose(weights_sparse, weights_dense)
+
+        # truncated softmax with reused neighbour lists stays close to the dense result
+        _, diis_truncated, _ = dii._optimize_dii_sparse(
+            groundtruth,
+            data,
+            1,
+            np.ones(4),
+            n_epochs=10,
+            l_rate=1.0,
+            period=period,
+            maxk_groundtruth=n_data - 1,
+            k=4,
+            tol=1e-4,
+        )
+        assert np.allclose(diis_truncated, diis_dense, atol=1e-3)
+
+
+def test_dii_rows():
+    """Test the anchor-row DII estimate against the full DII when all points are anchors."""
+    n_data = 50
+    data = rng.random((n_data, 4), dtype=dii.CYTHON_DTYPE)
+    groundtruth = data[:, :2]
+    weights = rng.random(4) + 0.5
+    anchors = np.arange(n_data)
+    dist_mat = dii._return_full_dist_matrix(data * weights, period=None, n_jobs=1)
+    ranks = dii._return_full_rank_matrix(groundtruth, n_jobs=1)
+    rank_rows = dii._return_rank_rows(groundtruth, anchors, n_jobs=1)
+    assert np.array_equal(rank_rows, ranks)
+
+    dist_rows = c_dii.return_distance_rows_cython(
+        data, weights, np.zeros(4), anchors, 1, False
+    )
+    dii_rows, gradient_rows = c_dii.return_dii_rows_cython(
+        dist_rows, data, anchors, rank_rows, weights, 0.1, np.zeros(4), 1, False
+    )
+    assert np.isclose(dii_rows, dii._return_dii(dist_mat, ranks, 0.1))
+    assert np.allclose(
+        gradient_rows,
+        dii._return_dii_gradient(dist_mat, data, ranks, weights, 0.1, n_jobs=1),
+    )
+
+
+def test_optimize_dii_stochastic():
+    """Test that the minibatch optimization switches off the features unrelated to the groundtruth."""
+    data = rng.random((300, 4), dtype=dii.CYTHON_DTYPE)
+    weights, diis, _ = dii._optimize_dii_stochastic(
+        data[:, :2], data, 1, np.ones(4), n_epochs=300, batch_size=50, seed=0
+    )
+    assert weights.shape[0] == diis.shape[0]
+    assert diis[-1] < diis[0]
+    assert np.all(weights[-1, 2:] < 0.5 * weights[-1, :2].min())
+
+    # the histories end at the lowest validation DII, also without early stopping
+    for patience in [50, 100]:
+        _, diis, _ = dii._optimize_dii_stochastic(
+            data[:, :2],
+            data,
+            1,
+            np.ones(4),
+            n_epochs=60,
+            batch_size=50,
+            patience=patience,
+            seed=0,
+        )
+        assert diis[-1] == diis.min()
+
+
+def test_compact_rank_matrix(tmp_path):
+    """Test the compact rank matrix against rankdata and its use in the gradient kernel."""
+    from scipy.stats import rankdata
+
+    n_data = 80
+    groundtruth = rng.random((n_data, 3), dtype=dii.CYTHON_DTYPE)
+    data = rng.random((n_data, 4), dtype=dii.CYTHON_DTYPE)
+    weights = np.ones(4)
+    for period in [None, np.array([1.0, 0.0, 1.0])]:
+        ranks = dii._return_full_rank_matrix(groundtruth, n_jobs=2, period=period)
+        dist_mat = dii._return_full_dist_matrix(groundtruth, n_jobs=1, period=period)
+        assert ranks.dtype == np.uint16
+        assert np.array_equal(
+            ranks, rankdata(dist_mat, method="average", axis=1).astype(int)
+        )
+
+    memmap_file = tmp_path / "ranks.npy"
+    ranks = dii._return_full_rank_matrix(
+        groundtruth, n_jobs=1, memmap_file=str(memmap_file)
+    )
+    assert np.array_equal(np.load(memmap_file), ranks)
+
+    dist_mat = dii._return_full_dist_matrix(data, n_jobs=1)
+    gradient = dii._return_dii_gradient(dist_mat, data, ranks, weights, 0.1, n_jobs=1)
+    for dtype in [np.uint32, int]:
+        assert np.allclose(
+            dii._return_dii_gradient(
+                dist_mat, data, ranks.astype(dtype), weights, 0.1, n_jobs=1
+            ),
+            gradient,
+        )
+
+
+def test_optimize_dii_cache_distances():
+    """Test that the optimization from cached feature differences reproduces the standard one."""
+    data = rng.random((60, 4), dtype=dii.CYTHON_DTYPE)
+    groundtruth = data[:, :2]
+    for period, lambd in it.product(
+        [None, np.array([0.0, 1.0, 0.0, 1.0])], [None, 0.1]
+    ):
+        weights, diis, _ = dii._optimize_dii(
+            groundtruth, data, 1, np.ones(4), lambd=lambd, l_rate=1.0, period=period
+        )
+        weights_cached, diis_cached, _ = dii._optimize_dii(
+            groundtruth,
+            data,
+            1,
+            np.ones(4),
+            lambd=lambd,
+            l_rate=1.0,
+            period=period,
+            cache_distances=True,
+        )
+        assert np.allclose(diis_cached, diis)
+        assert np.allclose(weights_cached, weights)
@@ -16,11 +16,13 @@
 """Module for testing selection algorithms utilising differentiable information imbalance."""
 
 import itertools
+import warnings
 
 import numpy as np
 import pytest
 
 from dadapy import Data, FeatureWeighting
+from dadapy._utils import differentiable_imbalance as dii
 
 rng = np.random.default_rng()
 
@@ -75,6 +77,30 @@ def test_maxk_warning():
         feature_selection.return_dii_gradient(Data(data), weights=np.zeros(5))
 
 
+def test_maxk_warning_sparse():
+    """Make sure the sparse DII optimization, which uses maxk, does not warn about it."""
+    data = rng.random((20, 5))
+    feature_selection = FeatureWeighting(data, maxk=3)
+
+    with warnings.catch_warnings():
+        warnings.filterwarnings("error", message="maxk option")
+        feature_selection.return_weights_optimize_dii(
+            Data(data, maxk=10), n_epochs=2, sparse=True, k=5
+        )
+    assert feature_selection._maxk_warning
+
+    # the minibatch optimization does not use maxk either
+    with warnings.catch_warnings():
+        warnings.filterwarnings("error", message="maxk option")
+        feature_selection.return_weights_optimize_dii_stochastic(
+            Data(data), n_epochs=2, batch_size=5
+        )
+    assert feature_selection._maxk_warning
+
+    with pytest.warns(UserWarning, match="maxk option"):
+        feature_selection.return_dii_gradient(Data(data), weights=np.ones(5))
+
+
 def test_dii_gradient():
     """Test whether cython gradient matches much slower numpy gradient."""
     data = rng.random((10, 5))
@@ -232,6 +258,86 @@ def test_eliminate_backward_greedy_kernel_imbalance():
     assert feature_selection.history["weights_per_epoch"].shape[2] == len(weights_array)
 
 
+def test_eliminate_backward_greedy_beam(tmp_path):
+    """Test the candidate beam against the backward greedy elimination, and the resumption from a checkpoint."""
+    data = rng.random((30, 5))
+    weights_array = np.array([1, 1, 1e-2, 1e-2, 1e-2])
+    target_data = data * weights_array
+    feature_selection = FeatureWeighting(data, period=None, n_jobs=2)
+
+    n_epochs = 10
+    diis_greedy, weights_greedy = (
+        feature_selection.return_backward_greedy_dii_elimination(
+            target_data=Data(target_data), n_epochs=n_epochs, learning_rate=0.1
+        )
+    )
+    diis_beam, weights_beam = (
+        feature_selection.return_backward_greedy_dii_elimination_beam(
+            target_data=Data(target_data),
+            n_epochs=n_epochs,
+            learning_rate=0.1,
+            n_candidates=1,
+        )
+    )
+    assert np.allclose(diis_beam, diis_greedy)
+    assert np.allclose(weights_beam, weights_greedy)
+
+    checkpoint_file = str(tmp_path / "beam.npz")
+    diis_beam, weights_beam = (
+        feature_selection.return_backward_greedy_dii_elimination_beam(
+            target_data=Data(target_data),
+            n_epochs=n_epochs,
+            learning_rate=0.1,
+            checkpoint_file=checkpoint_file,
+        )
+    )
+    assert feature_selection.history["eliminated_features"].shape[0] == 4
+    # the first elimination of the greedy search is one of the n_jobs default candidates
+    assert diis_beam[1] <= diis_greedy[1] + 1e-12
+
+    # interrupt the elimination after two steps and resume it
+    checkpoint = dict(np.load(checkpoint_file))
+    checkpoint["weights_per_epoch"][3:] = np.nan
+    checkpoint["imbalances_per_epoch"][3:] = np.nan
+    checkpoint["eliminated_features"][2:] = -1
+    np.savez(checkpoint_file, **checkpoint)
+    diis_resumed, weights_resumed = (
+        feature_selection.return_backward_greedy_dii_elimination_beam(
+            target_data=Data(target_data),
+            n_epochs=n_epochs,
+            checkpoint_file=checkpoint_file,
+        )
+    )
+    assert np.allclose(diis_resumed, diis_beam)
+    assert np.allclose(weights_resumed, weights_beam)
+
+    # a checkpoint of a run with different settings or target is not resumed
+    for kwargs in [
+        {"constrain": True},
+        {"n_candidates": 3},
+        {"lambd": 0.1},
+        {"learning_rate": 0.2},
+    ]:
+        with pytest.raises(ValueError):
+            feature_selection.return_backward_greedy_dii_elimination_beam(
+                target_data=Data(target_data),
+                n_epochs=n_epochs,
+                checkpoint_file=checkpoint_file,
+                **kwargs,
+            )
+    with pytest.raises(ValueError):
+        feature_selection.return_backward_greedy_dii_elimination_beam(
+            target_data=Data(data), n_epochs=n_epochs, checkpoint_file=checkpoint_file
+        )
+    with pytest.raises(ValueError):
+        FeatureWeighting(data, period=1.0).return_backward_greedy_dii_elimination_beam(
+            target_data=Data(target_data),
+            n_epochs=n_epochs,
+            n_candidates=2,
+            checkpoint_file=checkpoint_file,
+        )
+
+
 def test_search_lasso_optimization_kernel_imbalance():
     """Test lasso optimization and dictionary entries.
 
@@ -274,3 +380,88 @@ def test_search_lasso_optimization_kernel_imbalance():
             == l1_penalties_opt_per_nfeatures.shape[0]
         )
         assert weights_opt_per_nfeatures.shape[1] == target_data.shape[1]
+
+
+def test_search_lasso_optimization_path():
+    """Test the regularization path against independent optimizations and its use in the lasso search."""
+    data = rng.random((40, 5))
+    weights_array = np.array([1, 1, 1e-2, 1e-2, 1e-2])
+    target_data = data * weights_array
+    l1_penalties = [1e-1, 0.0, 1e-2]
+    n_epochs = 10
+
+    # with one penalty per segment, every optimization starts from the initial weights
+    weights, diis, _ = dii._optimize_dii_lasso_path(
+        target_data,
+        data,
+        np.ones(5),
+        l1_penalties,
+        1,
+        n_epochs=n_epochs,
+        l_rate=0.1,
+        n_processes=len(l1_penalties),
+    )
+    for i, l1_penalty in enumerate(l1_penalties):
+        weights_i, diis_i, _ = dii._optimize_dii(
+            target_data,
+            data,
+            1,
+            np.ones(5),
+            n_epochs=n_epochs,
+            l_rate=0.1,
+            l1_penalty=l1_penalty,
+        )
+        assert np.allclose(weights[i], weights_i)
+        assert np.allclose(diis[i], diis_i)
+
+    # with one segment, each optimization continues from the solution of the weaker penalty, and stops early
+    # when its loss has converged
+    rank_matrix_B = dii._return_full_rank_matrix(target_data, 1)
+    results = [
+        dii._optimize_dii_lasso_segment(
+            data,
+            rank_matrix_B,
+            np.ones(5),
+            [0.0, 1e-2, 2e-2],
+            1,
+            n_epochs=100,
+            l_rate=0.1,
+            tol=tol,
+        )
+        for tol in [1e-3, None]
+    ]
+    (weights, diis, l1_terms), (_, diis_full, l1_terms_full) = results
+    assert np.array_equal(weights[1:, 0], weights[:-1, -1])
+    assert (weights[1:, -2] == weights[1:, -1]).all()
+    assert not (weights[0, -2] == weights[0, -1]).all()
+    assert np.allclose(
+        diis[:, -1] + l1_terms[:, -1],
+        diis_full[:, -1] + l1_terms_full[:, -1],
+        rtol=1e-2,
+    )
+
+    feature_selection = FeatureWeighting(data, period=None)
+    for n_processes, refine in itertools.product([1, 2], [True, False]):
+        (
+            num_nonzero_features,
+            l1_penalties_opt_per_nfeatures,
+            dii_opt_per_nfeatures,
+            weights_opt_per_nfeatures,
+        ) = feature_selection.return_lasso_optimization_dii_search(
+            target_data=Data(target_data),
+            n_epochs=n_epochs,
+            learning_rate=0.1,
+            refine=refine,
+            plotlasso=False,
+            path=True,
+            n_processes=n_processes,
+        )
+        assert num_nonzero_features.shape == (len(weights_array),)
+        assert weights_opt_per_nfeatures.shape == (
+            len(weights_array),
+            len(weights_array),
+        )
+        assert (
+            feature_selection.history["weights_per_l1_per_epoch"].shape[0]
+            == feature_selection.history["l1_penalties"].shape[0]
+        )
@@ -64,6 +64,26 @@ def test_information_imbalance_basics():
     assert (imbalances == expected_imb).all()
 
 
+def test_inf_imb_target_selected_coords_shared_memory():
+    """Test that the process-pool batch engine reproduces the in-process results."""
+    X = np.load(filename)
+    coord_list = [[0], [1], [2], [0, 1], [0, 2], [1, 2]]
+
+    imbalances = []
+    for n_jobs in [1, 2]:
+        mc = MetricComparisons(coordinates=X, maxk=50, n_jobs=n_jobs)
+        mc.compute_distances()
+        results = list(
+            mc.iterate_inf_imb_target_selected_coords(mc.dist_indices, coord_list)
+        )
+        assert sorted(result[0] for result in results) == list(range(len(coord_list)))
+        imbalances.append(
+            mc.return_inf_imb_target_selected_coords(mc.dist_indices, coord_list)
+        )
+
+    assert np.array_equal(imbalances[0], imbalances[1])
+
+
 def test_greedy_feature_selection_full():
     """Test that the information imbalance greedy optimisation works correctly."""
     expeted_coords = np.array([0, 1])
@@ -82,6 +102,47 @@ def test_greedy_feature_selection_full():
     assert best_imbalances == pytest.approx(expected_imbalances, abs=0.01)
 
 
+def test_greedy_feature_selection_incremental():
+    """Test that the incremental greedy optimisation matches the nearest neighbour based one."""
+    X = np.load(filename)
+
+    mc = MetricComparisons(coordinates=X, maxk=X.shape[0] - 1)
+    mc.compute_distances()
+
+    results = [
+        mc.greedy_feature_selection_target(
+            mc.dist_indices, n_coords=3, k=1, n_best=2, incremental=incremental
+        )
+        for incremental in [False, True]
+    ]
+
+    assert [sorted(c) for c in results[0][0]] == [sorted(c) for c in results[1][0]]
+    assert np.allclose(results[0][1], results[1][1])
+
+    # pruned tuples have nan imbalances, the others are among the ones of the full search
+    for step_full, step_incremental in zip(results[0][2], results[1][2]):
+        imbalances_incremental = np.array(step_incremental)
+        computed = ~np.isnan(imbalances_incremental).any(axis=0)
+        assert computed.any()
+        assert np.all(np.isin(imbalances_incremental[:, computed], step_full))
+
+    # with fewer neighbours the ranks beyond maxk are random: the first feature, x or y, is a tie
+    mc = MetricComparisons(coordinates=X, maxk=10)
+    mc.compute_distances()
+
+    results = [
+        mc.greedy_feature_selection_target(
+            mc.dist_indices, n_coords=3, k=1, n_best=2, incremental=incremental
+        )
+        for incremental in [False, True]
+    ]
+
+    assert [sorted(c) for c in results[0][0][1:]] == [
+        sorted(c) for c in results[1][0][1:]
+    ]
+    assert np.allclose(results[0][1], results[1][1], atol=0.05)
+
+
 def test_return_inf_imb_matrix_of_coords():
     """Test inf imb calculation of all coordinates to all others."""
     X = np.load(filename)[:, [0, 1]]
@@ -127,6 +188,44 @@ def test_return_inf_imb_causality():
     assert imbalances == pytest.approx(expected_imbalances, abs=0.00001)
 
 
+def test_return_inf_imb_causality_lags():
+    """Test the scan of the causality imbalances over weights and time lags."""
+    traj = np.load(filename_traj)
+    weights = [0, 0.2, 1]
+    taus = [1, 5]
+    k = 5
+    X = traj[:, :3]
+    Y = traj[:, 3:]
+
+    mc = MetricComparisons(maxk=X.shape[0] - 1)
+
+    imbalances = mc.return_inf_imb_causality_lags(
+        cause=X, effect=Y, taus=taus, weights=weights, k=k
+    )
+
+    assert imbalances.shape == (2, 3)
+    assert imbalances[1] == pytest.approx([0.06198, 0.053285, 0.05225], abs=0.00001)
+    for tau, imbalances_tau in zip(taus, imbalances):
+        assert imbalances_tau == pytest.approx(
+            mc.return_inf_imb_causality(
+                cause_present=X[:-tau],
+                effect_present=Y[:-tau],
+                effect_future=Y[tau:],
+                weights=weights,
+                k=k,
+            )
+        )
+
+    # lags streamed to several processes
+    mc = MetricComparisons(maxk=X.shape[0] - 1, n_jobs=4)
+    assert np.array_equal(
+        imbalances,
+        mc.return_inf_imb_causality_lags(
+            cause=X, effect=Y, taus=taus + [3], weights=weights, k=k
+        )[:2],
+    )
+
+
 def test_return_inf_imb_causality_input_rank():
     """Test information imbalance for causality test, implementation with input ranks."""
     traj = np.load(filename_traj)
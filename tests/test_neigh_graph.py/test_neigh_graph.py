@@ -31,6 +31,10 @@ expected_nind_iprt = [0, 1, 2, 3, 4, 5, 6]
 # number of neighbour pairs
 expected_nspar = 6
 
+# reverse neighbourhoods in CSR form
+expected_rev_nind_list = [0, 2, 1, 4, 3, 5]
+expected_rev_nind_iptr = [0, 0, 2, 3, 4, 6, 6]
+
 expected_neigh_dists = np.array([0.15, 0.05, 0.05, 0.09, 0.09, 0.11])
 
 expected_distance_graph = [
@@ -79,6 +83,18 @@ def test_compute_neigh_indices():
     assert neigh_graph.nspar == expected_nspar
 
 
+def test_compute_reverse_neigh_indices():
+    """Test the compute_reverse_neigh_indices method."""
+    # create the NeighGraph object
+    neigh_graph = NeighGraph(coordinates=data)
+    neigh_graph.compute_kstar(Dthr=0.0)
+    # compute the reverse indices of the neighbors
+    neigh_graph.compute_reverse_neigh_indices()
+    # check that the result is correct
+    assert np.array_equal(neigh_graph.rev_nind_list, expected_rev_nind_list)
+    assert np.array_equal(neigh_graph.rev_nind_iptr, expected_rev_nind_iptr)
+
+
 def test_compute_neigh_dists():
     """Test the compute_neigh_dists method."""
     # create the NeighGraph object
@@ -124,7 +140,9 @@ def test_compute_common_neighs():
 
     neigh_graph.compute_common_neighs(comp_common_neighs_mat=True)
     print(neigh_graph.common_neighs_mat)
-    assert np.array_equal(neigh_graph.common_neighs_mat, expected_common_neighs_mat)
+    assert np.array_equal(
+        neigh_graph.common_neighs_mat.toarray(), expected_common_neighs_mat
+    )
 
 
 def test_compute_neigh_similarity_index():
@@ -137,3 +155,30 @@ def test_compute_neigh_similarity_index():
     assert np.allclose(
         neigh_graph.neigh_similarity_index, expected_neigh_similarity_index
     )
+
+
+def test_return_sparse_graphs_symmetrized():
+    """Test the symmetrized sparse distance and similarity graphs."""
+    neigh_graph = NeighGraph(coordinates=data)
+    neigh_graph.compute_distances()
+    neigh_graph.set_kstar([2, 2, 2, 2, 2, 2])
+
+    graph = neigh_graph.return_sparse_distance_graph(symmetrize=True)
+    expected = np.maximum(
+        np.array(expected_distance_graph), np.array(expected_distance_graph).T
+    )
+    assert np.allclose(graph.toarray(), expected)
+
+    graph = neigh_graph.return_sparse_similarity_graph(symmetrize=True)
+    expected = np.zeros((6, 6))
+    expected[[0, 1, 1, 2, 3, 4, 4, 5], [1, 0, 2, 1, 4, 3, 5, 4]] = [
+        1.0 / 3.0,
+        1.0 / 3.0,
+        1.0,
+        1.0,
+        1.0,
+        1.0,
+        1.0 / 3.0,
+        1.0 / 3.0,
+    ]
+    assert np.allclose(graph.toarray(), expected)
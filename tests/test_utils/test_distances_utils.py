@@ -15,9 +15,11 @@
 
 """Module for testing utils functions."""
 
+import warnings
 
 import numpy as np
 import pytest
+from scipy.sparse import csr_matrix
 
 from dadapy._utils import utils
 
@@ -61,3 +63,19 @@ def test_cross_nn_distances_periodic():
 
     assert pytest.approx(indices) == expected_indices
     assert pytest.approx(distances) == expected_distances
+
+
+def test_solve_pcg_convergence_warning():
+    """Test that the conjugate gradient only warns when the last residual is above tolerance."""
+    A = csr_matrix(np.diag([1.0, 2.0, 4.0]))
+    B = np.array([1.0, 1.0, 1.0])
+
+    # a diagonal system is solved exactly by the preconditioner in the last (and only) iteration
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        X = utils.solve_pcg(A, B, maxiter=1)
+    assert np.allclose(A @ X, B)
+
+    A = csr_matrix(np.array([[4.0, 1.0, 0.0], [1.0, 3.0, 1.0], [0.0, 1.0, 2.0]]))
+    with pytest.warns(UserWarning):
+        utils.solve_pcg(A, B, maxiter=1)
@@ -0,0 +1,121 @@
+# Copyright 2021-2023 The DADApy Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""Module for testing metric comparisons utils functions."""
+
+import numpy as np
+import pytest
+
+from dadapy._utils.metric_comparisons import (
+    _return_imbalance,
+    _return_imbalances_exact,
+    _return_jackknife_imbalances,
+    _return_ranks,
+)
+from dadapy._utils.utils import compute_nn_distances
+
+
+def test_return_ranks():
+    """Test the conditional ranks, including the random ranks of missing neighbours."""
+    dist_indices_1 = np.array([[0, 1, 2], [1, 0, 2], [2, 3, 1], [3, 2, 0]])
+    dist_indices_2 = np.array([[0, 2, 1], [1, 3, 2], [2, 1, 3], [3, 1, 0]])
+
+    for k, n_jobs in [(1, 1), (2, 2), (2, 1)]:
+        ranks = _return_ranks(
+            dist_indices_1, dist_indices_2, np.random.default_rng(0), k, n_jobs
+        )
+        assert ranks.shape == (4, k)
+        # the first neighbours of points 1 and 3 are missing in distance 2 and can only get rank 3
+        assert np.array_equal(ranks[:, 0], [2, 3, 2, 3])
+
+    assert np.array_equal(ranks[:, 1], [1, 2, 1, 2])
+
+    # random ranks do not depend on the number of threads
+    dist_indices_2 = dist_indices_2[:, :2]
+    ranks = [
+        _return_ranks(
+            dist_indices_1, dist_indices_2, np.random.default_rng(1), 2, n_jobs
+        )
+        for n_jobs in [1, 3]
+    ]
+    assert np.array_equal(ranks[0], ranks[1])
+    assert np.all((ranks[0] >= 0) & (ranks[0] < 4))
+
+
+def test_return_imbalances_exact():
+    """Test the exact imbalances against the ones from the full neighbour lists."""
+    rng = np.random.default_rng(0)
+    X_A = rng.uniform(size=(100, 3))
+    X_B = np.hstack([X_A[:, :1], rng.uniform(size=(100, 2))])
+
+    for metric, period in [("euclidean", None), ("manhattan", 1.0)]:
+        _, dist_indices_A = compute_nn_distances(X_A, 99, metric=metric, period=period)
+        _, dist_indices_B = compute_nn_distances(X_B, 99, metric=metric, period=period)
+        for k in [1, 4]:
+            imb_AB, imb_BA = _return_imbalances_exact(
+                X_A, X_B, k, metric, period, period, n_jobs=2
+            )
+            assert np.isclose(
+                imb_AB, _return_imbalance(dist_indices_A, dist_indices_B, rng, k)
+            )
+            assert np.isclose(
+                imb_BA, _return_imbalance(dist_indices_B, dist_indices_A, rng, k)
+            )
+
+
+def test_return_imbalances_exact_ties():
+    """Test the exact imbalances with tied distances against a stable sort of the distances."""
+    rng = np.random.default_rng(0)
+    X_A = rng.integers(0, 3, size=(100, 4)).astype(float)
+    X_B = X_A[:, :1]
+
+    def stable_dist_indices(X):
+        dist = np.sum((X[:, None, :] - X[None, :, :]) ** 2, axis=-1)
+        np.fill_diagonal(dist, -1)
+        return np.argsort(dist, axis=1, kind="stable")
+
+    dist_indices_A = stable_dist_indices(X_A)
+    dist_indices_B = stable_dist_indices(X_B)
+    for k in [1, 3]:
+        with pytest.warns(UserWarning):
+            imb_AB, imb_BA = _return_imbalances_exact(X_A, X_B, k, n_jobs=2)
+        assert np.isclose(
+            imb_AB, _return_imbalance(dist_indices_A, dist_indices_B, rng, k)
+        )
+        assert np.isclose(
+            imb_BA, _return_imbalance(dist_indices_B, dist_indices_A, rng, k)
+        )
+
+
+def test_return_jackknife_imbalances():
+    """Test the leave-one-out imbalances against the ones from the reduced datasets."""
+    rng = np.random.default_rng(0)
+    X_1 = rng.uniform(size=(50, 2))
+    X_2 = np.hstack([X_1[:, :1], rng.uniform(size=(50, 1))])
+
+    _, dist_indices_1 = compute_nn_distances(X_1, 49)
+    _, dist_indices_2 = compute_nn_distances(X_2, 49)
+    removed = np.array([3, 17, 42])
+
+    imbalances = _return_jackknife_imbalances(
+        dist_indices_1, dist_indices_2, removed, rng, k=2, n_jobs=2
+    )
+
+    for imb, i in zip(imbalances, removed):
+        _, dist_indices_1_i = compute_nn_distances(np.delete(X_1, [i], axis=0), 48)
+        _, dist_indices_2_i = compute_nn_distances(np.delete(X_2, [i], axis=0), 48)
+        assert np.isclose(
+            imb, _return_imbalance(dist_indices_1_i, dist_indices_2_i, rng, k=2)
+        )
@@ -0,0 +1,54 @@
+# Copyright 2021-2023 The DADApy Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""Module for testing the shared-array batch engine."""
+
+import numpy as np
+
+from dadapy._utils.shared_tasks import iterate_shared_tasks
+
+
+def _row_sum(arrays, task, row):
+    return task, arrays["X"][row].sum() + arrays["offset"][0]
+
+
+def _nested_row_sums(arrays, task, rows):
+    inner = {"X": arrays["X"], "offset": np.zeros(1)}
+    return task, sorted(
+        value for _, value in iterate_shared_tasks(_row_sum, inner, enumerate(rows))
+    )
+
+
+def test_iterate_shared_tasks():
+    """Test that the engine gives the same results in process and in worker processes, also when nested."""
+    X = np.random.default_rng(0).random((50, 3))
+    arrays = {"X": X, "offset": np.ones(1)}
+    expected = X.sum(axis=1) + 1
+
+    for n_jobs in [1, 2]:
+        results = dict(
+            iterate_shared_tasks(
+                _row_sum, arrays, ((i, i) for i in range(len(X))), n_jobs
+            )
+        )
+        assert np.allclose([results[i] for i in range(len(X))], expected)
+
+        results = dict(
+            iterate_shared_tasks(
+                _nested_row_sums, arrays, [(0, [0, 1]), (1, [2, 3])], n_jobs
+            )
+        )
+        assert np.allclose(results[0], np.sort(X[:2].sum(axis=1)))
+        assert np.allclose(results[1], np.sort(X[2:4].sum(axis=1)))